@@ -3,14 +3,18 @@ Configurações Centralizadas do Projeto
 =======================================
 
 Gerencia todas as configurações do projeto usando variáveis de ambiente.
+
+As configurações são avaliadas sob demanda: o ``.env`` só é carregado
+no primeiro acesso a uma configuração, cada valor é convertido uma única
+vez e os diretórios de saída só são criados quando algo é gravado neles.
+Assim, importar ``src`` não tem efeitos colaterais (importante com xdist).
 """
 
 import os
+import time
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Carregar variáveis de ambiente do arquivo .env
-load_dotenv()
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
 
 # Diretórios do projeto
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -20,57 +24,264 @@ OUTPUT_DIR = BASE_DIR / "output"
 REPORTS_DIR = BASE_DIR / "reports"
 SCREENSHOTS_DIR = REPORTS_DIR / "screenshots"
 
-# Criar diretórios se não existirem
-OUTPUT_DIR.mkdir(exist_ok=True)
-REPORTS_DIR.mkdir(exist_ok=True)
-SCREENSHOTS_DIR.mkdir(exist_ok=True)
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Carrega o arquivo .env uma única vez (no primeiro acesso)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    
+    load_dotenv()
+
+
+def _bool(value: str) -> bool:
+    """Converte "true"/"false" (qualquer caixa) em bool."""
+    return value.lower() == "true"
+
+
+def _list(value: str) -> list:
+    """Converte "a, b, c" em ["a", "b", "c"] (itens vazios são ignorados)."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class EnvSetting:
+    """
+    Configuração lida da variável de ambiente de mesmo nome.
+    
+    O valor é convertido no primeiro acesso e guardado na instância,
+    então os acessos seguintes não passam mais pelo descritor.
+    """
+    
+    def __init__(self, default: str, cast: Callable[[str], Any] = str):
+        """
+        Args:
+            default: Valor padrão (como string, igual ao .env)
+            cast: Conversão aplicada ao valor
+        """
+        self.default = default
+        self.cast = cast
+        self.name = ""
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        
+        _load_env()
+        value = self.cast(os.getenv(self.name, self.default))
+        obj.__dict__[self.name] = value
+        return value
 
 
 class Settings:
     """Configurações do projeto."""
     
     # URLs
-    FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
-    BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+    FRONTEND_URL = EnvSetting("http://localhost:5173")
+    BACKEND_URL = EnvSetting("http://localhost:8000")
     
     # Auto-login
-    AUTO_LOGIN_TOKEN = os.getenv("AUTO_LOGIN_TOKEN", "")
-    AUTO_LOGIN_USER_ID = os.getenv("AUTO_LOGIN_USER_ID", "9948")
-    AUTO_LOGIN_USER_NAME = os.getenv("AUTO_LOGIN_USER_NAME", "TESTE DESENVOLVIMENTO")
+    AUTO_LOGIN_TOKEN = EnvSetting("")
+    AUTO_LOGIN_USER_ID = EnvSetting("9948")
+    AUTO_LOGIN_USER_NAME = EnvSetting("TESTE DESENVOLVIMENTO")
+    
+    # Cache da sessão autenticada (login uma vez por sessão/worker)
+    AUTH_CACHE_ENABLED = EnvSetting("false", _bool)
+    AUTH_CACHE_TTL = EnvSetting("1800", int)
+    AUTH_TOKEN_MAX_AGE = EnvSetting("86400", int)
     
     @property
-    def AUTO_LOGIN_URL(self):
-        """Gera URL de auto-login."""
-        if os.getenv("AUTO_LOGIN_URL"):
-            return os.getenv("AUTO_LOGIN_URL")
+    def AUTO_LOGIN_URL(self) -> str:
+        """Gera URL de auto-login (com timestamp novo a cada acesso)."""
+        return self.auto_login_url()
+    
+    def auto_login_url(self, timestamp: Optional[int] = None) -> str:
+        """
+        Gera URL de auto-login.
+        
+        O parâmetro ``_t`` (cache-busting) é recalculado a cada chamada,
+        inclusive quando AUTO_LOGIN_URL vem pronta do .env.
         
-        import time
-        timestamp = int(time.time() * 1000)
-        return (
-            f"{self.FRONTEND_URL}?"
-            f"token={self.AUTO_LOGIN_TOKEN}&"
-            f"nome={self.AUTO_LOGIN_USER_NAME}&"
-            f"userId={self.AUTO_LOGIN_USER_ID}&"
-            f"_t={timestamp}"
-        )
+        Args:
+            timestamp: Valor de ``_t`` em ms (padrão: agora)
+            
+        Returns:
+            str: URL de auto-login
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        
+        _load_env()
+        base = os.getenv("AUTO_LOGIN_URL")
+        
+        if not base:
+            return (
+                f"{self.FRONTEND_URL}?"
+                f"token={self.AUTO_LOGIN_TOKEN}&"
+                f"nome={self.AUTO_LOGIN_USER_NAME}&"
+                f"userId={self.AUTO_LOGIN_USER_ID}&"
+                f"_t={timestamp}"
+            )
+        
+        parts = urlsplit(base)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != '_t']
+        query.append(('_t', str(timestamp)))
+        return urlunsplit(parts._replace(query=urlencode(query, quote_via=quote)))
+    
+    def reload(self) -> None:
+        """Descarta os valores já convertidos (relidos no próximo acesso)."""
+        self.__dict__.clear()
     
     # ChromeDriver
-    CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH", r"C:\chromedriver\chromedriver.exe")
-    USE_WEBDRIVER_MANAGER = os.getenv("USE_WEBDRIVER_MANAGER", "false").lower() == "true"
+    CHROME_DRIVER_PATH = EnvSetting(r"C:\chromedriver\chromedriver.exe")
+    USE_WEBDRIVER_MANAGER = EnvSetting("false", _bool)
+    # Resolução memoizada por máquina (chave = versão do Chrome instalado)
+    CHROME_BINARY = EnvSetting("")
+    DRIVER_CACHE_FILE = EnvSetting(str(Path.home() / ".cache" / "licenciamento-e2e" / "chromedriver.json"), Path)
+    DRIVER_BUNDLE_DIR = EnvSetting(str(BASE_DIR / "wheels" / "chromedriver"), Path)
+    DRIVER_SHARED_SERVICE = EnvSetting("true", _bool)
     
     # Configurações de Teste
-    TEST_TIMEOUT = int(os.getenv("TEST_TIMEOUT", "20"))
-    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    MAXIMIZE_WINDOW = os.getenv("MAXIMIZE_WINDOW", "true").lower() == "true"
-    SCREENSHOT_ON_FAIL = os.getenv("SCREENSHOT_ON_FAIL", "true").lower() == "true"
+    TEST_TIMEOUT = EnvSetting("20", int)
+    HEADLESS = EnvSetting("false", _bool)
+    MAXIMIZE_WINDOW = EnvSetting("true", _bool)
+    SCREENSHOT_ON_FAIL = EnvSetting("true", _bool)
+    
+    # Screenshots: captura via CDP e gravação em segundo plano
+    SCREENSHOT_ASYNC = EnvSetting("false", _bool)
+    SCREENSHOT_FORMAT = EnvSetting("png", str.lower)
+    SCREENSHOT_QUALITY = EnvSetting("80", int)
+    SCREENSHOT_MAX_WIDTH = EnvSetting("0", int)
+    SCREENSHOT_WORKERS = EnvSetting("2", int)
+    SCREENSHOT_QUEUE_SIZE = EnvSetting("32", int)
+    SCREENSHOT_QUEUE_TIMEOUT = EnvSetting("0.5", float)
+    SCREENSHOT_FLUSH_TIMEOUT = EnvSetting("30", float)
+    
+    # Store de screenshots das etapas (deduplicação por conteúdo)
+    SCREENSHOT_DEDUP = EnvSetting("false", _bool)
+    SCREENSHOT_STORE_DIR = EnvSetting("store", lambda v: SCREENSHOTS_DIR / v)
+    SCREENSHOT_SIMILAR_DISTANCE = EnvSetting("-1", int)
+    SCREENSHOT_SIMILAR_MAX_PIXELS = EnvSetting("64", int)
+    SCREENSHOT_DIFF_DISTANCE = EnvSetting("12", int)
+    SCREENSHOT_STORE_MAX_AGE_DAYS = EnvSetting("14", float)
+    SCREENSHOT_STORE_MAX_MB = EnvSetting("500", float)
+    
+    # Perfil do navegador: "default" ou "fast" (headless novo + bloqueio de recursos)
+    DRIVER_PROFILE = EnvSetting("default", str.lower)
+    FAST_WINDOW_SIZE = EnvSetting("1280,800")
+    FAST_BLOCKED_URLS = EnvSetting(
+        "*.png,*.jpg,*.jpeg,*.gif,*.webp,*.ico,*.woff,*.woff2,*.ttf,*.otf,"
+        "*tile.openstreetmap.org*,*tiles.mapbox.com*,*arcgisonline.com*,"
+        "*google-analytics.com*,*googletagmanager.com*,*hotjar.com*,*clarity.ms*",
+        _list
+    )
+    FAST_ESTIMATE_SAVED_BYTES = EnvSetting("false", _bool)
+    
+    # Esperas dos Page Objects
+    # "event": aguarda condições reais (DOM/rede estáveis); "fixed": time.sleep antigo
+    WAIT_STRATEGY = EnvSetting("event", str.lower)
+    DOM_QUIET_MS = EnvSetting("300", int)
+    NETWORK_IDLE_MS = EnvSetting("500", int)
+    WAIT_POLL_INTERVAL = EnvSetting("0.1", float)
+    STEP_TRANSITION_TIMEOUT = EnvSetting("5", float)
+    
+    # Pool de navegadores
+    USE_DRIVER_POOL = EnvSetting("false", _bool)
+    DRIVER_POOL_SIZE = EnvSetting("2", int)
+    DRIVER_POOL_MAX_USES = EnvSetting("20", int)
+    DRIVER_POOL_MAX_TABS = EnvSetting("5", int)
+    DRIVER_POOL_MAX_HEAP_MB = EnvSetting("512", int)
+    
+    # Instrumentação de tempo por etapa (trace em reports/traces)
+    TIMING_ENABLED = EnvSetting("false", _bool)
+    TIMING_MAX_EVENTS = EnvSetting("200000", int)
+    
+    # Serialização dos JSONs de saída: auto (orjson se instalado), orjson ou stdlib
+    JSON_BACKEND = EnvSetting("auto", str.lower)
+    JSON_PRETTY = EnvSetting("true", _bool)
+    
+    # Linha do tempo do store por etapa (reports/timelines)
+    STORE_TIMELINE_ENABLED = EnvSetting("false", _bool)
+    STORE_TIMELINE_MAX_OPS = EnvSetting("5000", int)
+    
+    # Arquivo de execuções: JSONL comprimido em segmentos + índice (output/archive)
+    ARCHIVE_ENABLED = EnvSetting("false", _bool)
+    ARCHIVE_DIR = EnvSetting("archive", lambda v: OUTPUT_DIR / v)
+    ARCHIVE_COMPRESSION = EnvSetting("auto", str.lower)
+    ARCHIVE_SEGMENT_MAX_MB = EnvSetting("64", float)
+    ARCHIVE_SEGMENT_MAX_AGE_HOURS = EnvSetting("24", float)
+    ARCHIVE_RETENTION_DAYS = EnvSetting("90", float)
+    
+    # Stub local do frontend/backend (src/stub)
+    USE_STUB_SERVER = EnvSetting("false", _bool)
+    STUB_HOST = EnvSetting("127.0.0.1")
+    STUB_PORT = EnvSetting("0", int)
+    STUB_LATENCY_MS = EnvSetting("0", float)
+    STUB_JITTER_MS = EnvSetting("0", float)
+    STUB_ERROR_RATE = EnvSetting("0", float)
+    STUB_UI_DELAY_MS = EnvSetting("150", int)
+    STUB_SEED = EnvSetting("42", int)
+    
+    # Benchmark do wizard (python -m src.core.benchmark / pytest -m benchmark)
+    BENCH_RUNS = EnvSetting("5", int)
+    BENCH_TIPO_IMOVEL = EnvSetting("URBANO", str.upper)
+    BENCH_METRIC = EnvSetting("p50", str.lower)
+    BENCH_REGRESSION_PCT = EnvSetting("20", float)
+    BENCH_MIN_DELTA_MS = EnvSetting("200", float)
+    BENCH_BASELINE_FILE = EnvSetting("benchmark_wizard_baseline.json")
+    BENCH_UPDATE_BASELINE = EnvSetting("false", _bool)
+    
+    # Gerador de carga (python -m src.core.load_generator)
+    LOAD_USERS = EnvSetting("20", int)
+    LOAD_RAMP_UP = EnvSetting("60", float)
+    LOAD_DURATION = EnvSetting("300", float)
+    LOAD_ITERATIONS = EnvSetting("0", int)
+    LOAD_THINK_TIME = EnvSetting("3", float)
+    LOAD_THINK_DISTRIBUTION = EnvSetting("exponential", str.lower)
+    LOAD_INTERVAL = EnvSetting("10", float)
+    LOAD_SEED = EnvSetting("42", int)
+    LOAD_DRIVER_PROFILE = EnvSetting("fast", str.lower)
+    LOAD_MAX_ERROR_SAMPLES = EnvSetting("100", int)
+    
+    # Registro de localizadores (ranking das alternativas de XPath com união)
+    LOCATOR_REGISTRY_ENABLED = EnvSetting("false", _bool)
+    LOCATOR_STATS_FILE = EnvSetting("locator_stats.json")
+    
+    # Validação de dados via API do backend
+    API_AUTH_TOKEN = EnvSetting("")
+    API_MAX_CONNECTIONS = EnvSetting("20", int)
+    API_TIMEOUT = EnvSetting("10", float)
+    API_RETRIES = EnvSetting("2", int)
+    API_RETRY_BACKOFF = EnvSetting("0.2", float)
+    API_CONCURRENCY = EnvSetting("25", int)
+    RECONCILE_BATCH_SIZE = EnvSetting("50", int)
+    RECONCILE_USE_BATCH = EnvSetting("true", _bool)
+    
+    # Checkpoints do orquestrador (retomar cadeias longas)
+    CHECKPOINT_MAX_MB = EnvSetting("50", float)
+    
+    # Execução paralela de fluxos
+    PARALLEL_WORKERS = EnvSetting("3", int)
+    PARALLEL_MAX_CPU_PERCENT = EnvSetting("85", float)
+    PARALLEL_MIN_FREE_MEMORY_MB = EnvSetting("1024", int)
     
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = REPORTS_DIR / os.getenv("LOG_FILE", "test_execution.log")
+    LOG_LEVEL = EnvSetting("INFO")
+    LOG_FILE = EnvSetting("test_execution.log", lambda v: REPORTS_DIR / v)
     
     # Database (Opcional)
-    SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-    SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
+    SUPABASE_URL = EnvSetting("")
+    SUPABASE_KEY = EnvSetting("")
 
 
 # Instância global de configurações
@@ -3,8 +3,13 @@ URLs do Sistema
 ===============
 
 Centraliza todas as URLs e rotas do sistema.
+
+As URLs são calculadas no acesso a partir das configurações (nada é
+congelado no import); a de auto-login ganha um timestamp novo a cada uso.
 """
 
+from typing import Optional
+
 from .settings import settings
 
 
@@ -12,48 +17,75 @@ class URLs:
     """Gerenciador de URLs do sistema."""
     
     # Base URLs
-    FRONTEND = settings.FRONTEND_URL
-    BACKEND = settings.BACKEND_URL
+    @property
+    def FRONTEND(self) -> str:
+        return settings.FRONTEND_URL
+    
+    @property
+    def BACKEND(self) -> str:
+        return settings.BACKEND_URL
     
     # Auto-login
-    AUTO_LOGIN = settings.AUTO_LOGIN_URL
+    @property
+    def AUTO_LOGIN(self) -> str:
+        return settings.auto_login_url()
+    
+    def auto_login(self, timestamp: Optional[int] = None) -> str:
+        """URL de auto-login com timestamp (``_t``) específico."""
+        return settings.auto_login_url(timestamp)
     
     # Frontend Routes
-    DASHBOARD = f"{FRONTEND}/dashboard"
-    LOGIN = f"{FRONTEND}/login"
+    @property
+    def DASHBOARD(self) -> str:
+        return f"{self.FRONTEND}/dashboard"
+    
+    @property
+    def LOGIN(self) -> str:
+        return f"{self.FRONTEND}/login"
     
     # Empreendimentos
-    EMPREENDIMENTOS = f"{FRONTEND}/empreendimentos"
-    NOVO_EMPREENDIMENTO = f"{FRONTEND}/empreendimentos/novo"
+    @property
+    def EMPREENDIMENTOS(self) -> str:
+        return f"{self.FRONTEND}/empreendimentos"
+    
+    @property
+    def NOVO_EMPREENDIMENTO(self) -> str:
+        return f"{self.FRONTEND}/empreendimentos/novo"
     
     # Backend API Routes
-    API_V1 = f"{BACKEND}/api/v1"
+    @property
+    def API_V1(self) -> str:
+        return f"{self.BACKEND}/api/v1"
     
     # Propriedades
-    API_PROPERTIES = f"{API_V1}/properties"
+    @property
+    def API_PROPERTIES(self) -> str:
+        return f"{self.API_V1}/properties"
     
-    @staticmethod
-    def get_property(property_id: int) -> str:
+    def get_property(self, property_id: int) -> str:
         """URL para obter propriedade específica."""
-        return f"{URLs.API_PROPERTIES}/{property_id}"
+        return f"{self.API_PROPERTIES}/{property_id}"
     
     # Empreendimentos
-    API_ENTERPRISES = f"{API_V1}/enterprises"
+    @property
+    def API_ENTERPRISES(self) -> str:
+        return f"{self.API_V1}/enterprises"
     
-    @staticmethod
-    def get_enterprise(enterprise_id: int) -> str:
+    def get_enterprise(self, enterprise_id: int) -> str:
         """URL para obter empreendimento específico."""
-        return f"{URLs.API_ENTERPRISES}/{enterprise_id}"
+        return f"{self.API_ENTERPRISES}/{enterprise_id}"
+    
+    def get_enterprises_batch(self, enterprise_ids) -> str:
+        """URL para obter vários empreendimentos em uma chamada (``?ids=1,2,3``)."""
+        return f"{self.API_ENTERPRISES}?ids={','.join(str(i) for i in enterprise_ids)}"
     
-    @staticmethod
-    def get_enterprise_activities(enterprise_id: int) -> str:
+    def get_enterprise_activities(self, enterprise_id: int) -> str:
         """URL para obter atividades do empreendimento."""
-        return f"{URLs.API_ENTERPRISES}/{enterprise_id}/activities"
+        return f"{self.API_ENTERPRISES}/{enterprise_id}/activities"
     
-    @staticmethod
-    def get_enterprise_characterization(enterprise_id: int) -> str:
+    def get_enterprise_characterization(self, enterprise_id: int) -> str:
         """URL para obter caracterização do empreendimento."""
-        return f"{URLs.API_ENTERPRISES}/{enterprise_id}/characterization"
+        return f"{self.API_ENTERPRISES}/{enterprise_id}/characterization"
 
 
 # Instância global de URLs
@@ -0,0 +1,166 @@
+"""
+Cache de Autenticação
+======================
+
+Guarda o estado autenticado (cookies + web storage) obtido no primeiro
+auto-login do processo (sessão pytest ou worker xdist) e o injeta nos
+navegadores seguintes antes da primeira navegação.
+"""
+
+import base64
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+from .browser_state import BrowserState
+from ..config.settings import settings
+
+
+class AuthStateCache:
+    """Cache em memória do estado autenticado, com expiração por idade."""
+    
+    def __init__(self, ttl: int = None):
+        """
+        Inicializa o cache.
+        
+        Args:
+            ttl: Idade máxima (s) de uma entrada (padrão: AUTH_CACHE_TTL)
+        """
+        self._ttl = ttl
+        self._entry: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def ttl(self) -> int:
+        """Idade máxima (s) de uma entrada."""
+        return self._ttl if self._ttl is not None else settings.AUTH_CACHE_TTL
+    
+    @staticmethod
+    def token_expiration(token: str) -> Optional[float]:
+        """
+        Calcula quando o token de auto-login expira.
+        
+        Usa ``exp`` do payload se existir; senão, ``iat`` + AUTH_TOKEN_MAX_AGE.
+        
+        Args:
+            token: Token de auto-login (JSON em base64, com ou sem cabeçalho JWT)
+        
+        Returns:
+            float: Timestamp de expiração ou None se não for possível decodificar
+        """
+        if not token:
+            return None
+        
+        # JWT (header.payload.signature) ou só o payload
+        payload = token.split('.')[1] if token.count('.') == 2 else token
+        
+        try:
+            padded = payload + '=' * (-len(payload) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded))
+        except Exception:
+            return None
+        
+        if 'exp' in data:
+            return float(data['exp'])
+        if 'iat' in data and settings.AUTH_TOKEN_MAX_AGE:
+            return float(data['iat']) + settings.AUTH_TOKEN_MAX_AGE
+        return None
+    
+    def is_valid(self) -> bool:
+        """
+        Indica se há uma entrada utilizável.
+        
+        Returns:
+            bool: True se existe entrada dentro do TTL e do prazo do token
+        """
+        entry = self._entry
+        if not entry:
+            return False
+        
+        now = time.time()
+        if now - entry['captured_at'] > self.ttl:
+            return False
+        if entry['expires_at'] and now >= entry['expires_at']:
+            return False
+        
+        return True
+    
+    def store(self, driver: webdriver.Chrome) -> None:
+        """
+        Captura o estado autenticado do navegador após um login real.
+        
+        Args:
+            driver: Instância do WebDriver já autenticada
+        """
+        try:
+            state = BrowserState.capture(driver)
+        except Exception as e:
+            print(f"⚠️ Não foi possível capturar a sessão autenticada: {e}")
+            return
+        
+        parts = urlsplit(state['url'])
+        
+        with self._lock:
+            self._entry = {
+                'state': state,
+                'origin': f"{parts.scheme}://{parts.netloc}",
+                'captured_at': time.time(),
+                'expires_at': self.token_expiration(settings.AUTO_LOGIN_TOKEN)
+            }
+    
+    def inject(self, driver: webdriver.Chrome) -> bool:
+        """
+        Injeta o estado em cache em um navegador novo ou reciclado.
+        
+        Deve ser chamado antes da primeira navegação para a aplicação:
+        cookies são gravados via CDP e os storages por um script executado
+        no início de cada documento da origem.
+        
+        Args:
+            driver: Instância do WebDriver
+        
+        Returns:
+            bool: True se o estado foi injetado
+        """
+        if not self.is_valid():
+            return False
+        
+        entry = self._entry
+        
+        self.eject(driver)
+        
+        if not BrowserState.set_cookies(driver, entry['state']['cookies']):
+            return False
+        
+        script_id = BrowserState.add_storage_seed(
+            driver, entry['origin'], entry['state'],
+            guard=f"__e2e_auth_{int(entry['captured_at'])}"
+        )
+        if not script_id:
+            return False
+        
+        driver._e2e_auth_seed = script_id
+        return True
+    
+    def eject(self, driver: webdriver.Chrome) -> None:
+        """
+        Remove do navegador o script de injeção registrado por ``inject``.
+        
+        Args:
+            driver: Instância do WebDriver
+        """
+        BrowserState.remove_storage_seed(driver, getattr(driver, '_e2e_auth_seed', None))
+        driver._e2e_auth_seed = None
+    
+    def invalidate(self) -> None:
+        """Descarta a entrada (ex.: sessão rejeitada pela aplicação)."""
+        with self._lock:
+            self._entry = None
+
+
+# Instância global (uma por processo / worker xdist)
+auth_cache = AuthStateCache()
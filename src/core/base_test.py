@@ -11,7 +11,9 @@ from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
 
 from .driver_manager import DriverManager
-from ..config.settings import settings, SCREENSHOTS_DIR
+from ..config.settings import settings
+from ..utils.screenshot import ScreenshotHelper
+from ..utils.step_timer import step_timer
 
 
 class BaseTest:
@@ -56,7 +58,7 @@ class BaseTest:
             name: Nome do arquivo (sem extensão)
             
         Returns:
-            str: Caminho do arquivo salvo
+            str: Caminho do arquivo (gravado em segundo plano)
         """
         if not self.driver:
             return ""
@@ -64,10 +66,7 @@ class BaseTest:
         if not name:
             name = f"screenshot_{int(time.time())}"
         
-        filepath = SCREENSHOTS_DIR / f"{name}.png"
-        self.driver.save_screenshot(str(filepath))
-        
-        return str(filepath)
+        return ScreenshotHelper.capture(self.driver, name=name)
     
     def go_to_url(self, url: str) -> None:
         """
@@ -97,4 +96,4 @@ class BaseTest:
         Args:
             seconds: Segundos para aguardar
         """
-        time.sleep(seconds)
+        step_timer.sleep(seconds)
@@ -0,0 +1,439 @@
+"""
+Benchmark do Wizard
+====================
+
+Executa o fluxo completo de cadastro (o mesmo de
+``test_fluxo_completo_cadastro``) N vezes, mede cada etapa e a
+quantidade de comandos do WebDriver, grava o resultado versionado em
+``reports/json/`` e compara com a baseline: uma etapa que piorar além do
+limite configurado é reportada como regressão.
+
+Uso:
+    python -m src.core.benchmark --runs 10 --stub
+    python -m src.core.benchmark --update-baseline
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .driver_manager import DriverManager
+from ..config.settings import settings, BASE_DIR, REPORTS_DIR
+from ..pages.empreendimento_page import EmpreendimentoPage
+from ..pages.login_page import LoginPage
+from ..pages.wizard.atividades_step import AtividadesStep
+from ..pages.wizard.caracterizacao_step import CaracterizacaoStep
+from ..pages.wizard.dados_gerais_step import DadosGeraisStep
+from ..pages.wizard.imovel_step import ImovelStep
+from ..stub import StubServer
+from ..utils.http_client import HttpClient
+from ..utils.json_serializer import json_serializer
+
+
+def _login(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    return LoginPage(driver, wait).auto_login()
+
+
+def _navegacao(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    page = EmpreendimentoPage(driver, wait)
+    return page.navigate_from_menu() and page.click_novo_empreendimento() and page.wizard_is_open()
+
+
+def _imovel(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    step = ImovelStep(driver, wait)
+    return (
+        step.select_tipo_imovel(tipo)
+        and step.click_preencher_dados()
+        and step.click_salvar()
+        and step.click_proximo()
+    )
+
+
+def _dados_gerais(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    step = DadosGeraisStep(driver, wait)
+    if not step.is_visible():
+        return False
+    step.click_preencher_dados()
+    if not step.validar_campos_obrigatorios():
+        return False
+    step.validar_participe()
+    return step.click_proximo()
+
+
+def _atividades(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    step = AtividadesStep(driver, wait)
+    if not step.is_visible():
+        return False
+    step.click_preencher_dados()
+    step.validar_atividades_adicionadas()
+    step.validar_campos_numericos()
+    return step.click_proximo()
+
+
+def _caracterizacao(driver: webdriver.Chrome, wait: WebDriverWait, tipo: str) -> bool:
+    step = CaracterizacaoStep(driver, wait)
+    if not step.is_visible():
+        return False
+    step.click_preencher_dados()
+    step.validar_preenchimento()
+    return step.click_finalizar()
+
+
+class WizardBenchmark:
+    """Mede o fluxo do wizard e detecta regressões contra a baseline."""
+    
+    # Versão do formato do JSON de resultados
+    SCHEMA_VERSION = 1
+    
+    # Etapas na ordem do test_fluxo_completo_cadastro
+    STEPS: Tuple[Tuple[str, Callable[[webdriver.Chrome, WebDriverWait, str], bool]], ...] = (
+        ("Auto-Login", _login),
+        ("Navegação", _navegacao),
+        ("Imóvel", _imovel),
+        ("Dados Gerais", _dados_gerais),
+        ("Atividades", _atividades),
+        ("Caracterização", _caracterizacao),
+    )
+    
+    def __init__(self, runs: int = None, tipo: str = None, output_dir: Path = None):
+        """
+        Inicializa o benchmark.
+        
+        Args:
+            runs: Execuções do fluxo (padrão: BENCH_RUNS)
+            tipo: Tipo de imóvel do wizard (padrão: BENCH_TIPO_IMOVEL)
+            output_dir: Diretório dos resultados (padrão: reports/json)
+        """
+        self.runs = max(1, runs or settings.BENCH_RUNS)
+        self.tipo = (tipo or settings.BENCH_TIPO_IMOVEL).upper()
+        self.output_dir = Path(output_dir) if output_dir else REPORTS_DIR / "json"
+    
+    @property
+    def baseline_file(self) -> Path:
+        """Arquivo da baseline (BENCH_BASELINE_FILE, relativo a reports/json)."""
+        return self.output_dir / settings.BENCH_BASELINE_FILE
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Executa o fluxo ``runs`` vezes, cada uma em um navegador novo.
+        
+        Returns:
+            dict: Resultado no formato versionado (ver ``summarize``)
+        """
+        print(f"\n📏 Benchmark do wizard: {self.runs} execução(ões), tipo {self.tipo}, "
+              f"frontend {settings.FRONTEND_URL}")
+        
+        runs = []
+        for index in range(1, self.runs + 1):
+            result = self._run_once(index)
+            runs.append(result)
+            status = "✅" if result['passed'] else "❌"
+            print(f"   {status} Execução {index}: {result['total_ms'] / 1000:.2f}s "
+                  f"({result['commands']} comandos)")
+        
+        return self.summarize(runs)
+    
+    def summarize(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Consolida as execuções em percentis por etapa.
+        
+        Só entram nas estatísticas as etapas concluídas com sucesso.
+        
+        Args:
+            runs: Execuções retornadas por ``_run_once``
+        
+        Returns:
+            dict: schema_version, created_at, git_commit, config, runs,
+                  steps (p50/p95/max/mean em ms e comandos por etapa) e total
+        """
+        steps = {}
+        for name, _ in self.STEPS:
+            samples = [r['steps'][name] for r in runs if r['steps'].get(name, {}).get('passed')]
+            steps[name] = self._stats(samples)
+        
+        return {
+            'schema_version': self.SCHEMA_VERSION,
+            'name': 'wizard',
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': self._git_commit(),
+            'config': {
+                'runs': self.runs,
+                'tipo_imovel': self.tipo,
+                'frontend_url': settings.FRONTEND_URL,
+                'driver_profile': settings.DRIVER_PROFILE,
+                'wait_strategy': settings.WAIT_STRATEGY,
+                'headless': settings.HEADLESS
+            },
+            'passed': sum(1 for r in runs if r['passed']),
+            'failed': sum(1 for r in runs if not r['passed']),
+            'steps': steps,
+            'total': self._stats([
+                {'ms': r['total_ms'], 'commands': r['commands']} for r in runs if r['passed']
+            ]),
+            'runs': runs
+        }
+    
+    def save(self, results: Dict[str, Any], baseline: bool = False) -> Path:
+        """
+        Grava o resultado em reports/json (e, opcionalmente, como baseline).
+        
+        Args:
+            results: Resultado de ``run``
+            baseline: Também substituir a baseline
+        
+        Returns:
+            Path: Arquivo do resultado
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        commit = results.get('git_commit') or 'local'
+        filepath = self.output_dir / f"benchmark_wizard_v{results['schema_version']}_{stamp}_{commit}.json"
+        
+        json_serializer.write(results, filepath)
+        print(f"💾 Resultado: {filepath}")
+        
+        if baseline:
+            json_serializer.write(results, self.baseline_file)
+            print(f"📌 Baseline atualizada: {self.baseline_file}")
+        
+        return filepath
+    
+    def load_baseline(self) -> Optional[Dict[str, Any]]:
+        """
+        Lê a baseline armazenada.
+        
+        Returns:
+            dict: Resultado de referência, ou None se não existir / for de outra versão
+        """
+        try:
+            with open(self.baseline_file, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if baseline.get('schema_version') != self.SCHEMA_VERSION:
+            print(f"⚠️ Baseline em formato v{baseline.get('schema_version')} ignorada")
+            return None
+        return baseline
+    
+    @staticmethod
+    def compare(
+        results: Dict[str, Any],
+        baseline: Dict[str, Any],
+        threshold_pct: float = None,
+        min_delta_ms: float = None,
+        metric: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista as etapas que pioraram em relação à baseline.
+        
+        Tempo: regressão quando ``metric`` passa de baseline x (1 + limite)
+        e a diferença absoluta é de pelo menos ``min_delta_ms`` (filtra ruído
+        de etapas muito curtas). Comandos do WebDriver: regressão quando a
+        mediana passa do mesmo limite percentual.
+        
+        Args:
+            results: Resultado atual
+            baseline: Resultado de referência
+            threshold_pct: Piora tolerada em % (padrão: BENCH_REGRESSION_PCT)
+            min_delta_ms: Diferença mínima em ms (padrão: BENCH_MIN_DELTA_MS)
+            metric: p50, p95 ou max (padrão: BENCH_METRIC)
+        
+        Returns:
+            list: {'step', 'metric', 'baseline', 'current', 'delta_pct'}
+        """
+        threshold_pct = settings.BENCH_REGRESSION_PCT if threshold_pct is None else threshold_pct
+        min_delta_ms = settings.BENCH_MIN_DELTA_MS if min_delta_ms is None else min_delta_ms
+        metric = metric or settings.BENCH_METRIC
+        limit = 1 + threshold_pct / 100
+        
+        regressions = []
+        current_steps = dict(results['steps'], **{'Total': results['total']})
+        baseline_steps = dict(baseline['steps'], **{'Total': baseline['total']})
+        
+        for step, current in current_steps.items():
+            base = baseline_steps.get(step)
+            if not base or not base.get('samples') or not current.get('samples'):
+                continue
+            
+            key = f"{metric}_ms"
+            if current[key] > base[key] * limit and current[key] - base[key] >= min_delta_ms:
+                regressions.append(WizardBenchmark._regression(step, key, base[key], current[key]))
+            
+            if current['commands'] > base['commands'] * limit:
+                regressions.append(
+                    WizardBenchmark._regression(step, 'commands', base['commands'], current['commands'])
+                )
+        
+        return regressions
+    
+    def check(self, results: Dict[str, Any], update_baseline: bool = None) -> List[Dict[str, Any]]:
+        """
+        Grava o resultado, compara com a baseline e imprime o relatório.
+        
+        Sem baseline (ou com ``update_baseline``), o resultado vira a nova baseline.
+        
+        Args:
+            results: Resultado de ``run``
+            update_baseline: Substituir a baseline (padrão: BENCH_UPDATE_BASELINE)
+        
+        Returns:
+            list: Regressões encontradas (vazia se não houver baseline)
+        """
+        if update_baseline is None:
+            update_baseline = settings.BENCH_UPDATE_BASELINE
+        
+        baseline = None if update_baseline else self.load_baseline()
+        regressions = self.compare(results, baseline) if baseline else []
+        
+        self._print_report(results, baseline, regressions)
+        self.save(results, baseline=baseline is None and results['failed'] == 0)
+        
+        return regressions
+    
+    def _run_once(self, index: int) -> Dict[str, Any]:
+        """Uma execução completa do fluxo em um navegador novo."""
+        driver = DriverManager.create_driver()
+        wait = DriverManager.create_wait(driver)
+        result = {'run': index, 'passed': True, 'total_ms': 0.0, 'commands': 0, 'steps': {}}
+        
+        try:
+            for name, action in self.STEPS:
+                commands = getattr(driver, '_e2e_commands', 0)
+                start = time.perf_counter()
+                try:
+                    passed = bool(action(driver, wait, self.tipo))
+                    error = None
+                except Exception as e:
+                    passed, error = False, str(e)
+                
+                step = {
+                    'ms': round((time.perf_counter() - start) * 1000, 1),
+                    'commands': getattr(driver, '_e2e_commands', 0) - commands,
+                    'passed': passed
+                }
+                if error:
+                    step['error'] = error
+                
+                result['steps'][name] = step
+                result['total_ms'] += step['ms']
+                result['commands'] += step['commands']
+                
+                if not passed:
+                    result['passed'] = False
+                    break
+        finally:
+            DriverManager.quit_driver(driver)
+        
+        result['total_ms'] = round(result['total_ms'], 1)
+        return result
+    
+    @staticmethod
+    def _stats(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Percentis (nearest-rank) de tempo e mediana de comandos."""
+        durations = sorted(s['ms'] for s in samples)
+        commands = [s['commands'] for s in samples]
+        
+        return {
+            'samples': len(durations),
+            'p50_ms': HttpClient.percentile(durations, 50),
+            'p95_ms': HttpClient.percentile(durations, 95),
+            'max_ms': durations[-1] if durations else 0.0,
+            'mean_ms': round(statistics.fmean(durations), 1) if durations else 0.0,
+            'commands': statistics.median(commands) if commands else 0
+        }
+    
+    @staticmethod
+    def _regression(step: str, metric: str, base: float, current: float) -> Dict[str, Any]:
+        return {
+            'step': step,
+            'metric': metric,
+            'baseline': base,
+            'current': current,
+            'delta_pct': round((current - base) / base * 100, 1) if base else None
+        }
+    
+    @staticmethod
+    def _git_commit() -> Optional[str]:
+        """Commit atual (curto), para saber qual versão do código foi medida."""
+        try:
+            output = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return output.stdout.strip() or None
+    
+    def _print_report(
+        self,
+        results: Dict[str, Any],
+        baseline: Optional[Dict[str, Any]],
+        regressions: List[Dict[str, Any]]
+    ) -> None:
+        """Imprime a tabela por etapa e as regressões."""
+        metric = settings.BENCH_METRIC
+        
+        print("\n" + "=" * 100)
+        print(f"{'BENCHMARK DO WIZARD':^100}")
+        print("=" * 100)
+        print(f"\n📊 Execuções: ✅ {results['passed']} | ❌ {results['failed']}")
+        print(f"\n   {'Etapa':<20}{'p50':>10}{'p95':>10}{'máx':>10}{'cmds':>8}{'baseline':>12}")
+        
+        base_steps = dict(baseline['steps'], **{'Total': baseline['total']}) if baseline else {}
+        rows = list(results['steps'].items()) + [('Total', results['total'])]
+        
+        for name, stats in rows:
+            base = base_steps.get(name, {}).get(f"{metric}_ms")
+            base_text = f"{base / 1000:.2f}s" if base else "-"
+            print(f"   {name:<20}{stats['p50_ms'] / 1000:>9.2f}s{stats['p95_ms'] / 1000:>9.2f}s"
+                  f"{stats['max_ms'] / 1000:>9.2f}s{stats['commands']:>8g}{base_text:>12}")
+        
+        if baseline is None:
+            print("\nℹ️  Sem baseline para comparar")
+        elif regressions:
+            print(f"\n❌ {len(regressions)} regressão(ões) acima de {settings.BENCH_REGRESSION_PCT:g}%:")
+            for r in regressions:
+                print(f"   - {r['step']} [{r['metric']}]: {r['baseline']:g} → {r['current']:g} "
+                      f"(+{r['delta_pct']}%)")
+        else:
+            print(f"\n✅ Nenhuma regressão acima de {settings.BENCH_REGRESSION_PCT:g}% ({metric})")
+        
+        print("\n" + "=" * 100 + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada de linha de comando (código de saída 1 se houver regressão)."""
+    parser = argparse.ArgumentParser(description="Benchmark do fluxo completo do wizard")
+    parser.add_argument('--runs', type=int, default=None, help="Execuções (padrão: BENCH_RUNS)")
+    parser.add_argument('--tipo', default=None, help="Tipo de imóvel (RURAL, URBANO, LINEAR)")
+    parser.add_argument('--update-baseline', action='store_true', help="Gravar como nova baseline")
+    parser.add_argument('--stub', action='store_true', help="Rodar contra o stub local (src/stub)")
+    args = parser.parse_args(argv)
+    
+    benchmark = WizardBenchmark(runs=args.runs, tipo=args.tipo)
+    
+    if args.stub or settings.USE_STUB_SERVER:
+        with StubServer() as stub:
+            stub.activate()
+            results = benchmark.run()
+    else:
+        results = benchmark.run()
+    
+    regressions = benchmark.check(results, update_baseline=args.update_baseline or None)
+    
+    return 1 if regressions or results['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
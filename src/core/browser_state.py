@@ -0,0 +1,203 @@
+"""
+Estado do Navegador
+====================
+
+Captura e reinjeta cookies e web storage (localStorage/sessionStorage)
+de uma sessão do Chrome. Usado pelos checkpoints do orquestrador e pelo
+cache de autenticação.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+
+
+class BrowserState:
+    """Captura e restauração de cookies e storages via CDP."""
+    
+    # Lê os dois storages da origem atual em uma única chamada
+    READ_STORAGE_SCRIPT = """
+    function dump(s) {
+        var out = {};
+        try {
+            for (var i = 0; i < s.length; i++) { var k = s.key(i); out[k] = s.getItem(k); }
+        } catch (e) {}
+        return out;
+    }
+    return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+    """
+    
+    # Reidrata os storages antes dos scripts da aplicação (uma vez por aba)
+    _SEED_STORAGE_TEMPLATE = """
+    (function() {{
+        if (location.origin !== {origin}) return;
+        try {{
+            if (sessionStorage.getItem({guard})) return;
+            var local = {local}, session = {session};
+            for (var k in local) localStorage.setItem(k, local[k]);
+            for (var k in session) sessionStorage.setItem(k, session[k]);
+            sessionStorage.setItem({guard}, '1');
+        }} catch (e) {{}}
+    }})();
+    """
+    
+    # Campos aceitos por Network.setCookies
+    _COOKIE_PARAMS = (
+        'name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires'
+    )
+    
+    # Campos aceitos por driver.add_cookie (WebDriver)
+    _WEBDRIVER_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+    _SAME_SITE_VALUES = ('Strict', 'Lax', 'None')
+    
+    @staticmethod
+    def capture(driver: webdriver.Chrome) -> Dict[str, Any]:
+        """
+        Captura o estado atual do navegador.
+        
+        Args:
+            driver: Instância do WebDriver
+        
+        Returns:
+            dict: URL, cookies e storages da origem atual
+        """
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get('cookies', [])
+        except Exception:
+            cookies = driver.get_cookies()
+        
+        storages = driver.execute_script(BrowserState.READ_STORAGE_SCRIPT) or {}
+        
+        return {
+            'url': driver.current_url,
+            'cookies': cookies,
+            'local_storage': storages.get('local', {}),
+            'session_storage': storages.get('session', {})
+        }
+    
+    @staticmethod
+    def set_cookies(driver: webdriver.Chrome, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        Grava cookies sem precisar navegar para o domínio.
+        
+        Args:
+            driver: Instância do WebDriver
+            cookies: Cookies no formato de ``capture``
+        
+        Returns:
+            bool: True se gravados
+        """
+        if not cookies:
+            return True
+        
+        params = []
+        for cookie in cookies:
+            param = {k: v for k, v in cookie.items() if k in BrowserState._COOKIE_PARAMS}
+            # Cookies de sessão vêm com expires=-1
+            if param.get('expires', 0) < 0:
+                param.pop('expires')
+            params.append(param)
+        
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {'cookies': params})
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def to_webdriver_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converte um cookie do CDP (``Network.getAllCookies``) para ``driver.add_cookie``.
+        
+        ``expires`` vira ``expiry`` (inteiro, omitido em cookies de sessão) e
+        campos só do CDP (size, session, priority, sameParty...) são descartados.
+        
+        Args:
+            cookie: Cookie no formato de ``capture``
+        
+        Returns:
+            dict: Cookie no formato do WebDriver
+        """
+        converted = {k: cookie[k] for k in BrowserState._WEBDRIVER_COOKIE_FIELDS if k in cookie}
+        
+        expiry = cookie.get('expiry', cookie.get('expires'))
+        if expiry is not None and expiry >= 0 and not cookie.get('session'):
+            converted['expiry'] = int(expiry)
+        
+        if cookie.get('sameSite') in BrowserState._SAME_SITE_VALUES:
+            converted['sameSite'] = cookie['sameSite']
+        
+        return converted
+    
+    @staticmethod
+    def add_storage_seed(
+        driver: webdriver.Chrome,
+        origin: str,
+        state: Dict[str, Any],
+        guard: str = "__e2e_seeded"
+    ) -> Optional[str]:
+        """
+        Registra um script que grava os storages em todo novo documento
+        da ``origin`` antes dos scripts da aplicação.
+        
+        Args:
+            driver: Instância do WebDriver
+            origin: Origem (scheme://host:porta) que recebe os storages
+            state: Estado no formato de ``capture``
+            guard: Chave em sessionStorage que impede regravar na mesma aba
+        
+        Returns:
+            str: Identificador do script (para ``remove_storage_seed``) ou None
+        """
+        source = BrowserState._SEED_STORAGE_TEMPLATE.format(
+            origin=json.dumps(origin),
+            guard=json.dumps(guard),
+            local=json.dumps(state.get('local_storage', {})),
+            session=json.dumps(state.get('session_storage', {}))
+        )
+        
+        try:
+            return driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {'source': source}
+            ).get('identifier')
+        except Exception:
+            return None
+    
+    @staticmethod
+    def remove_storage_seed(driver: webdriver.Chrome, identifier: Optional[str]) -> None:
+        """
+        Remove um script registrado por ``add_storage_seed``.
+        
+        Args:
+            driver: Instância do WebDriver
+            identifier: Identificador retornado pelo registro
+        """
+        if not identifier:
+            return
+        
+        try:
+            driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {'identifier': identifier}
+            )
+        except Exception:
+            pass
+    
+    @staticmethod
+    def write_storages(driver: webdriver.Chrome, state: Dict[str, Any]) -> None:
+        """
+        Grava os storages diretamente no documento atual (sem CDP).
+        
+        Args:
+            driver: Instância do WebDriver
+            state: Estado no formato de ``capture``
+        """
+        driver.execute_script(
+            """
+            var local = arguments[0], session = arguments[1];
+            for (var k in local) localStorage.setItem(k, local[k]);
+            for (var k in session) sessionStorage.setItem(k, session[k]);
+            """,
+            state.get('local_storage', {}),
+            state.get('session_storage', {})
+        )
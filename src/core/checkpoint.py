@@ -0,0 +1,200 @@
+"""
+Checkpoints de Execução
+========================
+
+Salva o estado do navegador (cookies, localStorage, sessionStorage, URL)
+e o contexto após cada teste aprovado, permitindo retomar uma cadeia
+longa a partir do último ponto bom em vez de refazer tudo.
+"""
+
+import gzip
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+from .browser_state import BrowserState
+from ..config.settings import settings, OUTPUT_DIR
+
+
+class CheckpointStore:
+    """Armazena checkpoints compactados (JSON + gzip) em disco."""
+    
+    def __init__(self, directory: Path = None, max_mb: float = None):
+        """
+        Inicializa o armazenamento.
+        
+        Args:
+            directory: Diretório dos checkpoints (padrão: output/checkpoints)
+            max_mb: Tamanho máximo total em MB (os mais antigos são removidos)
+        """
+        self.directory = Path(directory) if directory else OUTPUT_DIR / "checkpoints"
+        self.max_bytes = int((max_mb if max_mb is not None else settings.CHECKPOINT_MAX_MB) * 1024 * 1024)
+    
+    @staticmethod
+    def _slug(text: str) -> str:
+        """Converte um nome em algo seguro para nome de arquivo."""
+        return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_').lower() or 'suite'
+    
+    def save(
+        self,
+        suite: str,
+        step_index: int,
+        step_name: str,
+        driver: webdriver.Chrome,
+        contexto: Optional[Dict[str, Any]]
+    ) -> Optional[Path]:
+        """
+        Salva um checkpoint após um teste aprovado.
+        
+        Args:
+            suite: Nome da suíte (orquestrador)
+            step_index: Posição (1-based) do teste na suíte
+            step_name: Nome do teste
+            driver: Instância do WebDriver
+            contexto: Contexto retornado pelo teste
+        
+        Returns:
+            Path: Arquivo salvo ou None em caso de erro
+        """
+        try:
+            checkpoint = {
+                'suite': suite,
+                'step_index': step_index,
+                'step_name': step_name,
+                'timestamp': time.time(),
+                'browser': BrowserState.capture(driver) if driver else None,
+                # O driver não é serializável; é reinjetado na restauração
+                'contexto': {k: v for k, v in (contexto or {}).items() if k != 'driver'}
+            }
+            
+            suite_dir = self.directory / self._slug(suite)
+            suite_dir.mkdir(parents=True, exist_ok=True)
+            filepath = suite_dir / f"{step_index:02d}_{self._slug(step_name)}.json.gz"
+            
+            payload = json.dumps(
+                checkpoint, ensure_ascii=False, separators=(',', ':'), default=str
+            ).encode('utf-8')
+            
+            tmp = filepath.with_suffix('.tmp')
+            with gzip.open(tmp, 'wb', compresslevel=6) as f:
+                f.write(payload)
+            tmp.replace(filepath)
+            
+            self._enforce_retention()
+            
+            print(f"💾 Checkpoint salvo: {filepath.name}")
+            return filepath
+        
+        except Exception as e:
+            print(f"⚠️ Erro ao salvar checkpoint: {e}")
+            return None
+    
+    def latest(self, suite: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o checkpoint mais avançado da suíte.
+        
+        Args:
+            suite: Nome da suíte
+        
+        Returns:
+            dict: Checkpoint ou None se não houver
+        """
+        suite_dir = self.directory / self._slug(suite)
+        if not suite_dir.exists():
+            return None
+        
+        for filepath in sorted(suite_dir.glob("*.json.gz"), reverse=True):
+            try:
+                with gzip.open(filepath, 'rb') as f:
+                    return json.loads(f.read().decode('utf-8'))
+            except Exception:
+                continue
+        
+        return None
+    
+    def restore(self, driver: webdriver.Chrome, checkpoint: Dict[str, Any]) -> bool:
+        """
+        Restaura cookies, storages e URL de um checkpoint no navegador.
+        
+        Args:
+            driver: Instância do WebDriver
+            checkpoint: Checkpoint obtido via ``latest``
+        
+        Returns:
+            bool: True se restaurado
+        """
+        browser = checkpoint.get('browser')
+        if not browser:
+            return False
+        
+        try:
+            url = browser['url']
+            parts = urlsplit(url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            
+            if not BrowserState.set_cookies(driver, browser.get('cookies')):
+                driver.get(origin)
+                for cookie in browser['cookies']:
+                    try:
+                        driver.add_cookie(BrowserState.to_webdriver_cookie(cookie))
+                    except Exception:
+                        # add_cookie só aceita cookies do domínio atual
+                        continue
+            
+            script_id = BrowserState.add_storage_seed(
+                driver, origin, browser, guard=f"__e2e_checkpoint_{checkpoint['timestamp']}"
+            )
+            
+            if script_id:
+                driver.get(url)
+                BrowserState.remove_storage_seed(driver, script_id)
+            else:
+                # Sem CDP: carregar a página, gravar storages e recarregar
+                driver.get(url)
+                BrowserState.write_storages(driver, browser)
+                driver.refresh()
+            
+            print(f"♻️  Checkpoint restaurado: {checkpoint['step_name']}")
+            return True
+        
+        except Exception as e:
+            print(f"⚠️ Erro ao restaurar checkpoint: {e}")
+            return False
+    
+    def clear(self, suite: str) -> None:
+        """
+        Remove todos os checkpoints da suíte (ex.: após sucesso completo).
+        
+        Args:
+            suite: Nome da suíte
+        """
+        suite_dir = self.directory / self._slug(suite)
+        for filepath in suite_dir.glob("*.json.gz"):
+            filepath.unlink(missing_ok=True)
+    
+    def _enforce_retention(self) -> None:
+        """
+        Remove os checkpoints mais antigos até caber no limite de tamanho.
+        
+        O mais recente de cada suíte (inclusive o que acabou de ser salvo)
+        nunca é removido, mesmo que sozinho passe do limite.
+        """
+        files: List[Path] = sorted(
+            self.directory.glob("*/*.json.gz"), key=lambda p: p.stat().st_mtime
+        )
+        newest = {p.parent: p for p in files}
+        sizes = {p: p.stat().st_size for p in files}
+        total = sum(sizes.values())
+        
+        for oldest in files:
+            if total <= self.max_bytes:
+                break
+            if newest[oldest.parent] == oldest:
+                continue
+            total -= sizes[oldest]
+            oldest.unlink(missing_ok=True)
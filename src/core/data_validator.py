@@ -0,0 +1,415 @@
+"""
+Validação de Dados via API
+===========================
+
+Confere o que o wizard gravou consultando as APIs do backend (sem acesso
+direto ao banco). Os quatro recursos de um empreendimento (imóvel,
+empreendimento, atividades e caracterização) são buscados em paralelo e
+comparados com o ``contexto`` dos testes, gerando uma lista estruturada
+de diferenças.
+
+Em modo lote (``run_bulk``) vários empreendimentos são validados ao mesmo
+tempo compartilhando o mesmo pool de conexões.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..config.urls import urls
+from ..utils.http_client import HttpClient
+
+
+class DataValidator:
+    """Compara os dados persistidos (via API) com o contexto do wizard."""
+    
+    # Recurso -> método de URLs que monta o endpoint
+    RESOURCES = {
+        'property': 'get_property',
+        'enterprise': 'get_enterprise',
+        'activities': 'get_enterprise_activities',
+        'characterization': 'get_enterprise_characterization',
+    }
+    
+    # Recurso -> campo da API -> caminho no contexto (só comparado se presente)
+    FIELD_MAP = {
+        'property': {
+            'name': 'dados_imovel.nome',
+            'city': 'dados_imovel.municipio',
+            'state': 'dados_imovel.uf',
+            'latitude': 'dados_imovel.lat',
+            'longitude': 'dados_imovel.long',
+            'car_code': 'dados_imovel.car',
+            'cep': 'dados_imovel.cep',
+        },
+        'enterprise': {
+            'name': 'nome_preenchido',
+            'situation': 'situacao_preenchida',
+            'employees_count': 'empregados_preenchido',
+        },
+    }
+    
+    # Campos obrigatórios (ERRO se vazios) e recomendados (AVISO se vazios)
+    REQUIRED_FIELDS = {
+        'property': ['name', 'property_type_id', 'state', 'city'],
+        'enterprise': ['name', 'cnpj', 'responsible_name', 'responsible_cpf'],
+    }
+    RECOMMENDED_FIELDS = {
+        'property': ['latitude', 'longitude'],
+        'characterization': ['water_origin', 'water_consumption_human', 'effluent_destination'],
+    }
+    
+    # Onde procurar os IDs no contexto / no JSON do store
+    _ID_KEYS = {
+        'property_id': ('property_id', 'propertyId', 'imovelId', 'imovel_id'),
+        'enterprise_id': ('enterprise_id', 'enterpriseId', 'empreendimentoId', 'empreendimento_id'),
+    }
+    
+    def __init__(self, client: Optional[HttpClient] = None, base_url: Optional[str] = None):
+        """
+        Inicializa o validador.
+        
+        Args:
+            client: Cliente HTTP (padrão: um novo ``HttpClient`` por execução)
+            base_url: Backend alternativo (ex.: stub local) no lugar de BACKEND_URL
+        """
+        self.client = client
+        self.base_url = base_url.rstrip('/') if base_url else None
+    
+    def url_for(self, resource: str, resource_id: Any) -> str:
+        """
+        Monta a URL de um recurso.
+        
+        Args:
+            resource: Chave de ``RESOURCES``
+            resource_id: ID do imóvel ou do empreendimento
+        
+        Returns:
+            str: URL absoluta
+        """
+        return self.rebase(getattr(urls, self.RESOURCES[resource])(resource_id))
+    
+    def rebase(self, url: str) -> str:
+        """Troca BACKEND_URL por ``base_url`` (se informado) em uma URL de ``urls``."""
+        if self.base_url:
+            return self.base_url + url[len(urls.BACKEND):]
+        return url
+    
+    @classmethod
+    def extract_ids(cls, contexto: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Procura os IDs do imóvel e do empreendimento no contexto.
+        
+        Args:
+            contexto: Contexto dos testes (pode conter ``store_json``)
+        
+        Returns:
+            tuple: (property_id, enterprise_id); None se não encontrado
+        """
+        store = contexto.get('store_json') or {}
+        state = store.get('state') if isinstance(store, dict) else None
+        sources = [src for src in (contexto, store, state) if isinstance(src, dict)]
+        
+        found = []
+        for names in cls._ID_KEYS.values():
+            value = next(
+                (src[name] for src in sources for name in names if src.get(name)), None
+            )
+            found.append(value)
+        return found[0], found[1]
+    
+    async def fetch_all(
+        self,
+        client: HttpClient,
+        property_id: Any,
+        enterprise_id: Any,
+        known: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca os quatro recursos em paralelo.
+        
+        Sem ``property_id``, ele é lido da resposta do empreendimento e o
+        imóvel é buscado em seguida.
+        
+        Args:
+            client: Cliente HTTP aberto
+            property_id: ID do imóvel (opcional)
+            enterprise_id: ID do empreendimento
+            known: Recursos já obtidos (ex.: endpoint em lote), não buscados de novo
+        
+        Returns:
+            dict: Recurso -> resultado de ``HttpClient.get_json``
+        """
+        ids = {'property': property_id}
+        for resource in ('enterprise', 'activities', 'characterization'):
+            ids[resource] = enterprise_id
+        
+        results = dict(known or {})
+        pending = [r for r in self.RESOURCES if ids[r] is not None and r not in results]
+        responses = await asyncio.gather(
+            *(client.get_json(self.url_for(r, ids[r])) for r in pending)
+        )
+        results.update(zip(pending, responses))
+        
+        if 'property' not in results:
+            enterprise = self._unwrap(results['enterprise']['data']) or {}
+            property_id = enterprise.get('property_id') if isinstance(enterprise, dict) else None
+            if property_id is not None:
+                results['property'] = await client.get_json(self.url_for('property', property_id))
+        
+        for response in results.values():
+            response['data'] = self._unwrap(response['data'])
+        
+        return results
+    
+    async def validate(
+        self,
+        contexto: Dict[str, Any],
+        client: Optional[HttpClient] = None
+    ) -> Dict[str, Any]:
+        """
+        Valida um empreendimento.
+        
+        Args:
+            contexto: Contexto dos testes do wizard
+            client: Cliente HTTP aberto (padrão: ``self.client`` ou um novo)
+        
+        Returns:
+            dict: IDs, sucesso, diferencas (recurso, campo, status, esperado,
+                  obtido, mensagem), requisicoes (tempo por recurso) e duracao_ms
+        """
+        property_id, enterprise_id = self.extract_ids(contexto)
+        start = time.perf_counter()
+        
+        if enterprise_id is None:
+            return self.build_report(contexto, {}, start)
+        
+        own_client = client is None and self.client is None
+        client = client or self.client or HttpClient()
+        
+        try:
+            if own_client:
+                client.open()
+            results = await self.fetch_all(client, property_id, enterprise_id)
+        finally:
+            if own_client:
+                await client.close()
+        
+        return self.build_report(contexto, results, start)
+    
+    def build_report(
+        self,
+        contexto: Dict[str, Any],
+        results: Dict[str, Dict[str, Any]],
+        start: float
+    ) -> Dict[str, Any]:
+        """
+        Monta o relatório de um empreendimento a partir das respostas.
+        
+        Args:
+            contexto: Contexto dos testes
+            results: Saída de ``fetch_all`` (vazio se não havia ID)
+            start: ``time.perf_counter()`` do início da validação
+        
+        Returns:
+            dict: Relatório no formato de ``validate``
+        """
+        property_id, enterprise_id = self.extract_ids(contexto)
+        
+        relatorio = {
+            'property_id': property_id,
+            'enterprise_id': enterprise_id,
+            'sucesso': False,
+            'diferencas': [],
+            'requisicoes': {},
+        }
+        
+        if enterprise_id is None:
+            relatorio['diferencas'].append(self._entry(
+                'enterprise', 'id', 'ERRO', mensagem="ID do empreendimento não encontrado no contexto"
+            ))
+            relatorio['duracao_ms'] = 0.0
+            return relatorio
+        
+        imovel = (results.get('property') or {}).get('data')
+        if property_id is None and isinstance(imovel, dict):
+            relatorio['property_id'] = imovel.get('id')
+        
+        relatorio['requisicoes'] = {
+            resource: {k: r[k] for k in ('status', 'elapsed_ms', 'attempts', 'error')}
+            for resource, r in results.items()
+        }
+        relatorio['diferencas'] = self.diff(contexto, results)
+        relatorio['sucesso'] = not any(d['status'] == 'ERRO' for d in relatorio['diferencas'])
+        relatorio['duracao_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return relatorio
+    
+    def diff(
+        self,
+        contexto: Dict[str, Any],
+        results: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Compara as respostas das APIs com o contexto.
+        
+        Args:
+            contexto: Contexto dos testes
+            results: Saída de ``fetch_all``
+        
+        Returns:
+            list: Diferenças encontradas (apenas status ERRO e AVISO)
+        """
+        diferencas = []
+        
+        for resource in self.RESOURCES:
+            response = results.get(resource)
+            if response is None:
+                diferencas.append(self._entry(resource, '*', 'ERRO', mensagem="Recurso não consultado (ID ausente)"))
+                continue
+            if response['error']:
+                diferencas.append(self._entry(resource, '*', 'ERRO', mensagem=response['error']))
+                continue
+            
+            data = response['data']
+            
+            if resource == 'activities':
+                atividades = data if isinstance(data, list) else (data or {}).get('activities', [])
+                if not atividades:
+                    diferencas.append(self._entry(resource, '*', 'ERRO', mensagem="Nenhuma atividade encontrada"))
+                for idx, atividade in enumerate(atividades):
+                    if isinstance(atividade, dict) and not atividade.get('quantity'):
+                        diferencas.append(self._entry(
+                            resource, f"[{idx}].quantity", 'AVISO', mensagem="Quantidade não preenchida"
+                        ))
+                continue
+            
+            if not isinstance(data, dict) or not data:
+                diferencas.append(self._entry(resource, '*', 'ERRO', mensagem="Registro não encontrado"))
+                continue
+            
+            for field in self.REQUIRED_FIELDS.get(resource, []):
+                if self._is_empty(self._get_path(data, field)):
+                    diferencas.append(self._entry(resource, field, 'ERRO', mensagem="Campo vazio"))
+            
+            for field in self.RECOMMENDED_FIELDS.get(resource, []):
+                if self._is_empty(self._get_path(data, field)):
+                    diferencas.append(self._entry(resource, field, 'AVISO', mensagem="Não preenchido"))
+            
+            for field, path in self.FIELD_MAP.get(resource, {}).items():
+                esperado = self._get_path(contexto, path)
+                if self._is_empty(esperado):
+                    continue
+                obtido = self._get_path(data, field)
+                if not self._equal(esperado, obtido):
+                    diferencas.append(self._entry(
+                        resource, field, 'ERRO', esperado, obtido, "Valor diferente do preenchido"
+                    ))
+        
+        return diferencas
+    
+    async def validate_many(
+        self,
+        contextos: List[Dict[str, Any]],
+        concurrency: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Valida vários empreendimentos compartilhando o mesmo pool de conexões.
+        
+        Args:
+            contextos: Lista de contextos (ou dicts só com os IDs)
+            concurrency: Empreendimentos validados ao mesmo tempo (padrão: API_CONCURRENCY)
+        
+        Returns:
+            list: Relatórios na mesma ordem de ``contextos``
+        """
+        limit = asyncio.Semaphore(concurrency or settings.API_CONCURRENCY)
+        client = self.client or HttpClient()
+        
+        async def one(contexto):
+            async with limit:
+                return await self.validate(contexto, client)
+        
+        async with client:
+            return await asyncio.gather(*(one(c) for c in contextos))
+    
+    def run(self, contexto: Dict[str, Any]) -> Dict[str, Any]:
+        """Versão síncrona de ``validate`` (para testes/orquestradores síncronos)."""
+        return asyncio.run(self.validate(contexto))
+    
+    def run_bulk(self, contextos: List[Dict[str, Any]], concurrency: int = None) -> Dict[str, Any]:
+        """
+        Versão síncrona de ``validate_many`` com resumo de vazão.
+        
+        Args:
+            contextos: Lista de contextos
+            concurrency: Empreendimentos validados ao mesmo tempo
+        
+        Returns:
+            dict: total, sucesso, falhas, duracao_s, por_minuto e relatorios
+        """
+        start = time.perf_counter()
+        relatorios = asyncio.run(self.validate_many(contextos, concurrency))
+        duracao = time.perf_counter() - start
+        
+        sucesso = sum(1 for r in relatorios if r['sucesso'])
+        resumo = {
+            'total': len(relatorios),
+            'sucesso': sucesso,
+            'falhas': len(relatorios) - sucesso,
+            'duracao_s': round(duracao, 2),
+            'por_minuto': round(len(relatorios) / duracao * 60, 1) if duracao else 0.0,
+            'relatorios': relatorios,
+        }
+        
+        print(f"📊 Validação em lote: {resumo['total']} empreendimento(s) em {resumo['duracao_s']}s "
+              f"({resumo['por_minuto']}/min) - ✓ {sucesso} ✗ {resumo['falhas']}")
+        return resumo
+    
+    @staticmethod
+    def _entry(
+        resource: str,
+        campo: str,
+        status: str,
+        esperado: Any = None,
+        obtido: Any = None,
+        mensagem: str = ""
+    ) -> Dict[str, Any]:
+        """Monta uma entrada da lista de diferenças."""
+        return {
+            'recurso': resource,
+            'campo': campo,
+            'status': status,
+            'esperado': esperado,
+            'obtido': obtido,
+            'mensagem': mensagem,
+        }
+    
+    @staticmethod
+    def _unwrap(data: Any) -> Any:
+        """Remove o envelope ``{"data": ...}`` usado por algumas respostas."""
+        if isinstance(data, dict) and 'data' in data and set(data) <= {'data', 'meta', 'success', 'message'}:
+            return data['data']
+        return data
+    
+    @staticmethod
+    def _get_path(data: Any, path: str) -> Any:
+        """Lê um caminho pontuado (``a.b.c``) de dicts aninhados."""
+        for part in path.split('.'):
+            if not isinstance(data, dict):
+                return None
+            data = data.get(part)
+        return data
+    
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        return value is None or value == '' or value == [] or value == {}
+    
+    @staticmethod
+    def _equal(esperado: Any, obtido: Any) -> bool:
+        """Compara valores tolerando diferença de tipo (ex.: "500" x 500.0)."""
+        try:
+            return abs(float(esperado) - float(obtido)) < 1e-6
+        except (TypeError, ValueError):
+            pass
+        return str(esperado).strip().casefold() == str(obtido).strip().casefold()
@@ -5,45 +5,96 @@ Gerenciador do WebDriver
 Centraliza a criação e configuração do WebDriver.
 """
 
+import queue
+import threading
+from typing import Dict, List, Optional
+
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
+from .auth_cache import auth_cache
+from .driver_resolver import driver_resolver
+from .resource_blocker import resource_blocker
 from ..config.settings import settings
+from ..utils.step_timer import step_timer
+from ..utils.wait_helper import WaitHelper
 
 
 class DriverManager:
     """Gerenciador do WebDriver."""
     
+    # Perfis disponíveis para create_driver(profile=...)
+    PROFILES = ("default", "fast")
+    
+    # Flags do perfil "fast" (além do headless novo e da janela fixa)
+    FAST_ARGUMENTS = (
+        '--disable-extensions',
+        '--disable-component-extensions-with-background-pages',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+        '--disable-background-networking',
+        '--disable-default-apps',
+        '--disable-sync',
+        '--no-first-run',
+        '--mute-audio',
+    )
+    
     @staticmethod
-    def create_driver(headless: bool = None, maximize: bool = None) -> webdriver.Chrome:
+    def create_driver(
+        headless: bool = None,
+        maximize: bool = None,
+        profile: str = None
+    ) -> webdriver.Chrome:
         """
         Cria uma nova instância do Chrome WebDriver.
         
         Args:
             headless: Executar em modo headless (sem interface gráfica)
             maximize: Maximizar janela do navegador
-            
+            profile: "default" ou "fast" (padrão: DRIVER_PROFILE). O perfil
+                     fast usa --headless=new, janela fixa (FAST_WINDOW_SIZE),
+                     desliga extensões/throttling e bloqueia FAST_BLOCKED_URLS;
+                     ``headless``/``maximize`` são ignorados nele
+        
         Returns:
             webdriver.Chrome: Instância do Chrome WebDriver
+        
+        Raises:
+            ValueError: Se o perfil não existir
         """
         # Usar configurações padrão se não fornecidas
         if headless is None:
             headless = settings.HEADLESS
         if maximize is None:
             maximize = settings.MAXIMIZE_WINDOW
+        if profile is None:
+            profile = settings.DRIVER_PROFILE
+        
+        if profile not in DriverManager.PROFILES:
+            raise ValueError(f"Perfil de navegador desconhecido: {profile} (use {DriverManager.PROFILES})")
+        
+        fast = profile == "fast"
         
         # Configurar opções do Chrome
         options = Options()
         
-        if headless:
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-        
-        if maximize:
-            options.add_argument('--start-maximized')
+        if fast:
+            options.add_argument('--headless=new')
+            options.add_argument(f'--window-size={settings.FAST_WINDOW_SIZE}')
+            for argument in DriverManager.FAST_ARGUMENTS:
+                options.add_argument(argument)
+            # Log de rede para contabilizar requisições bloqueadas
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        else:
+            if headless:
+                options.add_argument('--headless')
+                options.add_argument('--disable-gpu')
+            
+            if maximize:
+                options.add_argument('--start-maximized')
         
         # Opções adicionais para estabilidade
         options.add_argument('--no-sandbox')
@@ -60,20 +111,23 @@ class DriverManager:
         }
         options.add_experimental_option("prefs", prefs)
         
-        # Criar serviço do ChromeDriver
-        if settings.USE_WEBDRIVER_MANAGER:
-            # Usar webdriver-manager (baixa versão correta automaticamente)
-            service = Service(ChromeDriverManager().install())
-        else:
-            # Usar ChromeDriver local
-            service = Service(settings.CHROME_DRIVER_PATH)
+        # Criar driver (ChromeDriver resolvido uma vez por máquina e,
+        # quando possível, compartilhado entre as sessões do processo)
+        driver = driver_resolver.create_chrome(options)
         
-        # Criar driver
-        driver = webdriver.Chrome(service=service, options=options)
+        # Tempo de cada comando do WebDriver (relatório/trace por execução)
+        step_timer.instrument_driver(driver)
         
         # Configurar timeout implícito
         driver.implicitly_wait(5)
         
+        if fast:
+            resource_blocker.apply(driver)
+        
+        # Rastreador de DOM/rede para as esperas de conclusão
+        if not WaitHelper.is_fixed_mode():
+            WaitHelper.install_activity_tracker(driver)
+        
         return driver
     
     @staticmethod
@@ -84,7 +138,7 @@ class DriverManager:
         Args:
             driver: Instância do WebDriver
             timeout: Tempo máximo de espera em segundos
-            
+        
         Returns:
             WebDriverWait: Instância do WebDriverWait
         """
@@ -102,7 +156,255 @@ class DriverManager:
             driver: Instância do WebDriver
         """
         if driver:
+            resource_blocker.collect(driver)
             try:
                 driver.quit()
             except Exception:
                 pass
+
+
+class DriverPool:
+    """
+    Pool de navegadores Chrome reaproveitados entre testes.
+    
+    Em vez de abrir e fechar o Chrome a cada teste, mantém até ``size``
+    instâncias abertas. Ao devolver um driver, o estado da sessão é limpo
+    (cookies, storages, abas extras) e o navegador volta para about:blank.
+    Sessões quebradas, com vazamento ou que atingiram ``max_uses`` são
+    descartadas e substituídas por uma nova instância.
+    """
+    
+    def __init__(
+        self,
+        size: int = None,
+        max_uses: int = None,
+        max_tabs: int = None,
+        max_heap_mb: int = None,
+        headless: bool = None,
+        maximize: bool = None,
+        profile: str = None
+    ):
+        """
+        Inicializa o pool (os navegadores só são abertos em ``start``/``acquire``).
+        
+        Args:
+            size: Quantidade máxima de navegadores abertos
+            max_uses: Usos por navegador antes de reciclar
+            max_tabs: Número de abas a partir do qual a sessão é reciclada
+            max_heap_mb: Heap JS (MB) a partir do qual a sessão é reciclada
+            headless: Executar em modo headless
+            maximize: Maximizar janela do navegador
+            profile: Perfil dos navegadores ("default" ou "fast")
+        """
+        self.size = max(1, size if size is not None else settings.DRIVER_POOL_SIZE)
+        self.max_uses = max_uses if max_uses is not None else settings.DRIVER_POOL_MAX_USES
+        self.max_tabs = max_tabs if max_tabs is not None else settings.DRIVER_POOL_MAX_TABS
+        self.max_heap_mb = max_heap_mb if max_heap_mb is not None else settings.DRIVER_POOL_MAX_HEAP_MB
+        self.headless = headless
+        self.maximize = maximize
+        self.profile = profile
+        
+        self._idle: "queue.LifoQueue[webdriver.Chrome]" = queue.LifoQueue()
+        self._uses: Dict[int, int] = {}
+        self._all: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def start(self, count: int = None) -> None:
+        """
+        Pré-abre navegadores para que o primeiro teste não pague o cold start.
+        
+        Args:
+            count: Quantidade a pré-abrir (padrão: tamanho do pool)
+        """
+        count = self.size if count is None else min(count, self.size)
+        
+        while len(self._all) < count:
+            driver = self._launch()
+            if driver is None:
+                break
+            self._idle.put(driver)
+    
+    def acquire(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        Obtém um navegador do pool.
+        
+        Reusa uma instância ociosa; se não houver e o limite não foi atingido,
+        abre uma nova. Caso contrário, aguarda uma devolução.
+        
+        Args:
+            timeout: Tempo máximo de espera por um navegador livre
+        
+        Returns:
+            webdriver.Chrome: Instância pronta para uso
+        
+        Raises:
+            RuntimeError: Se o pool estiver fechado ou esgotado após o timeout
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool já foi encerrado")
+        
+        if timeout is None:
+            timeout = settings.TEST_TIMEOUT * 3
+        
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = self._launch()
+            if driver is None:
+                try:
+                    driver = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise RuntimeError(
+                        f"Nenhum navegador livre no pool após {timeout}s "
+                        f"(tamanho: {self.size})"
+                    )
+        
+        if not self._is_healthy(driver):
+            self._discard(driver)
+            return self.acquire(timeout)
+        
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        
+        return driver
+    
+    def release(self, driver: webdriver.Chrome) -> None:
+        """
+        Devolve um navegador ao pool, limpando o estado da sessão.
+        
+        Args:
+            driver: Instância obtida via ``acquire``
+        """
+        if driver is None:
+            return
+        
+        if self._closed:
+            self._discard(driver)
+            return
+        
+        uses = self._uses.get(id(driver), 0)
+        if self.max_uses and uses >= self.max_uses:
+            self._discard(driver)
+            return
+        
+        resource_blocker.collect(driver)
+        
+        if not self.reset_driver(driver) or not self._is_healthy(driver):
+            self._discard(driver)
+            return
+        
+        self._idle.put(driver)
+    
+    def shutdown(self) -> None:
+        """Fecha todos os navegadores do pool."""
+        with self._lock:
+            self._closed = True
+            drivers = [d for d in self._all if d is not None]
+            self._all.clear()
+            self._uses.clear()
+        
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        
+        for driver in drivers:
+            DriverManager.quit_driver(driver)
+    
+    @staticmethod
+    def reset_driver(driver: webdriver.Chrome) -> bool:
+        """
+        Limpa o estado da sessão para o próximo teste.
+        
+        Fecha abas extras, remove o script de sessão em cache (``auth_cache``),
+        apaga cookies, localStorage/sessionStorage e navega para about:blank.
+        
+        Args:
+            driver: Instância do WebDriver
+        
+        Returns:
+            bool: True se a limpeza foi concluída
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            # O próximo teste não pode começar já autenticado
+            auth_cache.eject(driver)
+            
+            # Storages só são acessíveis na origem atual
+            driver.execute_script(
+                "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": settings.FRONTEND_URL,
+                "storageTypes": "local_storage,session_storage,indexeddb,cache_storage"
+            })
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+    
+    def _is_healthy(self, driver: webdriver.Chrome) -> bool:
+        """Verifica se a sessão responde e não está vazando recursos."""
+        try:
+            if len(driver.window_handles) > self.max_tabs:
+                return False
+            
+            heap = driver.execute_script(
+                "return (performance.memory && performance.memory.usedJSHeapSize) || 0;"
+            )
+            if self.max_heap_mb and heap and heap > self.max_heap_mb * 1024 * 1024:
+                return False
+            
+            return True
+        except Exception:
+            return False
+    
+    def _launch(self) -> Optional[webdriver.Chrome]:
+        """Abre um novo navegador se o limite do pool permitir."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DriverPool já foi encerrado")
+            if len(self._all) >= self.size:
+                return None
+            # Reservar a vaga antes de abrir (create_driver é lento)
+            self._all.append(None)
+        
+        try:
+            driver = DriverManager.create_driver(
+                headless=self.headless, maximize=self.maximize, profile=self.profile
+            )
+        except Exception:
+            with self._lock:
+                if None in self._all:
+                    self._all.remove(None)
+            raise
+        
+        with self._lock:
+            # shutdown() pode ter esvaziado o pool durante a abertura
+            slot = None if self._closed or None not in self._all else self._all.index(None)
+            if slot is not None:
+                self._all[slot] = driver
+                self._uses[id(driver)] = 0
+        
+        if slot is None:
+            DriverManager.quit_driver(driver)
+            raise RuntimeError("DriverPool encerrado durante a abertura do navegador")
+        
+        return driver
+    
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        """Remove a instância do pool e fecha o navegador."""
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            self._uses.pop(id(driver), None)
+        
+        DriverManager.quit_driver(driver)
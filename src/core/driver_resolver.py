@@ -0,0 +1,355 @@
+"""
+Resolução do ChromeDriver
+==========================
+
+Descobre o executável do ChromeDriver uma única vez por máquina e guarda
+o resultado em disco junto com a versão do Chrome instalado; enquanto o
+Chrome não mudar de versão, nenhuma resolução é refeita.
+
+Ordem de busca: cache em disco -> pacote local (DRIVER_BUNDLE_DIR, para
+ambientes offline, no mesmo espírito da pasta ``wheels/``) ->
+webdriver-manager (USE_WEBDRIVER_MANAGER) -> CHROME_DRIVER_PATH ->
+Selenium Manager.
+
+Também mantém um único processo do ChromeDriver compartilhado pelas
+sessões do processo (DRIVER_SHARED_SERVICE) e mede o cold start de cada
+navegador.
+"""
+
+import atexit
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from ..config.settings import settings, BASE_DIR
+
+
+_VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+
+class DriverResolver:
+    """Resolve, memoiza e compartilha o ChromeDriver."""
+    
+    # Executáveis procurados quando CHROME_BINARY não é informado
+    CHROME_CANDIDATES = (
+        'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+        r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    )
+    
+    def __init__(self, cache_file: Path = None):
+        """
+        Inicializa o resolvedor.
+        
+        Args:
+            cache_file: Arquivo do cache em disco (padrão: DRIVER_CACHE_FILE)
+        """
+        self._cache_file = Path(cache_file) if cache_file else None
+        self.cold_starts: List[float] = []
+        self.resolution: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._service: Optional[Service] = None
+        self._service_failed = False
+        self.shared_sessions = 0
+    
+    @property
+    def cache_file(self) -> Path:
+        """Arquivo do cache em disco."""
+        return self._cache_file or Path(settings.DRIVER_CACHE_FILE).expanduser()
+    
+    def chrome_version(self) -> Optional[str]:
+        """
+        Versão do Chrome instalado (ex.: "120.0.6099.109").
+        
+        Returns:
+            str: Versão ou None se não for possível detectar
+        """
+        if sys.platform == 'win32' and not settings.CHROME_BINARY:
+            version = self._chrome_version_from_registry()
+            if version:
+                return version
+        
+        candidates = [settings.CHROME_BINARY] if settings.CHROME_BINARY else self.CHROME_CANDIDATES
+        
+        for candidate in candidates:
+            path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+            if not path:
+                continue
+            version = self._binary_version(path)
+            if version:
+                return version
+        
+        return None
+    
+    def fingerprint(self, chrome_version: Optional[str]) -> str:
+        """Identifica a combinação sistema + arquitetura + versão do Chrome."""
+        return f"{platform.system().lower()}-{platform.machine().lower()}-chrome-{chrome_version or 'desconhecido'}"
+    
+    def resolve(self) -> Optional[str]:
+        """
+        Caminho do ChromeDriver compatível com o Chrome instalado.
+        
+        O resultado fica em memória (processo) e em disco (máquina).
+        
+        Returns:
+            str: Caminho do executável, ou None para deixar o Selenium Manager resolver
+        """
+        with self._lock:
+            if self.resolution is not None:
+                return self.resolution['path']
+            
+            start = time.perf_counter()
+            chrome = self.chrome_version()
+            key = self.fingerprint(chrome)
+            cache = self._read_cache()
+            
+            entry = cache.get(key)
+            if entry and entry.get('path') and os.path.isfile(entry['path']):
+                source = 'cache'
+            else:
+                entry = self._resolve_uncached(chrome)
+                entry['resolved_at'] = time.time()
+                if entry['path']:
+                    cache[key] = entry
+                    self._write_cache(cache)
+                source = entry['source']
+            
+            self.resolution = {
+                'path': entry['path'],
+                'source': source,
+                'chrome_version': chrome,
+                'fingerprint': key,
+                'seconds': round(time.perf_counter() - start, 3)
+            }
+            
+            print(f"🧭 ChromeDriver ({source}): {entry['path'] or 'Selenium Manager'} "
+                  f"[Chrome {chrome or '?'}] em {self.resolution['seconds']:.2f}s")
+            return entry['path']
+    
+    def create_chrome(self, options: Options) -> webdriver.Chrome:
+        """
+        Abre um Chrome usando o ChromeDriver resolvido e mede o cold start.
+        
+        Com DRIVER_SHARED_SERVICE=true, todas as sessões do processo falam
+        com o mesmo processo do ChromeDriver; se isso não for possível,
+        cada navegador ganha o seu próprio ``Service``.
+        
+        Args:
+            options: Opções do Chrome
+        
+        Returns:
+            webdriver.Chrome: Navegador aberto (atributo ``_e2e_cold_start`` em segundos)
+        """
+        path = self.resolve()
+        start = time.perf_counter()
+        
+        driver = None
+        if settings.DRIVER_SHARED_SERVICE and not self._service_failed:
+            driver = self._create_on_shared_service(options)
+            if driver is not None:
+                with self._lock:
+                    self.shared_sessions += 1
+        
+        if driver is None:
+            service = Service(path) if path else Service()
+            driver = webdriver.Chrome(service=service, options=options)
+        
+        elapsed = time.perf_counter() - start
+        driver._e2e_cold_start = elapsed
+        with self._lock:
+            self.cold_starts.append(elapsed)
+        
+        return driver
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Resume a resolução e os cold starts da execução e imprime o relatório.
+        
+        Returns:
+            dict: resolution, browsers, shared_sessions (abertos no ChromeDriver
+                  compartilhado), cold_start_avg_s, cold_start_max_s
+        """
+        with self._lock:
+            starts = list(self.cold_starts)
+            shared = self.shared_sessions
+        
+        summary = {
+            'resolution': self.resolution,
+            'browsers': len(starts),
+            'shared_sessions': shared,
+            'cold_start_avg_s': round(sum(starts) / len(starts), 3) if starts else 0.0,
+            'cold_start_max_s': round(max(starts), 3) if starts else 0.0
+        }
+        
+        if starts:
+            print(f"\n🚀 Cold start: {summary['browsers']} navegador(es), "
+                  f"média {summary['cold_start_avg_s']:.2f}s, máximo {summary['cold_start_max_s']:.2f}s "
+                  f"(resolução do driver: {self.resolution['seconds']:.2f}s via {self.resolution['source']})")
+            if settings.DRIVER_SHARED_SERVICE:
+                print(f"   ChromeDriver compartilhado: {shared} de {len(starts)} navegador(es)"
+                      + ("" if shared else " ⚠️ (caiu para um ChromeDriver por navegador)"))
+        
+        return summary
+    
+    def stop_service(self) -> None:
+        """Encerra o ChromeDriver compartilhado (registrado no atexit)."""
+        with self._lock:
+            service, self._service = self._service, None
+        if service is not None:
+            try:
+                service.stop()
+            except Exception:
+                pass
+    
+    def _resolve_uncached(self, chrome: Optional[str]) -> Dict[str, Any]:
+        """Procura o driver no pacote local, no webdriver-manager e no caminho configurado."""
+        major = chrome.split('.')[0] if chrome else None
+        
+        bundled = self._find_in_bundle(major)
+        if bundled:
+            return {'path': bundled, 'source': 'bundle', 'chrome_version': chrome}
+        
+        if settings.USE_WEBDRIVER_MANAGER:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                return {'path': ChromeDriverManager().install(), 'source': 'webdriver-manager',
+                        'chrome_version': chrome}
+            except Exception as e:
+                print(f"⚠️ webdriver-manager falhou: {e}")
+        
+        if settings.CHROME_DRIVER_PATH and os.path.isfile(settings.CHROME_DRIVER_PATH):
+            return {'path': settings.CHROME_DRIVER_PATH, 'source': 'CHROME_DRIVER_PATH',
+                    'chrome_version': chrome}
+        
+        return {'path': None, 'source': 'selenium-manager', 'chrome_version': chrome}
+    
+    def _find_in_bundle(self, major: Optional[str]) -> Optional[str]:
+        """Procura um chromedriver da mesma versão principal do Chrome em DRIVER_BUNDLE_DIR."""
+        bundle = Path(settings.DRIVER_BUNDLE_DIR).expanduser()
+        if not bundle.is_absolute():
+            bundle = BASE_DIR / bundle
+        if not bundle.is_dir():
+            return None
+        
+        names = ('chromedriver.exe',) if sys.platform == 'win32' else ('chromedriver',)
+        found = [p for name in names for p in sorted(bundle.rglob(name)) if p.is_file()]
+        
+        for path in found:
+            version = self._binary_version(str(path))
+            if version and (major is None or version.split('.')[0] == major):
+                return str(path)
+        
+        return None
+    
+    def _create_on_shared_service(self, options: Options) -> Optional[webdriver.Chrome]:
+        """Cria a sessão no ChromeDriver compartilhado (None se não suportado)."""
+        try:
+            from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+            from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+        except ImportError as e:
+            print(f"⚠️ ChromeDriver compartilhado não suportado por este Selenium ({e}); usando um por navegador")
+            self._service_failed = True
+            return None
+        
+        try:
+            service = self._shared_service()
+            driver = _SharedServiceChrome.__new__(_SharedServiceChrome)
+            executor = ChromiumRemoteConnection(
+                remote_server_addr=service.service_url, vendor_prefix="goog",
+                browser_name="chrome", keep_alive=True
+            )
+            RemoteWebDriver.__init__(driver, command_executor=executor, options=options)
+            driver._is_remote = False
+            driver.service = service
+            return driver
+        except Exception as e:
+            print(f"⚠️ ChromeDriver compartilhado indisponível ({e}); usando um por navegador")
+            self._service_failed = True
+            return None
+    
+    def _shared_service(self) -> Service:
+        """Inicia (uma vez) o processo do ChromeDriver compartilhado."""
+        with self._lock:
+            if self._service is not None and self._service.is_connectable():
+                return self._service
+            
+            path = self.resolution['path'] if self.resolution else None
+            if not path:
+                raise RuntimeError("caminho do ChromeDriver não resolvido")
+            
+            service = Service(path)
+            service.start()
+            if self._service is None:
+                atexit.register(self.stop_service)
+            self._service = service
+            return service
+    
+    @staticmethod
+    def _binary_version(path: str) -> Optional[str]:
+        """Executa ``<binário> --version`` e extrai a versão."""
+        try:
+            output = subprocess.run(
+                [path, '--version'], capture_output=True, text=True, timeout=15
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = _VERSION_RE.search(output or '')
+        return match.group(0) if match else None
+    
+    @staticmethod
+    def _chrome_version_from_registry() -> Optional[str]:
+        """Versão do Chrome no registro do Windows (sem abrir o navegador)."""
+        try:
+            import winreg
+        except ImportError:
+            return None
+        
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+    
+    def _read_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_cache(self, cache: Dict[str, Any]) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o cache do ChromeDriver: {e}")
+
+
+class _SharedServiceChrome(webdriver.Chrome):
+    """Chrome conectado a um ChromeDriver compartilhado: ``quit`` não encerra o serviço."""
+    
+    def quit(self) -> None:
+        from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+        RemoteWebDriver.quit(self)
+
+
+# Instância global (uma por processo / worker xdist)
+driver_resolver = DriverResolver()
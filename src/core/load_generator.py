@@ -0,0 +1,431 @@
+"""
+Gerador de Carga do Wizard
+===========================
+
+Simula vários analistas cadastrando empreendimentos ao mesmo tempo: cada
+usuário virtual abre o próprio navegador headless e repete o fluxo
+LoginPage → EmpreendimentoPage → etapas do wizard (as mesmas de
+``WizardBenchmark.STEPS``), com entrada escalonada (ramp-up) e tempo de
+"reflexão" aleatório entre as etapas.
+
+A latência de cada etapa (do clique de avanço até a etapa seguinte estar
+visível e estável, medida por ``WaitHelper.wait_for_step_transition``; o
+preenchimento dos formulários fica de fora) vai para histogramas
+log-lineares (``LatencyHistogram``), no total e por janela de tempo, para
+acompanhar vazão, erros e percentis ao longo do teste. Etapas sem clique
+de avanço (Auto-Login) usam a duração da ação inteira.
+
+Uso:
+    python -m src.core.load_generator --users 30 --ramp-up 60 --duration 600 --stub
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .benchmark import WizardBenchmark
+from .driver_manager import DriverManager
+from ..config.settings import settings, REPORTS_DIR
+from ..stub import StubServer
+from ..utils.json_serializer import json_serializer
+from ..utils.latency_histogram import LatencyHistogram
+from ..utils.step_timer import step_timer
+
+
+class _Window:
+    """Amostras de uma janela de tempo do teste."""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.steps = 0
+        self.errors = 0
+        self.flows = 0
+
+
+class LoadGenerator:
+    """Executa o wizard em N sessões concorrentes e mede a latência por etapa."""
+    
+    # Distribuições aceitas para o tempo de reflexão
+    THINK_DISTRIBUTIONS = ("constant", "uniform", "exponential", "normal")
+    
+    def __init__(
+        self,
+        users: int = None,
+        ramp_up: float = None,
+        duration: float = None,
+        iterations: int = None,
+        think_time: float = None,
+        think_distribution: str = None,
+        tipo: str = None,
+        interval: float = None,
+        seed: int = None
+    ):
+        """
+        Inicializa o gerador de carga.
+        
+        Args:
+            users: Usuários virtuais simultâneos (padrão: LOAD_USERS)
+            ramp_up: Segundos até todos os usuários estarem ativos (padrão: LOAD_RAMP_UP)
+            duration: Duração máxima em segundos, 0 = sem limite (padrão: LOAD_DURATION)
+            iterations: Fluxos por usuário, 0 = até acabar o tempo (padrão: LOAD_ITERATIONS)
+            think_time: Média do tempo entre etapas em segundos (padrão: LOAD_THINK_TIME)
+            think_distribution: constant, uniform, exponential ou normal
+                                (padrão: LOAD_THINK_DISTRIBUTION)
+            tipo: Tipo de imóvel do wizard (padrão: BENCH_TIPO_IMOVEL)
+            interval: Largura das janelas do relatório em segundos (padrão: LOAD_INTERVAL)
+            seed: Semente dos tempos de reflexão (padrão: LOAD_SEED)
+        
+        Raises:
+            ValueError: Se a distribuição não existir ou não houver critério de parada
+        """
+        self.users = max(1, users or settings.LOAD_USERS)
+        self.ramp_up = max(0.0, settings.LOAD_RAMP_UP if ramp_up is None else ramp_up)
+        self.duration = max(0.0, settings.LOAD_DURATION if duration is None else duration)
+        self.iterations = max(0, settings.LOAD_ITERATIONS if iterations is None else iterations)
+        self.think_time = max(0.0, settings.LOAD_THINK_TIME if think_time is None else think_time)
+        self.think_distribution = (think_distribution or settings.LOAD_THINK_DISTRIBUTION).lower()
+        self.tipo = (tipo or settings.BENCH_TIPO_IMOVEL).upper()
+        self.interval = max(1.0, interval or settings.LOAD_INTERVAL)
+        self.seed = settings.LOAD_SEED if seed is None else seed
+        
+        if self.think_distribution not in self.THINK_DISTRIBUTIONS:
+            raise ValueError(
+                f"Distribuição desconhecida: {self.think_distribution} (use {self.THINK_DISTRIBUTIONS})"
+            )
+        if not self.duration and not self.iterations:
+            raise ValueError("Defina a duração ou a quantidade de fluxos por usuário")
+        
+        self.steps = {name: LatencyHistogram() for name, _ in WizardBenchmark.STEPS}
+        self.flow = LatencyHistogram()
+        self.errors: Dict[str, int] = {name: 0 for name, _ in WizardBenchmark.STEPS}
+        self.error_samples: List[Dict[str, Any]] = []
+        self.windows: Dict[int, _Window] = {}
+        self.started_users = 0
+        self.failed_users = 0
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start = 0.0
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Sobe os usuários virtuais, espera terminarem e consolida o resultado.
+        
+        Returns:
+            dict: Resultado (ver ``summarize``)
+        """
+        print(f"\n🏋️ Carga no wizard: {self.users} usuário(s), ramp-up {self.ramp_up:g}s, "
+              f"{self._stop_criteria()}, reflexão {self.think_distribution} {self.think_time:g}s, "
+              f"frontend {settings.FRONTEND_URL}")
+        
+        self._start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._user, args=(index,), name=f"vu-{index}", daemon=True)
+            for index in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        timer = None
+        if self.duration:
+            timer = threading.Timer(self.ramp_up + self.duration, self._stop.set)
+            timer.daemon = True
+            timer.start()
+        
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            print("\n⚠️ Interrompido: aguardando os usuários encerrarem...")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            if timer:
+                timer.cancel()
+        
+        return self.summarize(time.perf_counter() - self._start)
+    
+    def stop(self) -> None:
+        """Pede aos usuários virtuais que parem após a etapa em andamento."""
+        self._stop.set()
+    
+    def think(self, rng: random.Random) -> float:
+        """
+        Sorteia um tempo de reflexão.
+        
+        Args:
+            rng: Gerador do usuário virtual
+        
+        Returns:
+            float: Segundos (nunca negativo)
+        """
+        mean = self.think_time
+        if self.think_distribution == "constant":
+            return mean
+        if self.think_distribution == "uniform":
+            return rng.uniform(0, 2 * mean)
+        if self.think_distribution == "exponential":
+            return rng.expovariate(1 / mean) if mean else 0.0
+        return max(0.0, rng.gauss(mean, mean / 3))
+    
+    def summarize(self, elapsed: float) -> Dict[str, Any]:
+        """
+        Consolida histogramas, erros e a série temporal.
+        
+        Args:
+            elapsed: Duração real do teste em segundos
+        
+        Returns:
+            dict: config, elapsed_s, users, flows, steps (percentis e erros por
+                  etapa), timeline (vazão, erros e percentis por janela),
+                  histograms (faixas para recombinar) e errors (amostras)
+        """
+        flows_ok = self.flow.count
+        flows_failed = sum(self.errors.values())
+        
+        steps = {}
+        for name, histogram in self.steps.items():
+            attempts = histogram.count + self.errors[name]
+            steps[name] = dict(
+                histogram.summary(),
+                errors=self.errors[name],
+                error_rate=round(self.errors[name] / attempts, 4) if attempts else 0.0
+            )
+        
+        timeline = []
+        for index in sorted(self.windows):
+            window = self.windows[index]
+            attempts = window.steps + window.errors
+            timeline.append({
+                't_s': round(index * self.interval, 1),
+                'flows_per_min': round(window.flows / self.interval * 60, 2),
+                'steps_per_s': round(window.steps / self.interval, 2),
+                'errors': window.errors,
+                'error_rate': round(window.errors / attempts, 4) if attempts else 0.0,
+                'p50_ms': window.latency.percentile(50),
+                'p95_ms': window.latency.percentile(95),
+                'p99_ms': window.latency.percentile(99)
+            })
+        
+        return {
+            'name': 'load_wizard',
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'config': {
+                'users': self.users,
+                'ramp_up_s': self.ramp_up,
+                'duration_s': self.duration,
+                'iterations': self.iterations,
+                'think_time_s': self.think_time,
+                'think_distribution': self.think_distribution,
+                'tipo_imovel': self.tipo,
+                'interval_s': self.interval,
+                'frontend_url': settings.FRONTEND_URL,
+                'driver_profile': settings.LOAD_DRIVER_PROFILE
+            },
+            'elapsed_s': round(elapsed, 1),
+            'users': {'started': self.started_users, 'failed_to_start': self.failed_users},
+            'flows': {
+                'passed': flows_ok,
+                'failed': flows_failed,
+                'per_min': round(flows_ok / elapsed * 60, 2) if elapsed else 0.0,
+                'latency': self.flow.summary()
+            },
+            'steps': steps,
+            'timeline': timeline,
+            'histograms': {name: h.to_dict() for name, h in self.steps.items()},
+            'errors': self.error_samples
+        }
+    
+    def save(self, results: Dict[str, Any], output_dir: Path = None) -> Path:
+        """
+        Grava o resultado em reports/json.
+        
+        Args:
+            results: Resultado de ``run``
+            output_dir: Diretório (padrão: reports/json)
+        
+        Returns:
+            Path: Arquivo gravado
+        """
+        output_dir = Path(output_dir) if output_dir else REPORTS_DIR / "json"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filepath = output_dir / f"load_wizard_{results['config']['users']}u_{stamp}.json"
+        json_serializer.write(results, filepath)
+        
+        print(f"💾 Resultado: {filepath}")
+        return filepath
+    
+    def _user(self, index: int) -> None:
+        """Usuário virtual: espera a sua vez no ramp-up e repete o fluxo."""
+        rng = random.Random(self.seed + index)
+        delay = self.ramp_up * index / self.users
+        if delay and self._stop.wait(delay):
+            return
+        
+        try:
+            driver = DriverManager.create_driver(headless=True, profile=settings.LOAD_DRIVER_PROFILE)
+        except Exception as e:
+            with self._lock:
+                self.failed_users += 1
+            print(f"   ❌ Usuário {index}: navegador não abriu ({e})")
+            return
+        
+        wait = DriverManager.create_wait(driver)
+        with self._lock:
+            self.started_users += 1
+        
+        try:
+            iteration = 0
+            while not self._stop.is_set() and (not self.iterations or iteration < self.iterations):
+                iteration += 1
+                with step_timer.span(f"vu-{index} fluxo {iteration}", 'test'):
+                    self._flow(index, driver, wait, rng)
+        finally:
+            DriverManager.quit_driver(driver)
+    
+    def _flow(self, user: int, driver, wait, rng: random.Random) -> None:
+        """Um fluxo completo; a primeira etapa com falha encerra o fluxo."""
+        flow_start = time.perf_counter()
+        
+        for position, (name, action) in enumerate(WizardBenchmark.STEPS):
+            if position and self._stop.wait(self.think(rng)):
+                return
+            
+            step_timer.pop_transition()
+            start = time.perf_counter()
+            try:
+                passed, error = bool(action(driver, wait, self.tipo)), None
+            except Exception as e:
+                passed, error = False, str(e)
+            
+            # Última transição da ação = clique de avanço → próxima etapa visível
+            latency = step_timer.pop_transition()
+            if latency is None:
+                latency = (time.perf_counter() - start) * 1000
+            self._record(name, latency, passed, user, error)
+            if not passed:
+                return
+        
+        with self._lock:
+            self._window().flows += 1
+        self.flow.record((time.perf_counter() - flow_start) * 1000)
+    
+    def _record(self, step: str, ms: float, passed: bool, user: int, error: Optional[str]) -> None:
+        """Registra a etapa no histograma total e no da janela atual."""
+        with self._lock:
+            window = self._window()
+            if passed:
+                window.steps += 1
+            else:
+                window.errors += 1
+                self.errors[step] += 1
+                if len(self.error_samples) < settings.LOAD_MAX_ERROR_SAMPLES:
+                    self.error_samples.append({
+                        't_s': round(time.perf_counter() - self._start, 1),
+                        'user': user,
+                        'step': step,
+                        'error': (error or "etapa retornou False")[:300]
+                    })
+        
+        if passed:
+            self.steps[step].record(ms)
+            window.latency.record(ms)
+    
+    def _window(self) -> _Window:
+        """Janela de tempo atual (chamar com o lock)."""
+        index = int((time.perf_counter() - self._start) // self.interval)
+        if index not in self.windows:
+            self.windows[index] = _Window()
+        return self.windows[index]
+    
+    def _stop_criteria(self) -> str:
+        parts = []
+        if self.duration:
+            parts.append(f"{self.duration:g}s")
+        if self.iterations:
+            parts.append(f"{self.iterations} fluxo(s)/usuário")
+        return " ou ".join(parts)
+    
+    @staticmethod
+    def print_report(results: Dict[str, Any]) -> None:
+        """Imprime percentis por etapa e a série temporal."""
+        print("\n" + "=" * 100)
+        print(f"{'CARGA NO WIZARD':^100}")
+        print("=" * 100)
+        
+        flows = results['flows']
+        users = results['users']
+        print(f"\n👥 Usuários: {users['started']} ativos | {users['failed_to_start']} sem navegador")
+        print(f"📊 Fluxos: ✅ {flows['passed']} | ❌ {flows['failed']} | "
+              f"{flows['per_min']:g}/min em {results['elapsed_s']:g}s")
+        
+        print(f"\n   {'Etapa':<20}{'n':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'máx':>10}{'erros':>9}")
+        rows = list(results['steps'].items()) + [('Fluxo completo', dict(flows['latency'], errors=flows['failed']))]
+        for name, stats in rows:
+            print(f"   {name:<20}{stats['count']:>7}{stats['p50_ms'] / 1000:>9.2f}s"
+                  f"{stats['p90_ms'] / 1000:>9.2f}s{stats['p99_ms'] / 1000:>9.2f}s"
+                  f"{stats['max_ms'] / 1000:>9.2f}s{stats['errors']:>9}")
+        
+        if results['timeline']:
+            print(f"\n   {'t':>7}{'fluxos/min':>12}{'etapas/s':>10}{'erros':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+            for w in results['timeline']:
+                print(f"   {w['t_s']:>6g}s{w['flows_per_min']:>12g}{w['steps_per_s']:>10g}"
+                      f"{w['error_rate']:>7.1%} {w['p50_ms'] / 1000:>9.2f}s"
+                      f"{w['p95_ms'] / 1000:>9.2f}s{w['p99_ms'] / 1000:>9.2f}s")
+        
+        if results['errors']:
+            print("\n❌ Primeiros erros:")
+            for e in results['errors'][:10]:
+                print(f"   - {e['t_s']:g}s vu-{e['user']} {e['step']}: {e['error'][:80]}")
+        
+        print("\n" + "=" * 100 + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada de linha de comando (código de saída 1 se algum fluxo falhar)."""
+    parser = argparse.ArgumentParser(description="Carga concorrente no wizard de empreendimento")
+    parser.add_argument('--users', type=int, default=None, help="Usuários simultâneos (padrão: LOAD_USERS)")
+    parser.add_argument('--ramp-up', type=float, default=None, help="Segundos até todos entrarem")
+    parser.add_argument('--duration', type=float, default=None, help="Duração em segundos (0 = sem limite)")
+    parser.add_argument('--iterations', type=int, default=None, help="Fluxos por usuário (0 = até o fim)")
+    parser.add_argument('--think-time', type=float, default=None, help="Média da reflexão entre etapas (s)")
+    parser.add_argument('--think-distribution', default=None, choices=LoadGenerator.THINK_DISTRIBUTIONS)
+    parser.add_argument('--tipo', default=None, help="Tipo de imóvel (RURAL, URBANO, LINEAR)")
+    parser.add_argument('--stub', action='store_true', help="Rodar contra o stub local (src/stub)")
+    args = parser.parse_args(argv)
+    
+    generator = LoadGenerator(
+        users=args.users,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        iterations=args.iterations,
+        think_time=args.think_time,
+        think_distribution=args.think_distribution,
+        tipo=args.tipo
+    )
+    
+    if args.stub or settings.USE_STUB_SERVER:
+        with StubServer() as stub:
+            stub.activate()
+            results = generator.run()
+    else:
+        results = generator.run()
+    
+    LoadGenerator.print_report(results)
+    generator.save(results)
+    step_timer.report("load")
+    
+    return 1 if results['flows']['failed'] or results['users']['failed_to_start'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
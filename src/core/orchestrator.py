@@ -2,40 +2,57 @@
 Orquestrador Genérico de Testes
 ================================
 
-Gerencia a execução sequencial de múltiplos testes.
+Gerencia a execução sequencial de múltiplos testes ou, com dependências
+declaradas, a execução em grafo (ramos independentes em paralelo).
 """
 
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import List, Dict, Callable, Any, Optional
 from selenium import webdriver
 
+from .checkpoint import CheckpointStore
 from .driver_manager import DriverManager
+from ..config.settings import settings
+from ..utils.json_helper import JSONHelper
+from ..utils.screenshot_pipeline import screenshot_pipeline
+from ..utils.step_timer import step_timer
+from ..utils.store_timeline import StoreTimeline
 
 
 class TestOrchestrator:
     """Orquestra a execução de testes em sequência."""
     
-    def __init__(self, name: str = "Test Suite"):
+    def __init__(self, name: str = "Test Suite", checkpoints: Optional[CheckpointStore] = None):
         """
         Inicializa o orquestrador.
         
         Args:
             name: Nome da suíte de testes
+            checkpoints: Armazenamento de checkpoints (habilita ``resume``)
         """
         self.name = name
+        self.checkpoints = checkpoints
         self.tests: List[Dict[str, Any]] = []
         self.results: List[Dict[str, Any]] = []
         self.driver: Optional[webdriver.Chrome] = None
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
+        self.critical_path: List[str] = []
+        self.contexto_final: Optional[Dict[str, Any]] = None
+        self.timeline: Optional[StoreTimeline] = None
+        self._driver_lock = threading.Lock()
     
     def add_test(
         self,
         name: str,
         function: Callable,
         active: bool = True,
-        description: str = ""
+        description: str = "",
+        depends_on: Optional[List[str]] = None,
+        uses_driver: bool = True
     ) -> None:
         """
         Adiciona um teste à lista de execução.
@@ -45,32 +62,71 @@ class TestOrchestrator:
             function: Função a ser executada
             active: Se o teste está ativo
             description: Descrição do teste
+            depends_on: Nomes dos testes dos quais este depende (usado por
+                        ``run_graph``). None = depende do teste anterior;
+                        [] = raiz do grafo.
+            uses_driver: Se o teste usa o navegador. Testes que usam o
+                         navegador nunca rodam ao mesmo tempo no grafo.
         """
         self.tests.append({
             'name': name,
             'function': function,
             'active': active,
             'description': description,
+            'depends_on': depends_on,
+            'uses_driver': uses_driver,
             'status': 'pending'
         })
     
-    def run_all(self, close_on_success: bool = True) -> bool:
+    def run_all(
+        self,
+        close_on_success: bool = True,
+        driver: Optional[webdriver.Chrome] = None,
+        contexto_inicial: Optional[Dict[str, Any]] = None,
+        resume: bool = False
+    ) -> bool:
         """
         Executa todos os testes em sequência.
         
+        Com ``checkpoints`` configurado, o estado do navegador e o contexto
+        são salvos após cada teste aprovado. Com ``resume=True``, o último
+        checkpoint é restaurado e a execução continua no teste seguinte.
+        
         Args:
             close_on_success: Fechar navegador se todos os testes passarem
-            
+            driver: Driver já aberto (ex.: vindo de um DriverPool). Quando
+                    informado, o primeiro teste também o recebe e o
+                    navegador nunca é fechado pelo orquestrador.
+            contexto_inicial: Contexto entregue ao primeiro teste
+            resume: Retomar a partir do último checkpoint
+        
         Returns:
             bool: True se todos os testes passaram
         """
         self._print_header()
         
         self.start_time = time.time()
-        previous_context = None
+        self.driver = driver
+        self.timeline = StoreTimeline(self.name) if settings.STORE_TIMELINE_ENABLED else None
+        external_driver = driver is not None
+        previous_context = contexto_inicial
         all_passed = True
+        resume_from = 0
+        
+        if self.checkpoints and resume:
+            checkpoint = self._restore_checkpoint()
+            if checkpoint:
+                resume_from = checkpoint['step_index']
+                previous_context = checkpoint['contexto']
+        elif self.checkpoints:
+            self.checkpoints.clear(self.name)
         
         for idx, test in enumerate(self.tests, 1):
+            if idx <= resume_from:
+                print(f"♻️  Teste {idx} - {test['name']}: RESTAURADO DO CHECKPOINT\n")
+                test['status'] = 'restored'
+                continue
+            
             if not test['active']:
                 print(f"⏭️  Teste {idx} - {test['name']}: DESATIVADO\n")
                 test['status'] = 'disabled'
@@ -82,16 +138,19 @@ class TestOrchestrator:
                 print(f"   {test['description']}")
             print(f"{'=' * 100}\n")
             
+            test['start'] = time.time() - self.start_time
+            
             try:
-                # Primeiro teste não recebe driver
-                if idx == 1:
-                    context = test['function']()
-                else:
-                    # Testes subsequentes recebem driver e contexto
-                    context = test['function'](
-                        driver_existente=self.driver,
-                        contexto_anterior=previous_context
-                    )
+                with step_timer.span(test['name'], 'test'):
+                    # Primeiro teste não recebe driver (exceto com driver externo)
+                    if idx == 1 and not external_driver:
+                        context = test['function']()
+                    else:
+                        # Testes subsequentes recebem driver e contexto
+                        context = test['function'](
+                            driver_existente=self.driver,
+                            contexto_anterior=previous_context
+                        )
                 
                 # Salvar driver para próximos testes
                 if context and 'driver' in context:
@@ -103,29 +162,41 @@ class TestOrchestrator:
                     print(f"   Erro: {context['erro']}\n")
                     test['status'] = 'failed'
                     test['error'] = context['erro']
+                    test['duration'] = time.time() - self.start_time - test['start']
                     all_passed = False
                     break
                 else:
                     print(f"✅ Teste {idx} - {test['name']}: SUCESSO\n")
                     test['status'] = 'passed'
+                    test['duration'] = time.time() - self.start_time - test['start']
                     previous_context = context
+                    self._capture_store(test)
                     
+                    if self.checkpoints and self.driver:
+                        self.checkpoints.save(self.name, idx, test['name'], self.driver, context)
+            
             except Exception as e:
                 print(f"❌ Teste {idx} - {test['name']}: EXCEÇÃO")
                 print(f"   Erro: {e}\n")
                 test['status'] = 'error'
                 test['error'] = str(e)
+                test['duration'] = time.time() - self.start_time - test['start']
                 all_passed = False
                 break
         
         self.end_time = time.time()
+        self.contexto_final = previous_context
         self._print_report()
+        self._report_timing()
+        
+        if self.checkpoints and all_passed:
+            self.checkpoints.clear(self.name)
         
         # Fechar navegador se necessário
-        if self.driver:
+        if self.driver and not external_driver:
             if all_passed and close_on_success:
                 print("\n✅ Todos os testes passaram! Fechando navegador automaticamente...")
-                time.sleep(2)
+                step_timer.sleep(2)
                 DriverManager.quit_driver(self.driver)
                 print("🔒 Navegador fechado\n")
             elif not all_passed:
@@ -133,6 +204,287 @@ class TestOrchestrator:
         
         return all_passed
     
+    def _restore_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Restaura o último checkpoint válido da suíte no navegador.
+        
+        Abre um navegador se nenhum foi informado. O checkpoint só é usado
+        se o teste registrado nele ainda estiver na mesma posição.
+        
+        Returns:
+            dict: Checkpoint restaurado (com o driver no contexto) ou None
+        """
+        checkpoint = self.checkpoints.latest(self.name)
+        if not checkpoint:
+            print("ℹ️  Nenhum checkpoint encontrado - executando do início\n")
+            return None
+        
+        idx = checkpoint['step_index']
+        if idx > len(self.tests) or self.tests[idx - 1]['name'] != checkpoint['step_name']:
+            print("⚠️ Checkpoint não corresponde aos testes atuais - executando do início\n")
+            return None
+        
+        created = self.driver is None
+        if created:
+            self.driver = DriverManager.create_driver()
+        
+        if not self.checkpoints.restore(self.driver, checkpoint):
+            if created:
+                DriverManager.quit_driver(self.driver)
+                self.driver = None
+            return None
+        
+        checkpoint['contexto']['driver'] = self.driver
+        return checkpoint
+    
+    def run_graph(
+        self,
+        max_workers: int = 4,
+        close_on_success: bool = True,
+        driver: Optional[webdriver.Chrome] = None,
+        contexto_inicial: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Executa os testes como grafo de dependências.
+        
+        Cada teste roda assim que todas as suas dependências passam e recebe
+        os contextos delas mesclados. Ramos independentes rodam em paralelo;
+        uma falha marca como ``skipped`` apenas os testes que dependem dela.
+        
+        Args:
+            max_workers: Testes executados ao mesmo tempo
+            close_on_success: Fechar navegador se todos os testes passarem
+            driver: Driver já aberto (nunca é fechado pelo orquestrador)
+            contexto_inicial: Contexto entregue aos testes raiz
+        
+        Returns:
+            bool: True se todos os testes passaram
+        
+        Raises:
+            ValueError: Se houver dependência desconhecida ou ciclo
+        """
+        deps = self._resolve_dependencies()
+        
+        self._print_header()
+        
+        self.start_time = time.time()
+        self.driver = driver
+        self.timeline = StoreTimeline(self.name) if settings.STORE_TIMELINE_ENABLED else None
+        external_driver = driver is not None
+        contexts: Dict[str, Any] = {}
+        by_name = {t['name']: t for t in self.tests}
+        
+        def input_context(name: str) -> Optional[Dict[str, Any]]:
+            if not deps[name]:
+                return contexto_inicial
+            return JSONHelper.merge_contexts(*(contexts.get(d) for d in deps[name]))
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            running = {}
+            
+            while True:
+                # Repetir até não haver mudanças (pulos/desativados liberam outros nós)
+                changed = True
+                while changed:
+                    changed = False
+                    for test in self.tests:
+                        if test['status'] != 'pending':
+                            continue
+                        
+                        dep_status = [by_name[d]['status'] for d in deps[test['name']]]
+                        
+                        if any(st in ('failed', 'error', 'skipped') for st in dep_status):
+                            test['status'] = 'skipped'
+                            changed = True
+                            print(f"⏭️  {test['name']}: PULADO (dependência falhou)\n")
+                        elif all(st in ('passed', 'disabled') for st in dep_status):
+                            if not test['active']:
+                                test['status'] = 'disabled'
+                                contexts[test['name']] = input_context(test['name'])
+                                changed = True
+                                print(f"⏭️  {test['name']}: DESATIVADO\n")
+                                continue
+                            test['status'] = 'running'
+                            future = executor.submit(
+                                self._run_node, test, input_context(test['name'])
+                            )
+                            running[future] = test['name']
+                
+                if not running:
+                    break
+                
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    contexts[name] = future.result()
+        
+        self.end_time = time.time()
+        self.contexto_final = JSONHelper.merge_contexts(*contexts.values())
+        self.critical_path = self._compute_critical_path(deps)
+        all_passed = all(t['status'] in ('passed', 'disabled') for t in self.tests)
+        
+        self._print_report()
+        self._report_timing()
+        
+        if self.driver and not external_driver:
+            if all_passed and close_on_success:
+                DriverManager.quit_driver(self.driver)
+                print("🔒 Navegador fechado\n")
+            elif not all_passed:
+                print("\n❌ Houve erros. Navegador mantido aberto para debug.\n")
+        
+        return all_passed
+    
+    def _run_node(
+        self,
+        test: Dict[str, Any],
+        contexto: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Executa um nó do grafo e registra status e tempos."""
+        print(f"\n▶️  EXECUTANDO: {test['name']}")
+        if test['description']:
+            print(f"   {test['description']}")
+        
+        lock = self._driver_lock if test['uses_driver'] else None
+        
+        if lock:
+            lock.acquire()
+        
+        test['start'] = time.time() - self.start_time
+        
+        try:
+            with step_timer.span(test['name'], 'test'):
+                # O primeiro teste com navegador cria o driver
+                if test['uses_driver'] and self.driver is None:
+                    context = test['function']()
+                else:
+                    context = test['function'](
+                        driver_existente=self.driver,
+                        contexto_anterior=contexto
+                    )
+            
+            if context and 'driver' in context:
+                self.driver = context['driver']
+            
+            if context and context.get('erro'):
+                print(f"❌ {test['name']}: FALHOU")
+                print(f"   Erro: {context['erro']}\n")
+                test['status'] = 'failed'
+                test['error'] = context['erro']
+            else:
+                print(f"✅ {test['name']}: SUCESSO\n")
+                test['status'] = 'passed'
+                if test['uses_driver']:
+                    self._capture_store(test)
+            
+            return context
+        
+        except Exception as e:
+            print(f"❌ {test['name']}: EXCEÇÃO")
+            print(f"   Erro: {e}\n")
+            test['status'] = 'error'
+            test['error'] = str(e)
+            return None
+        
+        finally:
+            test['duration'] = time.time() - self.start_time - test['start']
+            if lock:
+                lock.release()
+    
+    def _capture_store(self, test: Dict[str, Any]) -> None:
+        """Registra na linha do tempo o que o teste alterou no store."""
+        if self.timeline and self.driver:
+            with step_timer.span('store timeline', 'action'):
+                self.timeline.capture(self.driver, test['name'])
+    
+    def _report_timing(self) -> None:
+        """
+        Divisão do tempo, trace da execução, linha do tempo do store e
+        screenshots ainda na fila.
+        
+        Fluxos rodando em threads do ParallelOrchestrator não geram relatório
+        próprio: os eventos entram no trace consolidado do orquestrador paralelo.
+        """
+        if self.timeline:
+            self.timeline.write()
+            self.timeline = None
+        
+        if threading.current_thread() is threading.main_thread():
+            step_timer.report(self.name)
+            screenshot_pipeline.report()
+    
+    def _resolve_dependencies(self) -> Dict[str, List[str]]:
+        """
+        Resolve as dependências de cada teste e valida o grafo.
+        
+        Returns:
+            dict: Nome do teste -> nomes das dependências
+        """
+        deps: Dict[str, List[str]] = {}
+        previous = None
+        
+        for test in self.tests:
+            if test.get('depends_on') is None:
+                deps[test['name']] = [previous] if previous else []
+            else:
+                deps[test['name']] = list(test['depends_on'])
+            previous = test['name']
+        
+        for name, node_deps in deps.items():
+            for dep in node_deps:
+                if dep not in deps:
+                    raise ValueError(f"Teste '{name}' depende de '{dep}', que não existe")
+        
+        # Detectar ciclos (DFS)
+        state: Dict[str, int] = {}
+        
+        def visit(name: str) -> None:
+            if state.get(name) == 1:
+                raise ValueError(f"Ciclo de dependências envolvendo '{name}'")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for dep in deps[name]:
+                visit(dep)
+            state[name] = 2
+        
+        for name in deps:
+            visit(name)
+        
+        return deps
+    
+    def _compute_critical_path(self, deps: Dict[str, List[str]]) -> List[str]:
+        """
+        Calcula o caminho crítico (cadeia de dependências mais demorada).
+        
+        Args:
+            deps: Nome do teste -> nomes das dependências
+        
+        Returns:
+            list: Nomes dos testes no caminho crítico, da raiz à folha
+        """
+        durations = {t['name']: t.get('duration', 0.0) for t in self.tests}
+        total: Dict[str, float] = {}
+        parent: Dict[str, Optional[str]] = {}
+        
+        def longest(name: str) -> float:
+            if name not in total:
+                best = max(deps[name], key=longest, default=None)
+                parent[name] = best
+                total[name] = durations[name] + (total[best] if best else 0.0)
+            return total[name]
+        
+        if not deps:
+            return []
+        
+        node = max(deps, key=longest)
+        path = []
+        while node:
+            path.append(node)
+            node = parent[node]
+        
+        return list(reversed(path))
+    
     def _print_header(self) -> None:
         """Imprime cabeçalho da execução."""
         print("=" * 100)
@@ -158,6 +510,8 @@ class TestOrchestrator:
         error = sum(1 for t in self.tests if t['status'] == 'error')
         disabled = sum(1 for t in self.tests if t['status'] == 'disabled')
         pending = sum(1 for t in self.tests if t['status'] == 'pending')
+        skipped = sum(1 for t in self.tests if t['status'] == 'skipped')
+        restored = sum(1 for t in self.tests if t['status'] == 'restored')
         
         print(f"📊 Resumo:")
         print(f"   ✅ Sucesso: {passed}")
@@ -165,6 +519,10 @@ class TestOrchestrator:
         print(f"   💥 Erro: {error}")
         print(f"   ⏭️  Desativado: {disabled}")
         print(f"   ⏸️  Pendente: {pending}")
+        if skipped:
+            print(f"   ⛔ Pulado: {skipped}")
+        if restored:
+            print(f"   ♻️  Restaurado: {restored}")
         
         print("\n" + "-" * 100)
         print("\n📋 Detalhes:")
@@ -174,15 +532,27 @@ class TestOrchestrator:
             'failed': '❌',
             'error': '💥',
             'disabled': '⏭️',
-            'pending': '⏸️'
+            'pending': '⏸️',
+            'skipped': '⛔',
+            'restored': '♻️'
         }
         
         for idx, test in enumerate(self.tests, 1):
             emoji = status_emoji.get(test['status'], '❓')
-            print(f"   {idx}. {emoji} {test['name']}: {test['status'].upper()}")
+            timing = ""
+            if 'duration' in test:
+                timing = f" ({test['start']:.2f}s → +{test['duration']:.2f}s)"
+            print(f"   {idx}. {emoji} {test['name']}: {test['status'].upper()}{timing}")
             if test.get('error'):
                 print(f"      ↳ Erro: {test['error']}")
         
+        if self.critical_path:
+            critical_time = sum(
+                t.get('duration', 0.0) for t in self.tests if t['name'] in self.critical_path
+            )
+            print(f"\n🧭 Caminho crítico ({critical_time:.2f}s):")
+            print(f"   {' → '.join(self.critical_path)}")
+        
         print("\n" + "=" * 100)
         
         if failed > 0 or error > 0:
@@ -0,0 +1,270 @@
+"""
+Orquestrador Paralelo de Fluxos
+================================
+
+Executa vários fluxos independentes (ex.: um wizard por tipo de imóvel)
+ao mesmo tempo, cada um com seu próprio navegador vindo de um DriverPool.
+"""
+
+import copy
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional
+    psutil = None
+
+from .data_validator import DataValidator
+from .driver_manager import DriverPool
+from .orchestrator import TestOrchestrator
+from ..config.settings import settings
+from ..utils.screenshot_pipeline import screenshot_pipeline
+from ..utils.step_timer import step_timer
+
+
+class ParallelOrchestrator:
+    """Executa fluxos do TestOrchestrator em paralelo, um navegador por fluxo."""
+    
+    def __init__(
+        self,
+        name: str = "Parallel Suite",
+        max_workers: int = None,
+        pool: Optional[DriverPool] = None,
+        max_cpu_percent: float = None,
+        min_free_memory_mb: int = None
+    ):
+        """
+        Inicializa o orquestrador paralelo.
+        
+        Args:
+            name: Nome da suíte
+            max_workers: Fluxos simultâneos (padrão: PARALLEL_WORKERS)
+            pool: Pool de navegadores (criado internamente se não informado)
+            max_cpu_percent: Uso de CPU acima do qual novos fluxos aguardam
+            min_free_memory_mb: Memória livre abaixo da qual novos fluxos aguardam
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers or settings.PARALLEL_WORKERS)
+        self.max_cpu_percent = (
+            max_cpu_percent if max_cpu_percent is not None
+            else settings.PARALLEL_MAX_CPU_PERCENT
+        )
+        self.min_free_memory_mb = (
+            min_free_memory_mb if min_free_memory_mb is not None
+            else settings.PARALLEL_MIN_FREE_MEMORY_MB
+        )
+        self.pool = pool
+        self._owns_pool = pool is None
+        self.flows: List[Dict[str, Any]] = []
+        self.results: List[Dict[str, Any]] = []
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+    
+    def add_flow(
+        self,
+        name: str,
+        template: TestOrchestrator,
+        contexto: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Adiciona um fluxo independente.
+        
+        Os testes do ``template`` são copiados para um orquestrador próprio
+        do fluxo, então status e contexto nunca são compartilhados.
+        
+        Args:
+            name: Nome do fluxo (ex.: "Wizard RURAL")
+            template: Orquestrador com a cadeia de testes do fluxo
+            contexto: Contexto inicial do fluxo (ex.: {'tipo_imovel': 'RURAL'})
+        """
+        self.flows.append({
+            'name': name,
+            'template': template,
+            'contexto': contexto or {}
+        })
+    
+    def run_all(self) -> bool:
+        """
+        Executa todos os fluxos respeitando concorrência e back-pressure.
+        
+        Returns:
+            bool: True se todos os fluxos passaram
+        """
+        self._print_header()
+        
+        if self.pool is None:
+            self.pool = DriverPool(size=self.max_workers)
+        
+        self.results = []
+        self.start_time = time.time()
+        
+        pending = list(self.flows)
+        running: Dict[Future, Dict[str, Any]] = {}
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while pending or running:
+                    # Back-pressure: só inicia novo fluxo com vaga e recursos livres
+                    while pending and len(running) < self.max_workers:
+                        if running and not self._has_capacity():
+                            break
+                        flow = pending.pop(0)
+                        running[executor.submit(self._run_flow, flow)] = flow
+                    
+                    if not running:
+                        continue
+                    
+                    done, _ = wait(list(running), timeout=1.0, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        flow = running.pop(future)
+                        try:
+                            self.results.append(future.result())
+                        except Exception as e:
+                            self.results.append({
+                                'flow': flow['name'],
+                                'passed': False,
+                                'duration': 0.0,
+                                'tests': [],
+                                'error': str(e)
+                            })
+        finally:
+            if self._owns_pool and self.pool:
+                self.pool.shutdown()
+                self.pool = None
+        
+        self.end_time = time.time()
+        self._print_report()
+        step_timer.report(self.name)
+        screenshot_pipeline.report()
+        
+        return all(r['passed'] for r in self.results)
+    
+    def created_ids(self) -> List[Dict[str, Any]]:
+        """
+        IDs dos empreendimentos criados pelos fluxos (entrada do ``Reconciler``).
+        
+        Returns:
+            list: {'flow', 'property_id', 'enterprise_id'} dos fluxos que criaram algo
+        """
+        return [
+            {'flow': r['flow'], **r['created']}
+            for r in self.results
+            if r.get('created', {}).get('enterprise_id') is not None
+        ]
+    
+    def _run_flow(self, flow: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa um fluxo em um navegador do pool."""
+        orchestrator = TestOrchestrator(flow['name'])
+        for test in flow['template'].tests:
+            orchestrator.add_test(
+                name=test['name'],
+                function=test['function'],
+                active=test['active'],
+                description=test['description'],
+                depends_on=test.get('depends_on'),
+                uses_driver=test.get('uses_driver', True)
+            )
+        
+        driver = self.pool.acquire()
+        start = time.time()
+        
+        try:
+            passed = orchestrator.run_all(
+                driver=driver,
+                contexto_inicial=copy.deepcopy(flow['contexto'])
+            )
+        finally:
+            self.pool.release(driver)
+        
+        property_id, enterprise_id = DataValidator.extract_ids(orchestrator.contexto_final or {})
+        
+        return {
+            'flow': flow['name'],
+            'passed': passed,
+            'duration': time.time() - start,
+            'created': {'property_id': property_id, 'enterprise_id': enterprise_id},
+            'tests': [
+                {'name': t['name'], 'status': t['status'], 'error': t.get('error')}
+                for t in orchestrator.tests
+            ]
+        }
+    
+    def _has_capacity(self) -> bool:
+        """Verifica se há CPU e memória livres para abrir mais um navegador."""
+        cpu = self._cpu_percent()
+        if cpu is not None and cpu > self.max_cpu_percent:
+            return False
+        
+        free_mb = self._free_memory_mb()
+        if free_mb is not None and free_mb < self.min_free_memory_mb:
+            return False
+        
+        return True
+    
+    @staticmethod
+    def _cpu_percent() -> Optional[float]:
+        """Uso de CPU (%) via psutil ou load average."""
+        if psutil is not None:
+            return psutil.cpu_percent(interval=None)
+        if hasattr(os, 'getloadavg'):
+            return os.getloadavg()[0] / (os.cpu_count() or 1) * 100
+        return None
+    
+    @staticmethod
+    def _free_memory_mb() -> Optional[float]:
+        """Memória disponível (MB) via psutil ou /proc/meminfo."""
+        if psutil is not None:
+            return psutil.virtual_memory().available / (1024 * 1024)
+        try:
+            with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('MemAvailable:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
+    
+    def _print_header(self) -> None:
+        """Imprime cabeçalho da execução."""
+        print("=" * 100)
+        print(f"{self.name:^100}")
+        print("=" * 100)
+        print(f"\n📅 Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+        print(f"🔀 Fluxos: {len(self.flows)} | Paralelismo: {self.max_workers}")
+        print("\n" + "=" * 100 + "\n")
+    
+    def _print_report(self) -> None:
+        """Imprime relatório por fluxo e resumo consolidado."""
+        total_time = self.end_time - self.start_time if self.end_time else 0
+        sum_time = sum(r['duration'] for r in self.results)
+        passed = sum(1 for r in self.results if r['passed'])
+        
+        print("\n" + "=" * 100)
+        print(f"{'RELATÓRIO CONSOLIDADO':^100}")
+        print("=" * 100)
+        
+        print(f"\n⏱️  Tempo total (parede): {total_time:.2f}s")
+        print(f"⏱️  Soma dos fluxos: {sum_time:.2f}s")
+        if total_time > 0:
+            print(f"🚀 Ganho do paralelismo: {sum_time / total_time:.2f}x")
+        
+        print(f"📊 Fluxos: ✅ {passed} | ❌ {len(self.results) - passed}")
+        
+        print("\n" + "-" * 100)
+        print("\n📋 Detalhes por fluxo:")
+        
+        for result in sorted(self.results, key=lambda r: r['flow']):
+            emoji = '✅' if result['passed'] else '❌'
+            print(f"   {emoji} {result['flow']} ({result['duration']:.2f}s)")
+            for test in result['tests']:
+                print(f"      - {test['name']}: {test['status'].upper()}")
+                if test.get('error'):
+                    print(f"        ↳ Erro: {test['error']}")
+            if result.get('error'):
+                print(f"      ↳ Erro: {result['error']}")
+        
+        print("\n" + "=" * 100 + "\n")
@@ -0,0 +1,298 @@
+"""
+Reconciliação em Lote
+======================
+
+Depois de uma execução paralela, confere de uma vez todos os
+empreendimentos criados: os IDs são buscados com concorrência limitada
+(em lotes pelo endpoint ``?ids=`` quando o backend oferece) e cada
+resultado é gravado assim que fica pronto como uma linha de um arquivo
+JSONL, sem manter todos os payloads em memória.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .data_validator import DataValidator
+from ..config.settings import settings, REPORTS_DIR
+from ..config.urls import urls
+from ..utils.http_client import HttpClient
+
+
+class Reconciler:
+    """Valida muitos empreendimentos em uma passada, com relatório JSONL incremental."""
+    
+    # Respostas que indicam que o endpoint em lote não existe
+    _BATCH_UNSUPPORTED = (400, 404, 405, 501)
+    
+    def __init__(
+        self,
+        validator: Optional[DataValidator] = None,
+        concurrency: int = None,
+        batch_size: int = None,
+        use_batch: bool = None,
+        output_dir: Path = None
+    ):
+        """
+        Inicializa o reconciliador.
+        
+        Args:
+            validator: Validador usado nas comparações (padrão: DataValidator())
+            concurrency: Lotes processados ao mesmo tempo (padrão: API_CONCURRENCY)
+            batch_size: IDs por lote (padrão: RECONCILE_BATCH_SIZE)
+            use_batch: Tentar o endpoint em lote (padrão: RECONCILE_USE_BATCH)
+            output_dir: Diretório do relatório (padrão: reports/json)
+        """
+        self.validator = validator or DataValidator()
+        self.concurrency = concurrency or settings.API_CONCURRENCY
+        self.batch_size = max(1, batch_size or settings.RECONCILE_BATCH_SIZE)
+        self.use_batch = settings.RECONCILE_USE_BATCH if use_batch is None else use_batch
+        self.output_dir = Path(output_dir) if output_dir else REPORTS_DIR / "json"
+        # None = ainda não testado; True/False após a primeira chamada em lote
+        self._batch_supported: Optional[bool] = None if self.use_batch else False
+        self._probe_lock: Optional[asyncio.Lock] = None
+    
+    @staticmethod
+    def ids_from_results(*orchestrators) -> List[Dict[str, Any]]:
+        """
+        Junta os IDs criados por uma ou mais execuções do ParallelOrchestrator.
+        
+        Args:
+            *orchestrators: Instâncias de ParallelOrchestrator já executadas
+        
+        Returns:
+            list: Itens {'flow', 'property_id', 'enterprise_id'}
+        """
+        items = []
+        for orchestrator in orchestrators:
+            items.extend(orchestrator.created_ids())
+        return items
+    
+    def reconcile(self, items: Iterable[Dict[str, Any]], filename: str = None) -> Dict[str, Any]:
+        """
+        Versão síncrona de ``reconcile_async``.
+        
+        Args:
+            items: Contextos ou dicts com ``enterprise_id`` (pode ser um gerador)
+            filename: Nome do arquivo JSONL (padrão: reconciliacao_<timestamp>.jsonl)
+        
+        Returns:
+            dict: Resumo (ver ``reconcile_async``)
+        """
+        return asyncio.run(self.reconcile_async(items, filename))
+    
+    async def reconcile_async(
+        self,
+        items: Iterable[Dict[str, Any]],
+        filename: str = None
+    ) -> Dict[str, Any]:
+        """
+        Valida todos os itens e grava uma linha JSONL por empreendimento.
+        
+        Os itens são consumidos sob demanda: no máximo ``concurrency`` lotes
+        ficam em processamento e na fila ao mesmo tempo.
+        
+        Args:
+            items: Contextos ou dicts com ``enterprise_id`` (pode ser um gerador)
+            filename: Nome do arquivo JSONL
+        
+        Returns:
+            dict: total, sucesso, falhas, duracao_s, por_minuto, lote (se o
+                  endpoint em lote foi usado), requisicoes e arquivo
+        """
+        if filename is None:
+            filename = f"reconciliacao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self.output_dir / filename
+        
+        resumo = {'total': 0, 'sucesso': 0, 'falhas': 0}
+        self._batch_supported = None if self.use_batch else False
+        self._probe_lock = asyncio.Lock()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        start = time.perf_counter()
+        
+        client = self.validator.client or HttpClient()
+        
+        with open(filepath, 'w', encoding='utf-8') as out:
+            
+            def write(relatorio: Dict[str, Any]) -> None:
+                out.write(json.dumps(relatorio, ensure_ascii=False, default=str) + '\n')
+                resumo['total'] += 1
+                resumo['sucesso' if relatorio['sucesso'] else 'falhas'] += 1
+            
+            async def worker():
+                while True:
+                    batch = await queue.get()
+                    try:
+                        if batch is None:
+                            return
+                        try:
+                            relatorios = await self._process_batch(client, batch)
+                        except Exception as e:
+                            relatorios = [self._failed(item, e) for item in batch]
+                        for relatorio in relatorios:
+                            write(relatorio)
+                        out.flush()
+                    finally:
+                        queue.task_done()
+            
+            async with client:
+                workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+                
+                for batch in self._batches(items):
+                    await queue.put(batch)
+                for _ in workers:
+                    await queue.put(None)
+                
+                await asyncio.gather(*workers)
+        
+        duracao = time.perf_counter() - start
+        resumo.update({
+            'duracao_s': round(duracao, 2),
+            'por_minuto': round(resumo['total'] / duracao * 60, 1) if duracao else 0.0,
+            'lote': bool(self._batch_supported),
+            'requisicoes': client.stats(),
+            'arquivo': str(filepath)
+        })
+        
+        print(f"📊 Reconciliação: {resumo['total']} empreendimento(s) em {resumo['duracao_s']}s "
+              f"({resumo['por_minuto']}/min) - ✓ {resumo['sucesso']} ✗ {resumo['falhas']}")
+        print(f"💾 Relatório: {filepath}")
+        return resumo
+    
+    @staticmethod
+    def read_report(filepath: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Lê um relatório JSONL linha a linha.
+        
+        Args:
+            filepath: Arquivo gerado por ``reconcile``
+        
+        Yields:
+            dict: Relatório de um empreendimento
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    
+    def _batches(self, items: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Agrupa os itens em listas de ``batch_size`` sem materializar a entrada."""
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    async def _process_batch(
+        self,
+        client: HttpClient,
+        batch: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Valida um lote, usando o endpoint em lote quando disponível."""
+        start = time.perf_counter()
+        known, probed = {}, False
+        
+        if self._batch_supported is None:
+            # Só o primeiro lote testa o endpoint; os demais aguardam o resultado
+            async with self._probe_lock:
+                if self._batch_supported is None:
+                    known, probed = await self._fetch_batch(client, batch), True
+                    if self._batch_supported is None:
+                        self._batch_supported = True
+        
+        if self._batch_supported and not probed:
+            known = await self._fetch_batch(client, batch)
+        
+        async def one(item):
+            property_id, enterprise_id = self.validator.extract_ids(item)
+            if enterprise_id is None:
+                relatorio = self.validator.build_report(item, {}, start)
+            else:
+                results = await self.validator.fetch_all(
+                    client, property_id, enterprise_id, known=known.get(str(enterprise_id))
+                )
+                relatorio = self.validator.build_report(item, results, start)
+            if item.get('flow'):
+                relatorio['flow'] = item['flow']
+            return relatorio
+        
+        return await asyncio.gather(*(one(item) for item in batch))
+    
+    async def _fetch_batch(
+        self,
+        client: HttpClient,
+        batch: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Busca os empreendimentos do lote em uma chamada.
+        
+        Recursos embutidos na resposta (``property``, ``activities``,
+        ``characterization``) também são aproveitados.
+        
+        Returns:
+            dict: ID (str) -> recursos já obtidos, no formato de ``fetch_all``
+        """
+        ids = [eid for _, eid in map(self.validator.extract_ids, batch) if eid is not None]
+        if not ids:
+            return {}
+        
+        response = await client.get_json(self.validator.rebase(urls.get_enterprises_batch(ids)))
+        
+        if response['status'] in self._BATCH_UNSUPPORTED:
+            print("⚠️ Endpoint em lote indisponível - consultando empreendimentos individualmente")
+            self._batch_supported = False
+            return {}
+        
+        data = self.validator._unwrap(response['data'])
+        if response['error'] or not isinstance(data, list):
+            return {}
+        
+        # Backend que ignora ?ids= devolve a listagem inteira: não é lote
+        requested = {str(eid) for eid in ids}
+        returned = {
+            str(enterprise['id']) for enterprise in data
+            if isinstance(enterprise, dict) and enterprise.get('id') is not None
+        }
+        if not returned <= requested:
+            print("⚠️ Endpoint em lote ignorou ?ids= - consultando empreendimentos individualmente")
+            self._batch_supported = False
+            return {}
+        
+        known = {}
+        for enterprise in data:
+            if not isinstance(enterprise, dict) or enterprise.get('id') is None:
+                continue
+            
+            resources = {}
+            for resource in ('property', 'activities', 'characterization'):
+                if resource in enterprise:
+                    resources[resource] = self._as_result(response, enterprise.pop(resource))
+            resources['enterprise'] = self._as_result(response, enterprise)
+            known[str(enterprise['id'])] = resources
+        
+        return known
+    
+    def _failed(self, item: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Relatório de um item cujo lote falhou inesperadamente."""
+        property_id, enterprise_id = self.validator.extract_ids(item)
+        return {
+            'property_id': property_id,
+            'enterprise_id': enterprise_id,
+            'sucesso': False,
+            'diferencas': [self.validator._entry('enterprise', '*', 'ERRO', mensagem=str(error))],
+            'requisicoes': {},
+            'duracao_ms': 0.0
+        }
+    
+    @staticmethod
+    def _as_result(response: Dict[str, Any], data: Any) -> Dict[str, Any]:
+        """Empacota um pedaço da resposta em lote no formato de ``get_json``."""
+        return {**response, 'data': data}
@@ -0,0 +1,172 @@
+"""
+Bloqueio de Recursos (perfil "fast")
+=====================================
+
+Bloqueia via CDP (``Network.setBlockedURLs``) imagens, fontes, tiles de
+mapa e scripts de terceiros que os testes não precisam, e contabiliza,
+a partir do log de performance do Chrome, quantas requisições foram
+evitadas. A estimativa de bytes economizados (HEAD nas URLs bloqueadas)
+só é feita com ``FAST_ESTIMATE_SAVED_BYTES=true``.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from selenium import webdriver
+
+from ..config.settings import settings
+from ..utils.http_client import HttpClient
+
+
+class ResourceBlocker:
+    """Aplica o bloqueio de URLs e acumula as estatísticas da execução."""
+    
+    # Limite de URLs consultadas (HEAD) para estimar os bytes economizados
+    MAX_SIZE_PROBES = 200
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self) -> None:
+        self.sessions = 0
+        self.requests_loaded = 0
+        self.bytes_loaded = 0
+        self.blocked: Dict[str, int] = {}
+        self.blocked_types: Dict[str, int] = {}
+    
+    @staticmethod
+    def apply(driver: webdriver.Chrome, patterns: Optional[List[str]] = None) -> bool:
+        """
+        Ativa o bloqueio de URLs no navegador.
+        
+        Args:
+            driver: Instância do WebDriver
+            patterns: Padrões com curinga ``*`` (padrão: FAST_BLOCKED_URLS)
+        
+        Returns:
+            bool: True se o bloqueio foi aplicado
+        """
+        patterns = settings.FAST_BLOCKED_URLS if patterns is None else patterns
+        
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {'urls': patterns})
+        except Exception as e:
+            print(f"⚠️ Não foi possível aplicar o bloqueio de recursos: {e}")
+            return False
+        
+        driver._e2e_blocking = True
+        return True
+    
+    def collect(self, driver: webdriver.Chrome) -> None:
+        """
+        Consome o log de performance do navegador e acumula as estatísticas.
+        
+        Deve ser chamado antes de fechar/reciclar o navegador (o log é
+        esvaziado a cada leitura).
+        
+        Args:
+            driver: Instância do WebDriver com bloqueio aplicado
+        """
+        if not getattr(driver, '_e2e_blocking', False):
+            return
+        
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return
+        
+        requests: Dict[str, Dict[str, str]] = {}
+        loaded, bytes_loaded = 0, 0
+        blocked: List[Dict[str, str]] = []
+        
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            
+            method, params = message.get('method'), message.get('params', {})
+            
+            if method == 'Network.requestWillBeSent':
+                requests[params['requestId']] = {
+                    'url': params['request']['url'],
+                    'type': params.get('type', 'Other')
+                }
+            elif method == 'Network.loadingFinished':
+                loaded += 1
+                bytes_loaded += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                info = requests.get(params['requestId'], {'url': '', 'type': params.get('type', 'Other')})
+                blocked.append(info)
+        
+        with self._lock:
+            self.sessions += 1
+            self.requests_loaded += loaded
+            self.bytes_loaded += bytes_loaded
+            for info in blocked:
+                if info['url']:
+                    self.blocked[info['url']] = self.blocked.get(info['url'], 0) + 1
+                self.blocked_types[info['type']] = self.blocked_types.get(info['type'], 0) + 1
+    
+    def report(self, estimate_bytes: bool = None) -> Dict[str, Any]:
+        """
+        Resume o que foi economizado na execução e imprime o relatório.
+        
+        Args:
+            estimate_bytes: Consultar o tamanho das URLs bloqueadas via HEAD;
+                            faz requisições aos hosts bloqueados
+                            (padrão: FAST_ESTIMATE_SAVED_BYTES, desligado)
+        
+        Returns:
+            dict: sessions, requests_blocked, blocked_by_type, requests_loaded,
+                  bytes_loaded e bytes_saved (None se não estimado)
+        """
+        if estimate_bytes is None:
+            estimate_bytes = settings.FAST_ESTIMATE_SAVED_BYTES
+        
+        with self._lock:
+            blocked = dict(self.blocked)
+            summary = {
+                'sessions': self.sessions,
+                'requests_blocked': sum(self.blocked_types.values()),
+                'blocked_by_type': dict(self.blocked_types),
+                'requests_loaded': self.requests_loaded,
+                'bytes_loaded': self.bytes_loaded,
+                'bytes_saved': None
+            }
+        
+        if estimate_bytes and blocked:
+            summary['bytes_saved'] = asyncio.run(self._estimate_saved(blocked))
+        
+        if summary['sessions']:
+            saved = (
+                f"~{summary['bytes_saved'] / 1024:.1f} KB" if summary['bytes_saved'] is not None
+                else "n/d"
+            )
+            print(f"\n🚫 Perfil fast: {summary['requests_blocked']} requisição(ões) bloqueada(s) "
+                  f"em {summary['sessions']} sessão(ões), {saved} economizados "
+                  f"({summary['bytes_loaded'] / 1024:.1f} KB baixados)")
+        
+        return summary
+    
+    def clear(self) -> None:
+        """Zera as estatísticas acumuladas."""
+        with self._lock:
+            self._reset()
+    
+    async def _estimate_saved(self, blocked: Dict[str, int]) -> int:
+        """Soma ``Content-Length`` x ocorrências das URLs bloqueadas mais frequentes."""
+        urls = sorted(blocked, key=blocked.get, reverse=True)[:self.MAX_SIZE_PROBES]
+        
+        async with HttpClient(timeout=5, retries=0, auth=False) as client:
+            sizes = await asyncio.gather(*(client.content_length(url) for url in urls))
+        
+        return sum((size or 0) * blocked[url] for url, size in zip(urls, sizes))
+
+
+# Instância global (uma por processo / worker xdist)
+resource_blocker = ResourceBlocker()
@@ -5,15 +5,16 @@ Page Object - Página de Empreendimentos
 Representa a página de listagem de empreendimentos.
 """
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
 from ..config.urls import urls
+from ..utils.step_timer import timed_class
 from ..utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class EmpreendimentoPage:
     """Page Object para a página de empreendimentos."""
     
@@ -47,7 +48,7 @@ class EmpreendimentoPage:
             self.driver, self.MENU_EMPREENDIMENTO, condition='clickable'
         )
         menu_btn.click()
-        time.sleep(2)
+        WaitHelper.wait_for_settled(self.driver, fallback=2)
         
         # Verificar se navegou
         try:
@@ -71,8 +72,8 @@ class EmpreendimentoPage:
             novo_btn = WaitHelper.wait_for_element(
                 self.driver, self.NOVO_EMPREENDIMENTO_BTN, condition='clickable'
             )
-            novo_btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, novo_btn, fallback=2):
+                return False
             
             print("✅ Clicou em 'Novo Empreendimento'")
             return True
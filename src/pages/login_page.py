@@ -5,15 +5,18 @@ Page Object - Página de Login
 Representa a página de login do sistema.
 """
 
-import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
+from ..config.settings import settings
 from ..config.urls import urls
+from ..core.auth_cache import auth_cache
+from ..utils.step_timer import timed_class
 from ..utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class LoginPage:
     """Page Object para a página de login."""
     
@@ -37,18 +40,31 @@ class LoginPage:
         """Navega para a página de login."""
         self.driver.get(urls.LOGIN)
     
-    def auto_login(self) -> bool:
+    def auto_login(self, use_cache: bool = None) -> bool:
         """
         Realiza auto-login via URL com token.
         
+        Com o cache habilitado, reaproveita a sessão autenticada capturada
+        no primeiro login do processo; se a aplicação rejeitá-la, descarta
+        o cache e faz o login real.
+        
+        Args:
+            use_cache: Usar o cache de autenticação (padrão: AUTH_CACHE_ENABLED)
+            
         Returns:
             bool: True se login foi bem-sucedido
         """
+        if use_cache is None:
+            use_cache = settings.AUTH_CACHE_ENABLED
+        
+        if use_cache and self._login_from_cache():
+            return True
+        
         print("🔐 Realizando auto-login via token...")
         
         # Acessar URL com token
         self.driver.get(urls.AUTO_LOGIN)
-        time.sleep(3)
+        WaitHelper.wait_for_network_idle(self.driver, fallback=3)
         
         # Aguardar processamento
         WaitHelper.wait_for_url_not_contains(self.driver, 'login')
@@ -59,11 +75,36 @@ class LoginPage:
         
         if is_authenticated:
             print("✅ Auto-login realizado com sucesso")
+            if use_cache:
+                auth_cache.store(self.driver)
         else:
             print("❌ Falha no auto-login")
         
         return is_authenticated
     
+    def _login_from_cache(self) -> bool:
+        """
+        Tenta autenticar com a sessão em cache.
+        
+        Returns:
+            bool: True se a aplicação aceitou a sessão em cache
+        """
+        if not auth_cache.inject(self.driver):
+            return False
+        
+        print("🔐 Reutilizando sessão autenticada em cache...")
+        self.driver.get(urls.FRONTEND)
+        WaitHelper.wait_for_network_idle(self.driver, fallback=1)
+        
+        if 'login' not in self.driver.current_url.lower():
+            print("✅ Sessão em cache aceita")
+            return True
+        
+        print("⚠️ Sessão em cache rejeitada - refazendo auto-login...")
+        auth_cache.eject(self.driver)
+        auth_cache.invalidate()
+        return False
+    
     def login(self, username: str, password: str) -> bool:
         """
         Realiza login manual.
@@ -91,7 +132,10 @@ class LoginPage:
         login_button.click()
         
         # Aguardar redirecionamento
-        time.sleep(2)
+        if WaitHelper.is_fixed_mode():
+            WaitHelper.fixed_delay(2)
+        else:
+            WaitHelper.wait_for_url_not_contains(self.driver, 'login')
         
         # Verificar se login foi bem-sucedido
         return 'login' not in self.driver.current_url.lower()
@@ -5,15 +5,17 @@ Page Object - Wizard Etapa Atividades
 Representa a etapa de Atividades do wizard de novo empreendimento.
 """
 
-import time
 from typing import Dict, Any
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
+from ...utils.page_snapshot import PageSnapshot
+from ...utils.step_timer import timed_class
 from ...utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class AtividadesStep:
     """Page Object para a etapa de Atividades do wizard."""
     
@@ -41,6 +43,22 @@ class AtividadesStep:
     SECAO_SELECIONADAS = (By.XPATH, "//*[contains(text(), 'Atividades Selecionadas')]")
     CARDS_ATIVIDADES = (By.XPATH, "//div[contains(@class, 'bg-gradient-to-r from-green-50')]")
     
+    # Campos numéricos (quantidades)
+    INPUTS_NUMERICOS = (By.CSS_SELECTOR, "input[type='number']")
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lê o estado da etapa em uma única chamada.
+        
+        Returns:
+            dict: Estado da seção, dos cards e dos campos numéricos
+        """
+        return PageSnapshot.take(self.driver, {
+            'secao': self.SECAO_SELECIONADAS,
+            'cards': self.CARDS_ATIVIDADES,
+            'numericos': self.INPUTS_NUMERICOS
+        })
+    
     def is_visible(self) -> bool:
         """
         Verifica se a etapa está visível.
@@ -74,13 +92,14 @@ class AtividadesStep:
             
             # Scroll até o botão
             self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
+                "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", 
                 btn
             )
-            time.sleep(0.5)
+            WaitHelper.fixed_delay(0.5)
             
             btn.click()
-            time.sleep(2)  # Aguardar preenchimento automático
+            # Aguardar preenchimento automático
+            WaitHelper.wait_for_autofill(self.driver, fallback=2)
             
             print("✅ Dados preenchidos automaticamente")
             return True
@@ -95,7 +114,7 @@ class AtividadesStep:
                     self.driver, self.BTN_ADICIONAR, condition='clickable'
                 )
                 btn_adicionar.click()
-                time.sleep(1)
+                WaitHelper.wait_for_settled(self.driver, fallback=1)
                 print("✅ Botão 'Adicionar Atividade' clicado (fallback)")
                 return False
             except:
@@ -119,9 +138,9 @@ class AtividadesStep:
             print("✓ Seção 'Atividades Selecionadas' encontrada")
             
             # Contar cards de atividades
-            cards = self.driver.find_elements(*self.CARDS_ATIVIDADES)
-            if len(cards) > 0:
-                print(f"✓ {len(cards)} atividade(s) adicionada(s)")
+            total_cards = self.snapshot()['cards']['count']
+            if total_cards > 0:
+                print(f"✓ {total_cards} atividade(s) adicionada(s)")
                 return True
             else:
                 print("⚠️ Nenhuma atividade selecionada encontrada")
@@ -141,12 +160,9 @@ class AtividadesStep:
         print("🔢 Validando campos numéricos...")
         
         try:
-            campos = self.driver.find_elements(
-                By.XPATH, 
-                "//input[@type='number' and @value!='']"
-            )
-            if len(campos) > 0:
-                print(f"✓ {len(campos)} campo(s) numérico(s) preenchido(s)")
+            preenchidos = self.snapshot()['numericos']['filled_count']
+            if preenchidos > 0:
+                print(f"✓ {preenchidos} campo(s) numérico(s) preenchido(s)")
                 return True
             else:
                 print("⚠️ Nenhum campo numérico preenchido")
@@ -167,13 +183,13 @@ class AtividadesStep:
         try:
             # Scroll para o final da página
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)
+            WaitHelper.fixed_delay(0.5)
             
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_PROXIMO, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Avançou para próxima etapa")
             return True
@@ -195,8 +211,8 @@ class AtividadesStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_VOLTAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Voltou para etapa anterior")
             return True
@@ -5,15 +5,17 @@ Page Object - Wizard Etapa Caracterização
 Representa a etapa de Caracterização do wizard de novo empreendimento.
 """
 
-import time
 from typing import Dict, Any
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
+from ...utils.page_snapshot import PageSnapshot
+from ...utils.step_timer import timed_class
 from ...utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class CaracterizacaoStep:
     """Page Object para a etapa de Caracterização do wizard."""
     
@@ -39,6 +41,19 @@ class CaracterizacaoStep:
     # Validações
     PERGUNTAS_RESPONDIDAS = (By.XPATH, "//button[contains(@class, 'bg-red') or contains(@class, 'bg-green-50')]")
     
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lê o estado da etapa em uma única chamada.
+        
+        Returns:
+            dict: Estado do título, das perguntas respondidas e do botão Finalizar
+        """
+        return PageSnapshot.take(self.driver, {
+            'titulo': self.STEP_TITLE,
+            'respondidas': self.PERGUNTAS_RESPONDIDAS,
+            'finalizar': self.BTN_FINALIZAR
+        })
+    
     def is_visible(self) -> bool:
         """
         Verifica se a etapa está visível.
@@ -49,7 +64,7 @@ class CaracterizacaoStep:
         try:
             # Scroll para o topo
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
+            WaitHelper.fixed_delay(0.5)
             
             WaitHelper.wait_for_element(self.driver, self.STEP_TITLE)
             return True
@@ -68,13 +83,14 @@ class CaracterizacaoStep:
         try:
             # Scroll para o topo onde está o botão
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            WaitHelper.fixed_delay(1)
             
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_PREENCHER, condition='clickable'
             )
             btn.click()
-            time.sleep(2)  # Aguardar preenchimento automático
+            # Aguardar preenchimento automático
+            WaitHelper.wait_for_autofill(self.driver, fallback=2)
             
             print("✅ Dados preenchidos automaticamente")
             return True
@@ -94,11 +110,10 @@ class CaracterizacaoStep:
         print("✓ Validando preenchimento automático...")
         
         try:
-            time.sleep(2)
+            WaitHelper.wait_for_dom_quiet(self.driver, fallback=2)
             
             # Contar perguntas respondidas
-            perguntas = self.driver.find_elements(*self.PERGUNTAS_RESPONDIDAS)
-            total_perguntas = len(perguntas)
+            total_perguntas = self.snapshot()['respondidas']['count']
             
             if total_perguntas > 0:
                 print(f"✓ {total_perguntas} perguntas respondidas automaticamente")
@@ -123,13 +138,13 @@ class CaracterizacaoStep:
         try:
             # Scroll para o final da página
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            WaitHelper.fixed_delay(1)
             
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_FINALIZAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Cadastro finalizado!")
             return True
@@ -151,8 +166,8 @@ class CaracterizacaoStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_VOLTAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Voltou para etapa anterior")
             return True
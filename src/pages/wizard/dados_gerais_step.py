@@ -5,16 +5,18 @@ Page Object - Wizard Etapa Dados Gerais
 Representa a etapa de Dados Gerais do wizard de novo empreendimento.
 """
 
-import time
 from typing import Dict, Any
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support.ui import Select
 
+from ...utils.page_snapshot import PageSnapshot
+from ...utils.step_timer import timed_class
 from ...utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class DadosGeraisStep:
     """Page Object para a etapa de Dados Gerais do wizard."""
     
@@ -50,6 +52,21 @@ class DadosGeraisStep:
     BTN_PROXIMO = (By.XPATH, "//button[contains(., 'Próximo') or contains(., 'Avançar')]")
     BTN_VOLTAR = (By.XPATH, "//button[contains(., 'Voltar')]")
     
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lê o estado dos campos da etapa em uma única chamada.
+        
+        Returns:
+            dict: Estado de nome, situação, empregados, descrição e partícipe
+        """
+        return PageSnapshot.take(self.driver, {
+            'nome': self.INPUT_NOME,
+            'situacao': self.SELECT_SITUACAO,
+            'empregados': self.INPUT_EMPREGADOS,
+            'descricao': self.TEXTAREA_DESCRICAO,
+            'participe': self.PARTICIPE_ELEMENTO
+        })
+    
     def is_visible(self) -> bool:
         """
         Verifica se a etapa está visível.
@@ -77,7 +94,8 @@ class DadosGeraisStep:
                 self.driver, self.BTN_PREENCHER, condition='clickable'
             )
             btn.click()
-            time.sleep(3)  # Aguardar preenchimento automático
+            # Aguardar preenchimento automático
+            WaitHelper.wait_for_autofill(self.driver, self.INPUT_NOME, fallback=3)
             
             print("✅ Dados preenchidos automaticamente")
             return True
@@ -97,34 +115,36 @@ class DadosGeraisStep:
         print("✅ Validando campos obrigatórios...")
         
         try:
+            # Ler todos os campos de uma vez
+            estado = self.snapshot()
+            if not (estado['nome']['visible'] and estado['situacao']['visible']):
+                WaitHelper.wait_for_element(self.driver, self.INPUT_NOME, condition='visible')
+                WaitHelper.wait_for_element(self.driver, self.SELECT_SITUACAO, condition='visible')
+                estado = self.snapshot()
+            
             # Validar/Preencher Nome (OBRIGATÓRIO)
-            nome_input = WaitHelper.wait_for_element(
-                self.driver, self.INPUT_NOME, condition='visible'
-            )
-            nome_valor = nome_input.get_attribute('value')
+            nome_valor = estado['nome']['value']
             
             if not nome_valor or len(nome_valor) == 0:
                 print("⚠️ Nome vazio - preenchendo manualmente...")
+                nome_input = self.driver.find_element(*self.INPUT_NOME)
                 nome_input.clear()
                 nome_input.send_keys("Empreendimento Teste Automatizado")
-                time.sleep(0.5)
+                WaitHelper.fixed_delay(0.5)
                 print("✅ Nome preenchido")
             else:
                 print(f"✅ Nome já preenchido: {nome_valor}")
             
             # Validar/Preencher Situação (OBRIGATÓRIO)
-            situacao_select = WaitHelper.wait_for_element(
-                self.driver, self.SELECT_SITUACAO, condition='visible'
-            )
-            situacao_valor = situacao_select.get_attribute('value')
+            situacao_valor = estado['situacao']['value']
             
             if not situacao_valor or situacao_valor == '':
                 print("⚠️ Situação vazia - preenchendo manualmente...")
-                select = Select(situacao_select)
+                select = Select(self.driver.find_element(*self.SELECT_SITUACAO))
                 # Pular opção vazia e selecionar primeira válida
                 if len(select.options) > 1:
                     select.select_by_index(1)
-                    time.sleep(0.5)
+                    WaitHelper.fixed_delay(0.5)
                     print("✅ Situação preenchida")
             else:
                 print(f"✅ Situação já preenchida: {situacao_valor}")
@@ -167,8 +187,8 @@ class DadosGeraisStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_PROXIMO, condition='clickable'
             )
-            btn.click()
-            time.sleep(5)  # Aguardar transição entre páginas
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=5):
+                return False
             
             print("✅ Avançou para próxima etapa")
             return True
@@ -190,8 +210,8 @@ class DadosGeraisStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_VOLTAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Voltou para etapa anterior")
             return True
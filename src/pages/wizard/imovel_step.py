@@ -5,16 +5,17 @@ Page Object - Wizard Etapa Imóvel
 Representa a etapa de Imóvel do wizard de novo empreendimento.
 """
 
-import time
 from typing import Dict, Any
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support.ui import Select
 
+from ...utils.step_timer import timed_class
 from ...utils.wait_helper import WaitHelper
 
 
+@timed_class()
 class ImovelStep:
     """Page Object para a etapa de Imóvel do wizard."""
     
@@ -88,7 +89,7 @@ class ImovelStep:
                 print(f"❌ Tipo de imóvel inválido: {tipo}")
                 return False
             
-            time.sleep(1)
+            WaitHelper.wait_for_settled(self.driver, fallback=1)
             
             print(f"✅ Tipo {tipo} selecionado no dropdown")
             return True
@@ -111,7 +112,7 @@ class ImovelStep:
                 self.driver, self.BTN_PREENCHER, condition='clickable'
             )
             btn.click()
-            time.sleep(2)
+            WaitHelper.wait_for_autofill(self.driver, fallback=2)
             
             print("✅ Clicou em 'Preencher Dados'")
             return True
@@ -141,7 +142,7 @@ class ImovelStep:
             #     input_nome.clear()
             #     input_nome.send_keys(nome_imovel)
             
-            time.sleep(1)
+            WaitHelper.fixed_delay(1)
             print("✅ Formulário preenchido")
             return True
             
@@ -162,8 +163,8 @@ class ImovelStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_SALVAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Imóvel salvo - avançando para próxima etapa")
             return True
@@ -185,8 +186,8 @@ class ImovelStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_PROXIMO, condition='clickable'
             )
-            btn.click()
-            time.sleep(2)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=2):
+                return False
             
             print("✅ Avançou para próxima etapa")
             return True
@@ -208,8 +209,8 @@ class ImovelStep:
             btn = WaitHelper.wait_for_element(
                 self.driver, self.BTN_CANCELAR, condition='clickable'
             )
-            btn.click()
-            time.sleep(1)
+            if not WaitHelper.click_and_expect_transition(self.driver, btn, fallback=1):
+                return False
             
             print("✅ Cancelado")
             return True
@@ -0,0 +1,5 @@
+"""Stub local do frontend/backend para benchmarks e testes de carga."""
+
+from .server import StubServer
+
+__all__ = ['StubServer']
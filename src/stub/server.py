@@ -0,0 +1,405 @@
+"""
+Servidor Stub Local
+====================
+
+Substituto determinístico do frontend e do backend do licenciamento para
+rodar benchmarks e testes de carga sem a aplicação real.
+
+Serve, na mesma porta:
+
+- um wizard mínimo (``app.html``) com os mesmos textos/botões que os Page
+  Objects procuram ("Preencher Dados", "Salvar Imóvel", "Próximo",
+  "Finalizar", select de tipo RURAL/URBANO/LINEAR...);
+- ``/api/v1/properties`` e ``/api/v1/enterprises/...`` (inclusive
+  ``?ids=`` em lote, atividades e caracterização), em memória;
+- ``/__stub/config`` para ajustar latência/erros em tempo de execução.
+
+Com ``port=0`` o sistema escolhe uma porta livre, então cada worker do
+pytest-xdist sobe o seu próprio stub sem disputar porta.
+
+Uso:
+    python -m src.stub.server --port 8080 --latency-ms 200
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..config.settings import settings
+
+
+_APP_FILE = Path(__file__).resolve().parent / "app.html"
+
+# Tipo de imóvel -> property_type_id
+PROPERTY_TYPES = {'RURAL': 1, 'URBANO': 2, 'LINEAR': 3}
+
+
+class StubState:
+    """Dados em memória do backend stub (IDs sequenciais, determinísticos)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.properties: Dict[int, Dict[str, Any]] = {}
+            self.enterprises: Dict[int, Dict[str, Any]] = {}
+            self.activities: Dict[int, List[Dict[str, Any]]] = {}
+            self.characterizations: Dict[int, Dict[str, Any]] = {}
+            self._next_id = {'property': 1, 'enterprise': 1}
+    
+    def create_property(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            property_id = self._take_id('property')
+            tipo = str(payload.get('property_type') or '').upper()
+            record = dict(payload, id=property_id)
+            record.setdefault('property_type_id', PROPERTY_TYPES.get(tipo))
+            self.properties[property_id] = record
+            return record
+    
+    def create_enterprise(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            enterprise_id = self._take_id('enterprise')
+            payload = dict(payload)
+            activities = payload.pop('activities', []) or []
+            characterization = payload.pop('characterization', {}) or {}
+            
+            record = dict(payload, id=enterprise_id)
+            self.enterprises[enterprise_id] = record
+            self.activities[enterprise_id] = [
+                dict(activity, id=index, enterprise_id=enterprise_id)
+                for index, activity in enumerate(activities, 1)
+            ]
+            self.characterizations[enterprise_id] = dict(characterization, enterprise_id=enterprise_id)
+            return record
+    
+    def enterprise_bundle(self, enterprise_id: int) -> Optional[Dict[str, Any]]:
+        """Empreendimento com imóvel, atividades e caracterização embutidos (``?ids=``)."""
+        with self._lock:
+            enterprise = self.enterprises.get(enterprise_id)
+            if enterprise is None:
+                return None
+            return dict(
+                enterprise,
+                property=self.properties.get(enterprise.get('property_id')),
+                activities=list(self.activities.get(enterprise_id, [])),
+                characterization=self.characterizations.get(enterprise_id)
+            )
+    
+    def _take_id(self, kind: str) -> int:
+        value = self._next_id[kind]
+        self._next_id[kind] += 1
+        return value
+
+
+class StubServer:
+    """Servidor HTTP do stub, executado em uma thread própria."""
+    
+    def __init__(
+        self,
+        host: str = None,
+        port: int = None,
+        latency_ms: float = None,
+        jitter_ms: float = None,
+        error_rate: float = None,
+        ui_delay_ms: int = None,
+        seed: int = None
+    ):
+        """
+        Inicializa o stub (não abre a porta até ``start``).
+        
+        Args:
+            host: Interface de escuta (padrão: STUB_HOST)
+            port: Porta; 0 = efêmera (padrão: STUB_PORT)
+            latency_ms: Latência fixa das chamadas /api (padrão: STUB_LATENCY_MS)
+            jitter_ms: Variação máxima somada à latência (padrão: STUB_JITTER_MS)
+            error_rate: Fração de chamadas /api respondidas com 503 (padrão: STUB_ERROR_RATE)
+            ui_delay_ms: Tempo do "Preencher Dados" no navegador (padrão: STUB_UI_DELAY_MS)
+            seed: Semente do gerador de jitter/erros (padrão: STUB_SEED)
+        """
+        self.host = host or settings.STUB_HOST
+        self.port = settings.STUB_PORT if port is None else port
+        self.config = {
+            'latency_ms': settings.STUB_LATENCY_MS if latency_ms is None else latency_ms,
+            'jitter_ms': settings.STUB_JITTER_MS if jitter_ms is None else jitter_ms,
+            'error_rate': settings.STUB_ERROR_RATE if error_rate is None else error_rate,
+            'ui_delay_ms': settings.STUB_UI_DELAY_MS if ui_delay_ms is None else ui_delay_ms,
+        }
+        self.state = StubState()
+        self.requests = 0
+        self._random = random.Random(settings.STUB_SEED if seed is None else seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._saved_env: Optional[Dict[str, Optional[str]]] = None
+    
+    @property
+    def url(self) -> str:
+        """URL base do stub (frontend e backend)."""
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self) -> 'StubServer':
+        """
+        Abre a porta e começa a atender em segundo plano.
+        
+        Returns:
+            StubServer: A própria instância
+        """
+        if self._httpd is not None:
+            return self
+        
+        handler = type('BoundStubHandler', (_StubHandler,), {'stub': self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name=f"stub-{self.port}", daemon=True
+        )
+        self._thread.start()
+        
+        print(f"🧪 Stub local em {self.url} (latência {self.config['latency_ms']:g}ms "
+              f"±{self.config['jitter_ms']:g}ms)")
+        return self
+    
+    def stop(self) -> None:
+        """Restaura as URLs (se ativadas) e fecha o servidor."""
+        self.deactivate()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def activate(self) -> None:
+        """
+        Aponta FRONTEND_URL, BACKEND_URL e AUTO_LOGIN_URL para o stub.
+        
+        As variáveis anteriores são guardadas e voltam em ``deactivate``.
+        """
+        if self._saved_env is None:
+            self._saved_env = {
+                name: os.environ.get(name)
+                for name in ('FRONTEND_URL', 'BACKEND_URL', 'AUTO_LOGIN_URL')
+            }
+        
+        os.environ['FRONTEND_URL'] = self.url
+        os.environ['BACKEND_URL'] = self.url
+        os.environ['AUTO_LOGIN_URL'] = (
+            f"{self.url}/?token=stub&nome={settings.AUTO_LOGIN_USER_NAME}"
+            f"&userId={settings.AUTO_LOGIN_USER_ID}"
+        )
+        settings.reload()
+    
+    def deactivate(self) -> None:
+        """Desfaz ``activate``."""
+        if self._saved_env is None:
+            return
+        
+        for name, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        self._saved_env = None
+        settings.reload()
+    
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+    
+    def inject_delay(self) -> bool:
+        """
+        Aplica latência/erro configurados a uma chamada de API.
+        
+        Returns:
+            bool: True se a chamada deve falhar com 503
+        """
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(0, self.config['jitter_ms']) if self.config['jitter_ms'] else 0.0
+            fail = self.config['error_rate'] > 0 and self._random.random() < self.config['error_rate']
+        
+        delay = (self.config['latency_ms'] + jitter) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+    
+    def render_app(self) -> bytes:
+        """HTML do frontend com a configuração do stub embutida."""
+        html = _APP_FILE.read_text(encoding='utf-8')
+        config = json.dumps({'uiDelayMs': self.config['ui_delay_ms']})
+        return html.replace('/*__STUB_CONFIG__*/{}', config).encode('utf-8')
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Rotas do stub (``stub`` é ligado à instância em ``StubServer.start``)."""
+    
+    stub: StubServer = None
+    protocol_version = "HTTP/1.1"
+    
+    _ENTERPRISE_ROUTE = re.compile(r'^/api/v1/enterprises/(\d+)(?:/(activities|characterization))?$')
+    _PROPERTY_ROUTE = re.compile(r'^/api/v1/properties/(\d+)$')
+    
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+    
+    def do_HEAD(self) -> None:
+        self._dispatch('HEAD')
+    
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+    
+    def log_message(self, format: str, *args) -> None:
+        """Silencia o log por requisição do http.server."""
+    
+    def _dispatch(self, method: str) -> None:
+        self._body_pending = int(self.headers.get('Content-Length') or 0)
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/') or '/'
+        query = parse_qs(parts.query)
+        
+        if path.startswith('/__stub'):
+            return self._control(method, path)
+        
+        if not path.startswith('/api/'):
+            if method == 'POST':
+                return self._json(405, {'detail': 'Method Not Allowed'})
+            return self._send(200, self.stub.render_app(), 'text/html; charset=utf-8')
+        
+        if self.stub.inject_delay():
+            return self._json(503, {'detail': 'Falha injetada pelo stub'})
+        
+        status, body = self._api(method, path, query)
+        self._json(status, body)
+    
+    def _api(self, method: str, path: str, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        state = self.stub.state
+        
+        if path == '/api/v1/properties':
+            if method == 'POST':
+                return 201, state.create_property(self._read_json())
+            return 200, list(state.properties.values())
+        
+        match = self._PROPERTY_ROUTE.match(path)
+        if match:
+            record = state.properties.get(int(match.group(1)))
+            return (200, record) if record else (404, {'detail': 'Imóvel não encontrado'})
+        
+        if path == '/api/v1/enterprises':
+            if method == 'POST':
+                return 201, state.create_enterprise(self._read_json())
+            if 'ids' in query:
+                try:
+                    ids = [int(i) for i in query['ids'][0].split(',') if i.strip()]
+                except ValueError:
+                    return 400, {'detail': 'ids inválidos'}
+                return 200, [b for b in map(state.enterprise_bundle, ids) if b is not None]
+            return 200, list(state.enterprises.values())
+        
+        match = self._ENTERPRISE_ROUTE.match(path)
+        if match:
+            enterprise_id, resource = int(match.group(1)), match.group(2)
+            if enterprise_id not in state.enterprises:
+                return 404, {'detail': 'Empreendimento não encontrado'}
+            if resource == 'activities':
+                return 200, state.activities.get(enterprise_id, [])
+            if resource == 'characterization':
+                return 200, state.characterizations.get(enterprise_id, {})
+            return 200, state.enterprises[enterprise_id]
+        
+        return 404, {'detail': 'Rota não encontrada'}
+    
+    def _control(self, method: str, path: str) -> None:
+        """Rotas de controle: health, config (GET/POST) e reset (POST)."""
+        if path == '/__stub/health':
+            return self._json(200, {'status': 'ok', 'requests': self.stub.requests})
+        
+        if path == '/__stub/config':
+            if method == 'POST':
+                updates = self._read_json()
+                for key in self.stub.config:
+                    if key in updates:
+                        self.stub.config[key] = float(updates[key])
+            return self._json(200, self.stub.config)
+        
+        if path == '/__stub/reset' and method == 'POST':
+            self.stub.state.reset()
+            return self._json(200, {'status': 'reset'})
+        
+        self._json(404, {'detail': 'Rota não encontrada'})
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length, self._body_pending = self._body_pending, 0
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def _json(self, status: int, body: Any) -> None:
+        self._send(status, json.dumps(body, ensure_ascii=False).encode('utf-8'), 'application/json')
+    
+    def _discard_body(self) -> None:
+        """
+        Descarta o corpo não lido (405, 503 injetado, rotas sem payload).
+        
+        Sem isso os bytes restantes ficam na conexão keep-alive e corrompem
+        a próxima requisição.
+        """
+        length, self._body_pending = getattr(self, '_body_pending', 0), 0
+        while length > 0:
+            chunk = self.rfile.read(min(length, 65536))
+            if not chunk:
+                break
+            length -= len(chunk)
+    
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self._discard_body()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+def main() -> None:
+    """Sobe o stub em primeiro plano (Ctrl+C para sair)."""
+    parser = argparse.ArgumentParser(description="Stub local do frontend/backend do licenciamento")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None, help="0 = porta efêmera")
+    parser.add_argument('--latency-ms', type=float, default=None)
+    parser.add_argument('--jitter-ms', type=float, default=None)
+    parser.add_argument('--error-rate', type=float, default=None)
+    args = parser.parse_args()
+    
+    stub = StubServer(
+        host=args.host, port=args.port, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate
+    ).start()
+    
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Cliente HTTP assíncrono
+========================
+
+Cliente para consultar as APIs do backend em paralelo, reaproveitando
+conexões keep-alive, com retentativas e tempo medido por requisição.
+
+Usa ``httpx`` se estiver instalado; caso contrário, um pool de
+``http.client.HTTPConnection`` (biblioteca padrão) executado em threads.
+"""
+
+import asyncio
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import httpx
+except ImportError:  # opcional
+    httpx = None
+
+from ..config.settings import settings
+from .latency_histogram import LatencyHistogram
+
+
+class HttpClient:
+    """Cliente HTTP assíncrono com pool de conexões e retentativas."""
+    
+    # Status que valem nova tentativa (sobrecarga / indisponibilidade)
+    RETRY_STATUS = (429, 502, 503, 504)
+    
+    def __init__(
+        self,
+        max_connections: int = None,
+        timeout: float = None,
+        retries: int = None,
+        backoff: float = None,
+        headers: Optional[Dict[str, str]] = None,
+        auth: bool = True
+    ):
+        """
+        Inicializa o cliente.
+        
+        Args:
+            max_connections: Conexões simultâneas (padrão: API_MAX_CONNECTIONS)
+            timeout: Timeout por requisição em segundos (padrão: API_TIMEOUT)
+            retries: Tentativas extras em erro de rede/5xx (padrão: API_RETRIES)
+            backoff: Espera base entre tentativas, dobrada a cada uma (padrão: API_RETRY_BACKOFF)
+            headers: Cabeçalhos adicionais
+            auth: Enviar API_AUTH_TOKEN (desligar para hosts que não são o backend)
+        """
+        self.max_connections = max_connections or settings.API_MAX_CONNECTIONS
+        self.timeout = timeout if timeout is not None else settings.API_TIMEOUT
+        self.retries = retries if retries is not None else settings.API_RETRIES
+        self.backoff = backoff if backoff is not None else settings.API_RETRY_BACKOFF
+        
+        self.headers = {'Accept': 'application/json'}
+        if auth and settings.API_AUTH_TOKEN:
+            self.headers['Authorization'] = f"Bearer {settings.API_AUTH_TOKEN}"
+        self.headers.update(headers or {})
+        
+        # Agregados (memória constante mesmo nos modos em lote)
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.retried = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._idle_lock = threading.Lock()
+    
+    async def __aenter__(self) -> 'HttpClient':
+        self.open()
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+    
+    def open(self) -> None:
+        """Cria o pool de conexões (chamado pelo ``async with``)."""
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        
+        if httpx is not None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_connections, thread_name_prefix="http"
+            )
+    
+    async def close(self) -> None:
+        """Fecha as conexões abertas."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        
+        with self._idle_lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+    
+    async def get_json(self, url: str) -> Dict[str, Any]:
+        """
+        Faz um GET e decodifica o corpo JSON.
+        
+        Args:
+            url: URL absoluta
+        
+        Returns:
+            dict: url, status, data, elapsed_ms, attempts e error
+                  (error é None quando a resposta é 2xx)
+        """
+        if self._semaphore is None:
+            self.open()
+        
+        status, body, error = None, None, None
+        attempt = 0
+        
+        async with self._semaphore:
+            # Tempo medido a partir da obtenção da vaga (sem a fila do pool)
+            start = time.perf_counter()
+            while True:
+                attempt += 1
+                try:
+                    status, _, body = await self._request('GET', url)
+                    error = None if 200 <= status < 300 else f"HTTP {status}"
+                    retry = status in self.RETRY_STATUS
+                except Exception as e:
+                    status, body, error = None, None, f"{type(e).__name__}: {e}"
+                    retry = True
+                
+                if not retry or attempt > self.retries:
+                    break
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        
+        data = None
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                error = error or "Resposta não é JSON"
+        
+        result = {
+            'url': url,
+            'status': status,
+            'data': data,
+            'elapsed_ms': elapsed_ms,
+            'attempts': attempt,
+            'error': error
+        }
+        self.latency.record(elapsed_ms)
+        self.retried += attempt - 1
+        if not status or status >= 400:
+            self.errors += 1
+        return result
+    
+    async def content_length(self, url: str) -> Optional[int]:
+        """
+        Tamanho de um recurso segundo o ``Content-Length`` de um HEAD.
+        
+        Args:
+            url: URL absoluta
+        
+        Returns:
+            int: Tamanho em bytes ou None se indisponível
+        """
+        if self._semaphore is None:
+            self.open()
+        
+        async with self._semaphore:
+            try:
+                status, headers, _ = await self._request('HEAD', url)
+            except Exception:
+                return None
+        
+        length = headers.get('content-length')
+        if status and status < 400 and length and length.isdigit():
+            return int(length)
+        return None
+    
+    async def _request(self, method: str, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Executa uma tentativa pelo backend disponível (status, cabeçalhos, corpo)."""
+        if self._client is not None:
+            response = await self._client.request(method, url)
+            return response.status_code, dict(response.headers), response.content
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._blocking_request, method, url)
+    
+    def _blocking_request(self, method: str, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Requisição com ``http.client``, devolvendo a conexão ao pool se continuar aberta."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        
+        with self._idle_lock:
+            pool = self._idle.setdefault(key, [])
+            conn = pool.pop() if pool else None
+        
+        if conn is None:
+            conn_class = (
+                http.client.HTTPSConnection if parts.scheme == 'https'
+                else http.client.HTTPConnection
+            )
+            conn = conn_class(parts.netloc, timeout=self.timeout)
+        
+        try:
+            conn.request(method, path, headers=self.headers)
+            response = conn.getresponse()
+            body = response.read()
+        except Exception:
+            conn.close()
+            raise
+        
+        if response.will_close:
+            conn.close()
+        else:
+            with self._idle_lock:
+                self._idle[key].append(conn)
+        
+        headers = {k.lower(): v for k, v in response.getheaders()}
+        return response.status, headers, body
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Resume os tempos das requisições feitas até agora.
+        
+        Returns:
+            dict: requests, errors, retries, p50_ms, p95_ms, max_ms
+                  (percentis do ``LatencyHistogram``, erro relativo < 2%)
+        """
+        return {
+            'requests': self.latency.count,
+            'errors': self.errors,
+            'retries': self.retried,
+            'p50_ms': self.latency.percentile(50),
+            'p95_ms': self.latency.percentile(95),
+            'max_ms': round(self.latency.max_ms or 0.0, 1)
+        }
+    
+    @staticmethod
+    def percentile(sorted_values: List[float], pct: float) -> float:
+        """
+        Percentil por ordem (nearest-rank) de uma lista já ordenada.
+        
+        Args:
+            sorted_values: Valores em ordem crescente
+            pct: Percentil (0-100)
+        
+        Returns:
+            float: Valor do percentil (0.0 se a lista estiver vazia)
+        """
+        if not sorted_values:
+            return 0.0
+        rank = max(1, -(-len(sorted_values) * pct // 100))
+        return sorted_values[int(rank) - 1]
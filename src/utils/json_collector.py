@@ -3,17 +3,82 @@ Utilitário - Extração de JSON do Store
 =======================================
 
 Extrai dados do localStorage/store do navegador para validação.
+
+O store vem como string bruta em uma única chamada e é lido uma vez em
+Python; ``extrair_alteracoes`` traz só as seções do state que mudaram
+desde a extração anterior (hash por seção calculado na página).
 """
 
-import json
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from ..config.settings import settings
+from .json_serializer import json_serializer
+from .run_archive import run_archive
+from .store_schema import store_validator
+
 
 class JSONCollector:
     """Coleta e salva JSON do store do navegador."""
     
+    # Chave do store persistido (Zustand persist)
+    STORAGE_KEY = 'empreendimento-storage'
+    
+    # Origem (localStorage, sessionStorage ou store global) + string bruta: o
+    # navegador não faz JSON.parse e o WebDriver transporta uma única string
+    _RAW_SCRIPT = """
+    const key = arguments[0];
+    for (const [name, storage] of [['localStorage', window.localStorage], ['sessionStorage', window.sessionStorage]]) {
+        try {
+            const raw = storage.getItem(key);
+            if (raw) return [name, raw];
+        } catch (e) {}
+    }
+    try {
+        const state = window.store ? window.store.getState() : (window.__STORE__ || window.__ZUSTAND_STORES__);
+        if (state) return ['window store', JSON.stringify(state)];
+    } catch (e) {}
+    return null;
+    """
+    
+    # Hash (FNV-1a + tamanho) de cada seção do state na própria página; só as
+    # seções cujo hash difere do informado (arguments[1]) voltam, como string
+    _CHANGES_SCRIPT = _RAW_SCRIPT.replace("const key = arguments[0];", """
+    const key = arguments[0], known = arguments[1] || {};
+    const fetchRaw = () => {""", 1) + """
+    };
+    const found = fetchRaw();
+    if (!found) return null;
+    const [source, raw] = found;
+    const data = JSON.parse(raw);
+    const isObject = v => v !== null && typeof v === 'object' && !Array.isArray(v);
+    if (!isObject(data)) return {source: source, size: raw.length, raw: raw};
+    
+    const hasState = isObject(data.state);
+    const sections = hasState ? data.state : data;
+    const fnv = s => {
+        let h = 0x811c9dc5;
+        for (let i = 0; i < s.length; i++) {
+            h ^= s.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        return (h >>> 0).toString(16) + ':' + s.length;
+    };
+    
+    const hashes = {}, changed = {};
+    for (const k of Object.keys(sections)) {
+        const text = JSON.stringify(sections[k]);
+        hashes[k] = fnv(text);
+        if (known[k] !== hashes[k]) changed[k] = text;
+    }
+    const root = {};
+    if (hasState) for (const k of Object.keys(data)) if (k !== 'state') root[k] = data[k];
+    return {source: source, size: raw.length, hasState: hasState, root: JSON.stringify(root),
+            hashes: hashes, changed: changed};
+    """
+    
     def __init__(self, driver):
         """
         Inicializa o coletor.
@@ -22,97 +87,174 @@ class JSONCollector:
             driver: Instância do WebDriver
         """
         self.driver = driver
+        
+        # Último store completo (mantido atualizado por extrair_alteracoes)
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.tamanho: Optional[int] = None
+        self._salvo: Optional[Tuple[int, int]] = None
+        self._hashes: Dict[str, str] = {}
+        self._origem: Optional[Tuple[str, bool]] = None
     
     def extrair_store(self) -> Optional[Dict[str, Any]]:
         """
         Extrai dados do store via localStorage.
         
+        Uma única chamada ao navegador devolve a string bruta (localStorage,
+        sessionStorage ou store global, nessa ordem), que é lida uma vez aqui.
+        
         Returns:
             dict: Dados do store ou None se não encontrado
         """
         print("📊 Extraindo dados do store...")
         
-        # Método 1: localStorage
-        script_local = """
-        try {
-            const localData = localStorage.getItem('empreendimento-storage');
-            if (localData) {
-                return JSON.parse(localData);
-            }
-        } catch (e) {}
-        return null;
-        """
+        try:
+            found = self.driver.execute_script(self._RAW_SCRIPT, self.STORAGE_KEY)
+        except Exception as e:
+            print(f"⚠️ Extração do store falhou: {e}")
+            return None
         
-        # Método 2: sessionStorage
-        script_session = """
-        try {
-            const sessionData = sessionStorage.getItem('empreendimento-storage');
-            if (sessionData) {
-                return JSON.parse(sessionData);
-            }
-        } catch (e) {}
-        return null;
+        if not found:
+            print("⚠️ Store não encontrado em nenhum método")
+            return None
+        
+        nome, raw = found
+        try:
+            store_data = json_serializer.loads(raw)
+        except ValueError as e:
+            print(f"⚠️ Store em {nome} não é um JSON válido: {e}")
+            return None
+        
+        self._guardar(store_data, len(raw))
+        self._hashes = {}
+        print(f"✅ Store extraído com sucesso via {nome}!")
+        return store_data
+    
+    def extrair_alteracoes(self) -> Optional[Dict[str, Any]]:
         """
+        Extrai só as seções do state que mudaram desde a última chamada.
         
-        # Método 3: Window object (store global)
-        script_window = """
-        try {
-            // Tentar diferentes variáveis globais
-            if (window.store) return window.store.getState();
-            if (window.__STORE__) return window.__STORE__;
-            if (window.__ZUSTAND_STORES__) return window.__ZUSTAND_STORES__;
-        } catch (e) {}
-        return null;
+        A página calcula um hash por seção (chave de primeiro nível de
+        ``state``) e devolve apenas as que diferem dos hashes já conhecidos;
+        ``snapshot`` continua com o store completo atualizado.
+        
+        Returns:
+            dict: ``alteradas`` (seção -> valor; um store que não é objeto
+                  vem inteiro na chave ``''``), ``removidas`` (lista),
+                  ``tamanho`` do store e ``transferido`` (bytes trafegados),
+                  ou None se o store não foi encontrado
         """
+        try:
+            result = self.driver.execute_script(self._CHANGES_SCRIPT, self.STORAGE_KEY, self._hashes)
+        except Exception as e:
+            print(f"⚠️ Extração incremental do store falhou: {e}")
+            return None
         
-        # Tentar métodos em ordem
-        metodos = [
-            ("localStorage", script_local),
-            ("sessionStorage", script_session),
-            ("window store", script_window)
-        ]
-        
-        for nome, script in metodos:
-            try:
-                store_data = self.driver.execute_script(script)
-                
-                if store_data:
-                    print(f"✅ Store extraído com sucesso via {nome}!")
-                    return store_data
-                    
-            except Exception as e:
-                print(f"⚠️ Método {nome} falhou: {e}")
+        if not result:
+            return None
+        
+        if 'raw' in result:
+            # Store que não é um objeto: não há seções para comparar
+            data = json_serializer.loads(result['raw'])
+            self._guardar(data, result['size'])
+            self._hashes, self._origem = {}, None
+            return {'alteradas': {'': data}, 'removidas': [], 'tamanho': result['size'],
+                    'transferido': len(result['raw'])}
+        
+        origem = (result['source'], result['hasState'])
+        if origem != self._origem or self.snapshot is None:
+            # Outra origem/formato: o que está em cache não vale mais
+            self.snapshot, self._hashes, self._origem = None, {}, origem
+            if len(result['changed']) < len(result['hashes']):
+                return self.extrair_alteracoes()
         
-        print("⚠️ Store não encontrado em nenhum método")
-        return None
+        alteradas = {k: json_serializer.loads(text) for k, text in result['changed'].items()}
+        removidas = [k for k in self._hashes if k not in result['hashes']]
+        
+        snapshot = json_serializer.loads(result['root']) if result['hasState'] else {}
+        secoes = dict(self.secoes(self.snapshot))
+        for k in removidas:
+            secoes.pop(k, None)
+        secoes.update(alteradas)
+        secoes = {k: secoes[k] for k in result['hashes']}
+        if result['hasState']:
+            snapshot['state'] = secoes
+        else:
+            snapshot = secoes
+        
+        self._guardar(snapshot, result['size'])
+        self._hashes = result['hashes']
+        
+        return {
+            'alteradas': alteradas,
+            'removidas': removidas,
+            'tamanho': result['size'],
+            'transferido': len(result['root']) + sum(len(t) for t in result['changed'].values())
+        }
+    
+    def reset(self) -> None:
+        """Esquece o último snapshot (a próxima extração incremental traz tudo)."""
+        self.snapshot = None
+        self.tamanho = None
+        self._hashes = {}
+        self._origem = None
+    
+    def _guardar(self, data: Any, tamanho: int) -> None:
+        """Guarda o último store lido e o tamanho da string original."""
+        self.snapshot = data
+        self.tamanho = tamanho
+    
+    @staticmethod
+    def secoes(data: Any) -> Dict[str, Any]:
+        """Seções do store (chaves de ``state``, ou da raiz se não houver state)."""
+        if not isinstance(data, dict):
+            return {}
+        if isinstance(data.get('state'), dict):
+            return data['state']
+        return data
     
-    def salvar_json(self, data: Dict[str, Any], output_dir: str = "output") -> Optional[str]:
+    def salvar_json(
+        self,
+        data: Dict[str, Any],
+        output_dir: str = "output",
+        pretty: bool = None,
+        tipo: str = None
+    ) -> Optional[str]:
         """
-        Salva JSON em arquivo.
+        Salva o JSON coletado.
+        
+        Com ARCHIVE_ENABLED, vai para o arquivo de execuções (``run_archive``,
+        JSONL comprimido em ARCHIVE_DIR); senão, para um arquivo próprio em
+        ``output_dir`` (gravação atômica, orjson se disponível).
         
         Args:
             data: Dados para salvar
-            output_dir: Diretório de saída
-            
+            output_dir: Diretório de saída (só sem o arquivo de execuções)
+            pretty: Indentado ou compacto (padrão: JSON_PRETTY)
+            tipo: Tipo de imóvel para o índice (padrão: procurado nos dados)
+        
         Returns:
-            str: Caminho do arquivo salvo ou None
+            str: run_id no arquivo de execuções, caminho do arquivo salvo ou None
         """
         try:
-            # Criar diretório
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            if settings.ARCHIVE_ENABLED:
+                entry = run_archive.append(data, tipo=tipo)
+                print(f"💾 JSON arquivado: {entry['run_id']} em {entry['segment']} "
+                      f"({entry['bytes'] / 1024:.2f} KB, {entry['length'] / 1024:.2f} KB comprimido)")
+                return entry['run_id']
             
-            # Nome do arquivo com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"empreendimento_completo_{timestamp}.json"
+            # Nome único mesmo com várias execuções no mesmo segundo ou em vários workers
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            worker = os.environ.get('PYTEST_XDIST_WORKER', str(os.getpid()))
+            filename = f"empreendimento_completo_{timestamp}_{worker}.json"
             filepath = Path(output_dir) / filename
             
-            # Salvar JSON formatado
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Salvar JSON (o diretório é criado na gravação)
+            tamanho = json_serializer.write(data, filepath, pretty=pretty)
+            self._salvo = (id(data), tamanho)
             
-            print(f"💾 JSON salvo: {filepath}")
+            print(f"💾 JSON salvo: {filepath} ({tamanho / 1024:.2f} KB)")
             return str(filepath)
-            
+        
         except Exception as e:
             print(f"❌ Erro ao salvar JSON: {e}")
             return None
@@ -127,8 +269,13 @@ class JSONCollector:
         print("\n📈 Estatísticas dos Dados:")
         print("-" * 60)
         
-        json_str = json.dumps(data, ensure_ascii=False)
-        tamanho = len(json_str)
+        # Tamanho já conhecido (extração ou gravação); senão, conta sem montar a string
+        if data is self.snapshot and self.tamanho is not None:
+            tamanho = self.tamanho
+        elif self._salvo and self._salvo[0] == id(data):
+            tamanho = self._salvo[1]
+        else:
+            tamanho = json_serializer.size(data)
         
         print(f"  • Tamanho: {tamanho:,} bytes ({tamanho/1024:.2f} KB)")
         
@@ -148,48 +295,29 @@ class JSONCollector:
         
         print("-" * 60)
     
-    def validar_estrutura(self, data: Dict[str, Any]) -> bool:
+    def validar_estrutura(self, data: Dict[str, Any], tipo: str = None) -> bool:
         """
-        Valida se a estrutura do JSON está completa.
+        Valida o JSON contra o schema do tipo de imóvel (``store_validator``).
         
         Args:
             data: Dados para validar
-            
+            tipo: Tipo de imóvel (padrão: ``state.tipoImovel`` dos dados)
+        
         Returns:
-            bool: True se estrutura válida
+            bool: True se não houver violação com status ERRO (avisos não reprovam)
         """
         print("\n✓ Validando estrutura do JSON...")
         
-        validacoes = []
-        
-        # Verificar se tem state
-        if 'state' in data:
-            validacoes.append(("State presente", True))
-        else:
-            validacoes.append(("State presente", False))
-        
-        # Se tiver state, verificar campos principais
-        if 'state' in data and isinstance(data['state'], dict):
-            state = data['state']
-            
-            # Validar imóvel
-            tem_imovel = 'selectedProperty' in state or 'property' in state
-            validacoes.append(("Imóvel cadastrado", tem_imovel))
-            
-            # Validar empreendimento
-            tem_empreendimento = 'enterprise' in state or 'dados_gerais' in state
-            validacoes.append(("Dados gerais preenchidos", tem_empreendimento))
-            
-            # Validar atividades
-            tem_atividades = 'activities' in state or 'selectedActivities' in state
-            validacoes.append(("Atividades cadastradas", tem_atividades))
+        violacoes = store_validator.validate(data, tipo)
         
         # Exibir resultados
         print()
-        for nome, status in validacoes:
-            icone = "✅" if status else "⚠️"
-            print(f"  {icone} {nome}")
+        if not violacoes:
+            print("  ✅ Estrutura completa")
+        for violacao in violacoes[:30]:
+            icone = "❌" if violacao['status'] == 'ERRO' else "⚠️"
+            print(f"  {icone} {violacao['caminho']}: {violacao['mensagem']}")
+        if len(violacoes) > 30:
+            print(f"  ... +{len(violacoes) - 30}")
         
-        # Retornar True se pelo menos metade validou
-        total_ok = sum(1 for _, status in validacoes if status)
-        return total_ok >= len(validacoes) / 2
+        return not any(v['status'] == 'ERRO' for v in violacoes)
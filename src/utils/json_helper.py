@@ -5,24 +5,31 @@ Helper para manipulação de JSON
 Funções auxiliares para trabalhar com dados JSON.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Dict
 
+from .json_serializer import json_serializer
+
 
 class JSONHelper:
     """Helper para manipulação de JSON."""
     
     @staticmethod
-    def save_json(data: Dict[str, Any], filename: str, directory: Path = None) -> str:
+    def save_json(
+        data: Dict[str, Any],
+        filename: str,
+        directory: Path = None,
+        pretty: bool = None
+    ) -> str:
         """
-        Salva dados em arquivo JSON.
+        Salva dados em arquivo JSON (gravação atômica, orjson se disponível).
         
         Args:
             data: Dados a serem salvos
             filename: Nome do arquivo (sem extensão)
             directory: Diretório de destino
+            pretty: Indentado ou compacto (padrão: JSON_PRETTY)
             
         Returns:
             str: Caminho do arquivo salvo
@@ -40,11 +47,11 @@ class JSONHelper:
         if not filename.endswith('.json'):
             filename = f"{filename}.json"
         
-        filepath = directory / filename
+        # Diretório só é criado na primeira gravação
+        filepath = Path(directory) / filename
         
         # Salvar arquivo
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        json_serializer.write(data, filepath, pretty=pretty)
         
         return str(filepath)
     
@@ -59,8 +66,7 @@ class JSONHelper:
         Returns:
             dict: Dados carregados
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_serializer.read(filepath)
     
     @staticmethod
     def merge_contexts(*contexts) -> Dict[str, Any]:
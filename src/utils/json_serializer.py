@@ -0,0 +1,143 @@
+"""
+Serialização JSON
+==================
+
+Camada única para gravar os JSONs de saída e relatórios: usa o orjson
+quando instalado (bem mais rápido em stores grandes) e o ``json`` da
+stdlib caso contrário. Oferece saída compacta ou formatada, tamanho sem
+montar uma segunda string inteira e gravação atômica (arquivo temporário
++ rename), segura com vários workers gravando no mesmo diretório.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+from ..config.settings import settings
+
+
+class JSONSerializer:
+    """Serializa com orjson (se disponível) ou stdlib."""
+    
+    BACKENDS = ("auto", "orjson", "stdlib")
+    
+    @property
+    def backend(self) -> str:
+        """Backend efetivo: "orjson" ou "stdlib" (JSON_BACKEND=auto escolhe o orjson se instalado)."""
+        choice = settings.JSON_BACKEND
+        if choice not in self.BACKENDS:
+            raise ValueError(f"JSON_BACKEND desconhecido: {choice} (use {self.BACKENDS})")
+        if choice == "stdlib" or orjson is None:
+            return "stdlib"
+        return "orjson"
+    
+    def dumps(self, data: Any, pretty: bool = None) -> bytes:
+        """
+        Serializa para bytes UTF-8.
+        
+        Args:
+            data: Dados (datetime, Path e outros tipos viram string)
+            pretty: Indentação de 2 espaços (padrão: JSON_PRETTY)
+        
+        Returns:
+            bytes: JSON em UTF-8
+        """
+        if pretty is None:
+            pretty = settings.JSON_PRETTY
+        
+        if self.backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(data, default=str, option=option)
+        
+        return self._encoder(pretty).encode(data).encode('utf-8')
+    
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """
+        Lê JSON.
+        
+        Args:
+            content: JSON em bytes ou texto
+        
+        Returns:
+            Any: Dados
+        """
+        if self.backend == "orjson":
+            return orjson.loads(content)
+        return json.loads(content)
+    
+    def size(self, data: Any) -> int:
+        """
+        Tamanho em bytes do JSON compacto.
+        
+        Com a stdlib, soma os pedaços do ``iterencode`` sem montar a string
+        inteira na memória.
+        
+        Args:
+            data: Dados
+        
+        Returns:
+            int: Bytes em UTF-8
+        """
+        if self.backend == "orjson":
+            return len(self.dumps(data, pretty=False))
+        return sum(len(chunk.encode('utf-8')) for chunk in self._encoder(False).iterencode(data))
+    
+    def write(self, data: Any, filepath: Union[str, Path], pretty: bool = None) -> int:
+        """
+        Grava de forma atômica: quem lê nunca vê um arquivo pela metade.
+        
+        Args:
+            data: Dados
+            filepath: Arquivo de destino (o diretório é criado)
+            pretty: Indentação de 2 espaços (padrão: JSON_PRETTY)
+        
+        Returns:
+            int: Bytes gravados
+        """
+        content = self.dumps(data, pretty)
+        
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp = filepath.with_name(f".{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(content)
+            os.replace(tmp, filepath)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        
+        return len(content)
+    
+    def read(self, filepath: Union[str, Path]) -> Any:
+        """
+        Lê um arquivo JSON.
+        
+        Args:
+            filepath: Caminho do arquivo
+        
+        Returns:
+            Any: Dados
+        """
+        return self.loads(Path(filepath).read_bytes())
+    
+    @staticmethod
+    def _default(value: Any) -> str:
+        """Tipos sem JSON nativo: datas em ISO 8601 (como no orjson), o resto via str()."""
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    
+    @staticmethod
+    def _encoder(pretty: bool) -> json.JSONEncoder:
+        if pretty:
+            return json.JSONEncoder(ensure_ascii=False, indent=2, default=JSONSerializer._default)
+        return json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=JSONSerializer._default)
+
+
+# Instância global do serializador
+json_serializer = JSONSerializer()
@@ -0,0 +1,174 @@
+"""
+Histograma de Latência
+=======================
+
+Histograma no estilo HDR (log-linear): cada potência de 2 é dividida em
+``SUB_BUCKETS`` faixas lineares, então o erro relativo de qualquer
+percentil é limitado (1/64 ≈ 1,6%) e a memória não depende da quantidade
+de amostras. Vários histogramas (por usuário virtual ou por janela de
+tempo) podem ser somados com ``merge``.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """Contagem de latências (ms) em faixas log-lineares, segura entre threads."""
+    
+    # Faixas lineares por potência de 2 (precisão relativa = 1 / SUB_BUCKETS)
+    SUB_BUCKETS = 64
+    
+    # Menor valor distinguível (ms); abaixo disso tudo cai na primeira faixa
+    RESOLUTION_MS = 0.1
+    
+    def __init__(self):
+        """Inicializa o histograma vazio."""
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+    
+    def record(self, ms: float) -> None:
+        """
+        Registra uma amostra.
+        
+        Args:
+            ms: Latência em milissegundos
+        """
+        ms = max(0.0, float(ms))
+        index = self._index(ms)
+        
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total_ms += ms
+            self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+            self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """
+        Soma as contagens de outro histograma neste.
+        
+        Args:
+            other: Histograma a somar
+        
+        Returns:
+            LatencyHistogram: O próprio histograma
+        """
+        with other._lock:
+            counts = dict(other._counts)
+            count, total, low, high = other.count, other.total_ms, other.min_ms, other.max_ms
+        
+        with self._lock:
+            for index, n in counts.items():
+                self._counts[index] = self._counts.get(index, 0) + n
+            self.count += count
+            self.total_ms += total
+            if low is not None:
+                self.min_ms = low if self.min_ms is None else min(self.min_ms, low)
+            if high is not None:
+                self.max_ms = high if self.max_ms is None else max(self.max_ms, high)
+        return self
+    
+    def percentile(self, pct: float) -> float:
+        """
+        Percentil (nearest-rank) das amostras.
+        
+        Args:
+            pct: Percentil entre 0 e 100
+        
+        Returns:
+            float: Latência em ms (limite superior da faixa, nunca acima do máximo)
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(pct / 100 * self.count))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    return round(min(self._upper(index), self.max_ms), 1)
+            return round(self.max_ms, 1)
+    
+    @property
+    def mean_ms(self) -> float:
+        """Média das amostras em ms."""
+        return round(self.total_ms / self.count, 1) if self.count else 0.0
+    
+    def summary(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> Dict[str, Any]:
+        """
+        Resumo para relatórios.
+        
+        Args:
+            percentiles: Percentis a incluir
+        
+        Returns:
+            dict: count, min_ms, mean_ms, max_ms e p<N>_ms
+        """
+        result = {
+            'count': self.count,
+            'min_ms': round(self.min_ms or 0.0, 1),
+            'mean_ms': self.mean_ms,
+            'max_ms': round(self.max_ms or 0.0, 1)
+        }
+        for pct in percentiles:
+            result[f"p{pct:g}_ms"] = self.percentile(pct)
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Forma serializável (faixas esparsas), reconstruível com ``from_dict``.
+        
+        Returns:
+            dict: sub_buckets, resolution_ms, count, total_ms, min_ms, max_ms e buckets
+        """
+        with self._lock:
+            return {
+                'sub_buckets': self.SUB_BUCKETS,
+                'resolution_ms': self.RESOLUTION_MS,
+                'count': self.count,
+                'total_ms': round(self.total_ms, 1),
+                'min_ms': self.min_ms,
+                'max_ms': self.max_ms,
+                'buckets': {str(index): n for index, n in sorted(self._counts.items())}
+            }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        """
+        Reconstrói um histograma gravado por ``to_dict``.
+        
+        Args:
+            data: Dicionário de ``to_dict``
+        
+        Returns:
+            LatencyHistogram: Histograma equivalente
+        """
+        histogram = cls()
+        histogram._counts = {int(index): n for index, n in data.get('buckets', {}).items()}
+        histogram.count = data.get('count', 0)
+        histogram.total_ms = data.get('total_ms', 0.0)
+        histogram.min_ms = data.get('min_ms')
+        histogram.max_ms = data.get('max_ms')
+        return histogram
+    
+    def _index(self, ms: float) -> int:
+        """Faixa do valor: potência de 2 (expoente) x SUB_BUCKETS + posição linear."""
+        units = int(ms / self.RESOLUTION_MS)
+        if units < self.SUB_BUCKETS:
+            return units
+        exponent = units.bit_length() - self.SUB_BUCKETS.bit_length()
+        return (exponent + 1) * self.SUB_BUCKETS + ((units >> exponent) - self.SUB_BUCKETS)
+    
+    def _upper(self, index: int) -> float:
+        """Maior valor (ms) que cai na faixa ``index``."""
+        if index < self.SUB_BUCKETS:
+            return (index + 1) * self.RESOLUTION_MS
+        exponent = index // self.SUB_BUCKETS - 1
+        position = index % self.SUB_BUCKETS + self.SUB_BUCKETS
+        return ((position + 1) << exponent) * self.RESOLUTION_MS
@@ -0,0 +1,284 @@
+"""
+Registro de Localizadores
+==========================
+
+Divide localizadores XPath com união (``a | b | c``) em alternativas
+ordenadas, registra qual alternativa encontrou o elemento em cada rota
+e, nas execuções seguintes, tenta primeiro a que mais acertou.
+
+Quando o elemento encontrado tem ``id`` ou ``data-testid``, um seletor
+CSS direto é aprendido e passa a ser tentado antes do XPath original.
+As estatísticas são persistidas em disco entre execuções.
+"""
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from .page_snapshot import PageSnapshot
+from ..config.settings import settings, REPORTS_DIR
+
+
+class LocatorRegistry:
+    """Resolve localizadores pela alternativa historicamente mais rápida."""
+    
+    # Avalia as alternativas em ordem (por rota) e devolve a primeira que
+    # satisfaz a condição, em uma única chamada ao navegador
+    _LOCATE_SCRIPT = PageSnapshot.FIND_ELEMENTS_JS + """
+    var alternatives = arguments[0], orders = arguments[1], condition = arguments[2];
+    var route = location.pathname;
+    var order = orders[route] || orders[''];
+    
+    function matches(e) {
+        if (condition === 'presence') return true;
+        if (!isVisible(e)) return false;
+        return condition !== 'clickable' || !e.disabled;
+    }
+    
+    function learn(e) {
+        var testId = e.getAttribute && e.getAttribute('data-testid');
+        if (testId) return ['css selector', '[data-testid="' + testId + '"]'];
+        if (e.id && document.querySelectorAll('#' + CSS.escape(e.id)).length === 1) {
+            return ['css selector', '#' + CSS.escape(e.id)];
+        }
+        return null;
+    }
+    
+    for (var i = 0; i < order.length; i++) {
+        var alt = alternatives[order[i]];
+        var nodes = find(alt[0], alt[1]);
+        for (var j = 0; j < nodes.length; j++) {
+            if (matches(nodes[j])) {
+                return {element: nodes[j], index: order[i], tried: order.slice(0, i),
+                        route: route, learned: learn(nodes[j])};
+            }
+        }
+    }
+    return {element: null, route: route};
+    """
+    
+    def __init__(self, stats_file: Path = None):
+        """
+        Inicializa o registro.
+        
+        Args:
+            stats_file: Arquivo de estatísticas (padrão: LOCATOR_STATS_FILE)
+        """
+        self._stats_file = Path(stats_file) if stats_file else None
+        # chave -> rota -> alternativa -> {hits, misses}
+        self._stats: Optional[Dict[str, Dict[str, Dict[str, Dict[str, int]]]]] = None
+        self._delta: Dict[str, Dict[str, Dict[str, Dict[str, int]]]] = {}
+        self._split_cache: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+    
+    @property
+    def stats_file(self) -> Path:
+        """Arquivo de estatísticas."""
+        return self._stats_file or REPORTS_DIR / settings.LOCATOR_STATS_FILE
+    
+    @staticmethod
+    def split_union(xpath: str) -> List[str]:
+        """
+        Divide uma XPath com união em alternativas, respeitando colchetes,
+        parênteses e aspas.
+        
+        Args:
+            xpath: Expressão XPath
+        
+        Returns:
+            list: Alternativas na ordem em que aparecem
+        """
+        parts, depth, quote, current = [], 0, None, []
+        
+        for char in xpath:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in ("'", '"'):
+                quote = char
+            elif char in '[(':
+                depth += 1
+            elif char in '])':
+                depth -= 1
+            elif char == '|' and depth == 0:
+                parts.append(''.join(current).strip())
+                current = []
+                continue
+            current.append(char)
+        
+        parts.append(''.join(current).strip())
+        return [p for p in parts if p]
+    
+    def alternatives(self, locator: Tuple[By, str]) -> List[Tuple[str, str]]:
+        """
+        Retorna as alternativas de um localizador (união dividida).
+        
+        Args:
+            locator: Tupla (By, valor)
+        
+        Returns:
+            list: Alternativas (By, valor)
+        """
+        by, value = locator
+        if (by, value) not in self._split_cache:
+            if by == By.XPATH:
+                alts = [(By.XPATH, part) for part in self.split_union(value)]
+            else:
+                alts = [(by, value)]
+            self._split_cache[(by, value)] = alts
+        return self._split_cache[(by, value)]
+    
+    def locate(
+        self,
+        driver: webdriver.Chrome,
+        locator: Tuple[By, str],
+        condition: str = "presence"
+    ):
+        """
+        Localiza o elemento tentando primeiro a alternativa mais bem ranqueada.
+        
+        Pode ser usado como condição do WebDriverWait (retorna False se
+        nada foi encontrado).
+        
+        Args:
+            driver: Instância do WebDriver
+            locator: Tupla (By, valor)
+            condition: presence, visible ou clickable
+        
+        Returns:
+            WebElement ou False
+        """
+        if condition not in ('presence', 'visible', 'clickable'):
+            condition = 'presence'
+        
+        key = self._key(locator)
+        base = self.alternatives(locator)
+        
+        with self._lock:
+            route_stats = self._load().get(key, {})
+            learned = [
+                self._parse_key(alt)
+                for stats in route_stats.values() for alt in stats
+                if self._parse_key(alt) not in base
+            ]
+            alts = base + [a for i, a in enumerate(learned) if a not in learned[:i]]
+            orders = {route: self._rank(alts, stats, len(base)) for route, stats in route_stats.items()}
+            orders[''] = list(range(len(base)))
+        
+        result = driver.execute_script(
+            self._LOCATE_SCRIPT, [list(a) for a in alts], orders, condition
+        )
+        
+        if not result or not result.get('element'):
+            return False
+        
+        route = result['route']
+        self._record(key, route, [alts[i] for i in result['tried']], alts[result['index']])
+        
+        if result.get('learned'):
+            learned_alt = tuple(result['learned'])
+            if learned_alt != alts[result['index']]:
+                # O seletor aprendido identifica o mesmo elemento: creditar o acerto a ele
+                self._record(key, route, [], learned_alt)
+        
+        return result['element']
+    
+    def save(self) -> None:
+        """Persiste as estatísticas (mescla com o que outros workers gravaram)."""
+        with self._lock:
+            if not self._delta:
+                return
+            delta, self._delta = self._delta, {}
+        
+        try:
+            current = self._read_file()
+            for key, routes in delta.items():
+                for route, alts in routes.items():
+                    for alt, counts in alts.items():
+                        target = current.setdefault(key, {}).setdefault(route, {}).setdefault(
+                            alt, {'hits': 0, 'misses': 0}
+                        )
+                        target['hits'] += counts['hits']
+                        target['misses'] += counts['misses']
+            
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.stats_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(current, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, self.stats_file)
+        except OSError as e:
+            print(f"⚠️ Erro ao salvar estatísticas de localizadores: {e}")
+    
+    def _rank(
+        self,
+        alts: List[Tuple[str, str]],
+        stats: Dict[str, Dict[str, int]],
+        learned_from: int = None
+    ) -> List[int]:
+        """
+        Ordena as alternativas por pontuação (acertos - 2 x falhas).
+        
+        O seletor aprendido ganha um acerto junto com a XPath que encontrou
+        o elemento; no empate, ele (a partir de ``learned_from``) vem antes.
+        """
+        learned_from = len(alts) if learned_from is None else learned_from
+        
+        def score(idx: int) -> Tuple[int, int, int]:
+            counts = stats.get(self._key(alts[idx]), {'hits': 0, 'misses': 0})
+            return (-(counts['hits'] - 2 * counts['misses']), idx < learned_from, idx)
+        return sorted(range(len(alts)), key=score)
+    
+    def _record(
+        self,
+        key: str,
+        route: str,
+        missed: List[Tuple[str, str]],
+        hit: Tuple[str, str]
+    ) -> None:
+        """Registra acerto/falhas em memória (estatística viva e delta a persistir)."""
+        with self._lock:
+            for target in (self._load(), self._delta):
+                route_stats = target.setdefault(key, {}).setdefault(route, {})
+                for alt in missed:
+                    route_stats.setdefault(self._key(alt), {'hits': 0, 'misses': 0})['misses'] += 1
+                route_stats.setdefault(self._key(hit), {'hits': 0, 'misses': 0})['hits'] += 1
+            
+            if not self._atexit_registered:
+                atexit.register(self.save)
+                self._atexit_registered = True
+    
+    def _load(self) -> Dict[str, Any]:
+        """Carrega as estatísticas do disco na primeira utilização."""
+        if self._stats is None:
+            self._stats = self._read_file()
+        return self._stats
+    
+    def _read_file(self) -> Dict[str, Any]:
+        """Lê o arquivo de estatísticas (vazio se não existir ou inválido)."""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def _key(locator: Tuple[str, str]) -> str:
+        """Serializa (By, valor) como chave."""
+        return f"{locator[0]}={locator[1]}"
+    
+    @staticmethod
+    def _parse_key(key: str) -> Tuple[str, str]:
+        """Inverso de ``_key``."""
+        by, value = key.split('=', 1)
+        return (by, value)
+
+
+# Instância global
+locator_registry = LocatorRegistry()
@@ -0,0 +1,101 @@
+"""
+Helper para leitura em lote do estado da página
+================================================
+
+Lê valor, visibilidade, estado habilitado e contagens de vários
+localizadores em uma única chamada ``execute_script``, em vez de uma
+ida e volta ao ChromeDriver por campo.
+"""
+
+from typing import Any, Dict, Tuple
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+
+class PageSnapshot:
+    """Snapshot do estado de um conjunto de localizadores."""
+    
+    # Busca de elementos por (By, valor) dentro da página (reusado por outros helpers)
+    FIND_ELEMENTS_JS = """
+    function toArray(list) { return Array.prototype.slice.call(list); }
+    
+    function find(by, value) {
+        try {
+            switch (by) {
+                case 'xpath':
+                    var r = document.evaluate(
+                        value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+                    );
+                    var nodes = [];
+                    for (var i = 0; i < r.snapshotLength; i++) nodes.push(r.snapshotItem(i));
+                    return nodes;
+                case 'css selector': return toArray(document.querySelectorAll(value));
+                case 'id':
+                    var e = document.getElementById(value);
+                    return e ? [e] : [];
+                case 'name': return toArray(document.getElementsByName(value));
+                case 'class name': return toArray(document.getElementsByClassName(value));
+                case 'tag name': return toArray(document.getElementsByTagName(value));
+            }
+        } catch (e) {}
+        return [];
+    }
+    
+    function isVisible(e) {
+        if (!e.getBoundingClientRect) return false;
+        var rect = e.getBoundingClientRect(), style = getComputedStyle(e);
+        return rect.width > 0 && rect.height > 0 &&
+            style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    """
+    
+    _SNAPSHOT_SCRIPT = FIND_ELEMENTS_JS + """
+    var specs = arguments[0], out = {};
+    
+    function valueOf(e) {
+        return (e.value !== undefined && e.tagName !== 'BUTTON') ? String(e.value) : null;
+    }
+    
+    for (var key in specs) {
+        var nodes = find(specs[key][0], specs[key][1]);
+        var first = nodes[0];
+        var visibleCount = 0, filledCount = 0;
+        
+        for (var i = 0; i < nodes.length; i++) {
+            if (isVisible(nodes[i])) visibleCount++;
+            var v = valueOf(nodes[i]);
+            if (v !== null && v !== '') filledCount++;
+        }
+        
+        out[key] = {
+            found: nodes.length > 0,
+            count: nodes.length,
+            visible_count: visibleCount,
+            filled_count: filledCount,
+            value: first ? valueOf(first) : null,
+            text: first ? (first.textContent || '').trim().slice(0, 200) : null,
+            visible: first ? isVisible(first) : false,
+            enabled: first ? !first.disabled : false
+        };
+    }
+    return out;
+    """
+    
+    @staticmethod
+    def take(
+        driver: webdriver.Chrome,
+        locators: Dict[str, Tuple[By, str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Lê o estado de vários localizadores em uma única chamada.
+        
+        Args:
+            driver: Instância do WebDriver
+            locators: Nome -> tupla (By, valor)
+        
+        Returns:
+            dict: Nome -> {found, count, visible_count, filled_count,
+                  value, text, visible, enabled} (valores do primeiro elemento)
+        """
+        specs = {key: [by, value] for key, (by, value) in locators.items()}
+        return driver.execute_script(PageSnapshot._SNAPSHOT_SCRIPT, specs) or {}
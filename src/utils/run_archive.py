@@ -0,0 +1,520 @@
+"""
+Arquivo de Execuções
+=====================
+
+Guarda o JSON coletado de cada execução em ``output/archive`` como
+segmentos JSONL comprimidos (zstd se o pacote ``zstandard`` estiver
+instalado, senão gzip), só com append: cada registro é um quadro/membro
+comprimido independente, então um segmento é ao mesmo tempo um arquivo
+``.jsonl.gz``/``.jsonl.zst`` comum e permite ler um registro sozinho a
+partir do deslocamento gravado no índice.
+
+- **run_id** único entre workers: data/hora com microssegundos, worker do
+  xdist, PID e sufixo aleatório;
+- **segmentos** por worker, trocados ao passar de ARCHIVE_SEGMENT_MAX_MB ou
+  ARCHIVE_SEGMENT_MAX_AGE_HOURS;
+- **índice** (``index.jsonl``, uma linha por registro) para busca por data,
+  tipo de imóvel e IDs sem abrir os segmentos;
+- ``prune`` remove os segmentos mais antigos que ARCHIVE_RETENTION_DAYS.
+
+Uso:
+    python -m src.utils.run_archive find --tipo RURAL --date 2026-10
+    python -m src.utils.run_archive show <run_id> [saida.json]
+    python -m src.utils.run_archive stats
+    python -m src.utils.run_archive prune
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional (gzip da stdlib no lugar)
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos (um segmento por worker)
+    fcntl = None
+
+from ..config.settings import settings
+from .json_serializer import json_serializer
+
+
+class RunArchive:
+    """Arquivo append-only de execuções em JSONL comprimido, com índice."""
+    
+    COMPRESSIONS = ("auto", "zstd", "gzip")
+    
+    # Compressão -> extensão do segmento
+    EXTENSIONS = {'zstd': '.jsonl.zst', 'gzip': '.jsonl.gz'}
+    
+    # Onde procurar tipo e IDs no JSON coletado (raiz, state e seções do imóvel/empreendimento)
+    _META_KEYS = {
+        'tipo': ('tipo_imovel', 'tipoImovel', 'property_type', 'propertyType'),
+        'property_id': ('property_id', 'propertyId', 'imovelId', 'imovel_id'),
+        'enterprise_id': ('enterprise_id', 'enterpriseId', 'empreendimentoId', 'empreendimento_id'),
+    }
+    _META_SECTIONS = ('property', 'selectedProperty', 'enterprise')
+    
+    # Bloco lido por vez em ``scan``
+    _SCAN_CHUNK = 64 * 1024
+    
+    # Erros de um quadro corrompido ou truncado
+    _READ_ERRORS = (EOFError, OSError, zlib.error) + (
+        (zstandard.ZstdError,) if zstandard is not None else ()
+    )
+    
+    def __init__(self, directory: Path = None):
+        """
+        Inicializa o arquivo.
+        
+        Args:
+            directory: Diretório dos segmentos (padrão: ARCHIVE_DIR)
+        """
+        self._directory = Path(directory) if directory else None
+        self._lock = threading.Lock()
+    
+    @property
+    def directory(self) -> Path:
+        """Diretório dos segmentos e do índice."""
+        return self._directory or settings.ARCHIVE_DIR
+    
+    @property
+    def index_file(self) -> Path:
+        """Índice run_id -> segmento/deslocamento (JSONL)."""
+        return self.directory / "index.jsonl"
+    
+    @property
+    def compression(self) -> str:
+        """Compressão efetiva: "zstd" ou "gzip" (ARCHIVE_COMPRESSION=auto escolhe zstd se instalado)."""
+        choice = settings.ARCHIVE_COMPRESSION
+        if choice not in self.COMPRESSIONS:
+            raise ValueError(f"ARCHIVE_COMPRESSION desconhecido: {choice} (use {self.COMPRESSIONS})")
+        if choice == "gzip" or zstandard is None:
+            return "gzip"
+        return "zstd"
+    
+    @staticmethod
+    def new_run_id() -> str:
+        """Identificador único entre workers e processos (ordenável pela data)."""
+        worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        return f"{datetime.now():%Y%m%dT%H%M%S%f}-{worker}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    
+    def append(
+        self,
+        data: Any,
+        tipo: str = None,
+        property_id: Any = None,
+        enterprise_id: Any = None,
+        run_id: str = None,
+        **meta
+    ) -> Dict[str, Any]:
+        """
+        Grava um registro no segmento atual do worker.
+        
+        Args:
+            data: JSON coletado
+            tipo: Tipo de imóvel (padrão: procurado no próprio JSON)
+            property_id: ID do imóvel (padrão: procurado no próprio JSON)
+            enterprise_id: ID do empreendimento (padrão: procurado no próprio JSON)
+            run_id: Identificador (padrão: ``new_run_id()``)
+            **meta: Campos extras guardados no registro (ex.: flow)
+        
+        Returns:
+            dict: Entrada do índice (run_id, ts, date, tipo, IDs, segment,
+                  offset, length e bytes sem compressão)
+        """
+        found = self.metadata(data)
+        now = datetime.now()
+        record = {
+            'run_id': run_id or self.new_run_id(),
+            'ts': now.isoformat(timespec='seconds'),
+            'tipo': str(tipo or found['tipo'] or '').upper() or None,
+            'property_id': property_id if property_id is not None else found['property_id'],
+            'enterprise_id': enterprise_id if enterprise_id is not None else found['enterprise_id'],
+        }
+        if meta:
+            record['meta'] = meta
+        
+        line = json_serializer.dumps(dict(record, data=data), pretty=False) + b"\n"
+        compression = self.compression
+        frame = self._compress(line, compression)
+        
+        with self._lock:
+            segment = self._segment(compression, now)
+            with open(segment, 'ab') as f:
+                self._lock_file(f)
+                try:
+                    f.seek(0, os.SEEK_END)
+                    offset = f.tell()
+                    f.write(frame)
+                    f.flush()
+                finally:
+                    self._unlock_file(f)
+            
+            entry = dict(record, date=now.strftime('%Y-%m-%d'), segment=segment.name,
+                         offset=offset, length=len(frame), bytes=len(line))
+            self._append_index(entry)
+        
+        return entry
+    
+    def find(
+        self,
+        date: str = None,
+        tipo: str = None,
+        enterprise_id: Any = None,
+        property_id: Any = None,
+        run_id: str = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Busca no índice (em streaming, sem abrir os segmentos).
+        
+        Args:
+            date: Data ou prefixo (``2026-10-18``, ``2026-10``)
+            tipo: Tipo de imóvel (RURAL, URBANO, LINEAR)
+            enterprise_id: ID do empreendimento
+            property_id: ID do imóvel
+            run_id: Identificador da execução
+        
+        Yields:
+            dict: Entradas do índice na ordem de gravação
+        """
+        tipo = tipo.upper() if tipo else None
+        for entry in self.entries():
+            if date and not str(entry.get('date', '')).startswith(date):
+                continue
+            if tipo and entry.get('tipo') != tipo:
+                continue
+            if enterprise_id is not None and str(entry.get('enterprise_id')) != str(enterprise_id):
+                continue
+            if property_id is not None and str(entry.get('property_id')) != str(property_id):
+                continue
+            if run_id and entry.get('run_id') != run_id:
+                continue
+            yield entry
+    
+    def records(self, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Registros que atendem aos filtros de ``find``, um de cada vez.
+        
+        Só o quadro comprimido de cada registro é lido e descomprimido.
+        
+        Yields:
+            dict: Registro (run_id, ts, tipo, IDs, meta e ``data``)
+        """
+        handles: Dict[str, BinaryIO] = {}
+        try:
+            for entry in self.find(**filters):
+                try:
+                    f = handles.get(entry['segment'])
+                    if f is None:
+                        f = handles[entry['segment']] = open(self.directory / entry['segment'], 'rb')
+                    yield self._read(f, entry)
+                except (ValueError, *self._READ_ERRORS) as e:
+                    print(f"⚠️ Registro {entry.get('run_id')} ilegível em {entry.get('segment')}: {e}")
+        finally:
+            for f in handles.values():
+                f.close()
+    
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Registro de uma execução.
+        
+        Args:
+            run_id: Identificador da execução
+        
+        Returns:
+            dict: Registro, ou None se não está no índice
+        """
+        return next(self.records(run_id=run_id), None)
+    
+    def scan(self, segment: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Lê um segmento inteiro em streaming (sem índice), linha a linha.
+        
+        Um último registro truncado (processo interrompido na gravação)
+        encerra a leitura com um aviso.
+        
+        Args:
+            segment: Arquivo do segmento
+        
+        Yields:
+            dict: Registros na ordem de gravação
+        """
+        segment = Path(segment)
+        with open(segment, 'rb') as raw:
+            if segment.name.endswith(self.EXTENSIONS['zstd']):
+                if zstandard is None:
+                    raise RuntimeError(f"{segment.name} requer o pacote zstandard")
+                chunks = self._zstd_chunks(raw)
+            else:
+                stream = gzip.GzipFile(fileobj=raw)
+                chunks = iter(lambda: stream.read1(self._SCAN_CHUNK), b'')
+            
+            # Leitura em blocos: as linhas completas antes de um final truncado ainda saem
+            pending = b''
+            try:
+                for chunk in chunks:
+                    *lines, pending = (pending + chunk).split(b'\n')
+                    for line in lines:
+                        yield json_serializer.loads(line)
+            except self._READ_ERRORS as e:
+                print(f"⚠️ {segment.name} termina em um registro incompleto: {e}")
+                return
+            if pending.strip():
+                print(f"⚠️ {segment.name} termina em um registro incompleto")
+    
+    def _zstd_chunks(self, raw: BinaryIO) -> Iterator[bytes]:
+        """
+        Descomprime os quadros zstd em sequência.
+        
+        Um quadro truncado pode não produzir nenhum byte; por isso o fim de
+        cada quadro é conferido, e um último quadro incompleto gera EOFError.
+        """
+        dctx = zstandard.ZstdDecompressor()
+        frame, started = dctx.decompressobj(), False
+        while True:
+            data = raw.read(self._SCAN_CHUNK)
+            if not data:
+                break
+            while data:
+                started = True
+                output = frame.decompress(data)
+                if output:
+                    yield output
+                if not frame.eof:
+                    break
+                data = frame.unused_data
+                frame, started = dctx.decompressobj(), False
+        if started:
+            raise EOFError("último quadro zstd incompleto")
+    
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lê o índice em streaming.
+        
+        Yields:
+            dict: Entradas na ordem de gravação (linhas corrompidas são ignoradas)
+        """
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+    
+    def segments(self) -> List[Path]:
+        """Segmentos no diretório, do mais antigo ao mais novo."""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            p for p in self.directory.glob("runs_*")
+            if p.name.endswith(tuple(self.EXTENSIONS.values()))
+        )
+    
+    def prune(self, max_age_days: float = None) -> Dict[str, int]:
+        """
+        Remove segmentos antigos e as entradas deles no índice.
+        
+        Um segmento sai inteiro quando a última gravação nele (mtime) tem
+        mais de ``max_age_days``.
+        
+        Args:
+            max_age_days: Retenção (padrão: ARCHIVE_RETENTION_DAYS, 0 = sem limite)
+        
+        Returns:
+            dict: segments_removed, entries_removed, bytes_freed
+        """
+        max_age_days = settings.ARCHIVE_RETENTION_DAYS if max_age_days is None else max_age_days
+        result = {'segments_removed': 0, 'entries_removed': 0, 'bytes_freed': 0}
+        if max_age_days <= 0:
+            return result
+        
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            removed = set()
+            for segment in self.segments():
+                stat = segment.stat()
+                if stat.st_mtime < cutoff:
+                    segment.unlink(missing_ok=True)
+                    removed.add(segment.name)
+                    result['bytes_freed'] += stat.st_size
+            
+            if removed:
+                entries = list(self.entries())
+                kept = [e for e in entries if e.get('segment') not in removed]
+                result['entries_removed'] = len(entries) - len(kept)
+                self._rewrite_index(kept)
+        
+        result['segments_removed'] = len(removed)
+        if removed:
+            print(f"🧹 Arquivo de execuções: {len(removed)} segmento(s) e {result['entries_removed']} "
+                  f"registro(s) removidos ({result['bytes_freed'] / 1024 / 1024:.1f} MB liberados)")
+        return result
+    
+    @classmethod
+    def metadata(cls, data: Any) -> Dict[str, Any]:
+        """
+        Tipo de imóvel e IDs encontrados no JSON coletado.
+        
+        Args:
+            data: JSON coletado (store ou JSON consolidado)
+        
+        Returns:
+            dict: tipo, property_id e enterprise_id (None se não encontrado)
+        """
+        sources = [data] if isinstance(data, dict) else []
+        state = data.get('state') if isinstance(data, dict) else None
+        if isinstance(state, dict):
+            sources.append(state)
+        for source in list(sources):
+            sources.extend(source[s] for s in cls._META_SECTIONS if isinstance(source.get(s), dict))
+        
+        return {
+            field: next((src[name] for src in sources for name in names if src.get(name)), None)
+            for field, names in cls._META_KEYS.items()
+        }
+    
+    def _segment(self, compression: str, now: datetime) -> Path:
+        """Segmento atual do worker, ou um novo se o último passou do tamanho/idade."""
+        worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        ext = self.EXTENSIONS[compression]
+        
+        current = [p for p in self.segments() if p.name.endswith(f"_{worker}{ext}")]
+        if current:
+            latest = current[-1]
+            created = datetime.strptime(latest.name.split('_', 1)[1][:15], '%Y%m%d_%H%M%S')
+            max_bytes = settings.ARCHIVE_SEGMENT_MAX_MB * 1024 * 1024
+            max_age = settings.ARCHIVE_SEGMENT_MAX_AGE_HOURS * 3600
+            if ((max_bytes <= 0 or latest.stat().st_size < max_bytes)
+                    and (max_age <= 0 or (now - created).total_seconds() < max_age)):
+                return latest
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"runs_{now:%Y%m%d_%H%M%S}_{worker}{ext}"
+    
+    @staticmethod
+    def _compress(line: bytes, compression: str) -> bytes:
+        """Um quadro/membro independente por registro."""
+        if compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(line)
+        return gzip.compress(line, compresslevel=6, mtime=0)
+    
+    def _read(self, f: BinaryIO, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Lê e descomprime só o quadro do registro."""
+        f.seek(entry['offset'])
+        frame = f.read(entry['length'])
+        if entry['segment'].endswith(self.EXTENSIONS['zstd']):
+            if zstandard is None:
+                raise RuntimeError(f"{entry['segment']} requer o pacote zstandard")
+            line = zstandard.ZstdDecompressor().decompress(frame)
+        else:
+            line = gzip.decompress(frame)
+        return json_serializer.loads(line)
+    
+    @staticmethod
+    def _lock_file(f: BinaryIO) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    
+    @staticmethod
+    def _unlock_file(f: BinaryIO) -> None:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        """Uma linha no índice (append é atômico para linhas curtas)."""
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+    
+    def _rewrite_index(self, entries: List[Dict[str, Any]]) -> None:
+        """Regrava o índice com as entradas mantidas."""
+        tmp = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp, self.index_file)
+
+
+# Instância global do arquivo de execuções
+run_archive = RunArchive()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(description="Arquivo de execuções (JSON coletado)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    find = sub.add_parser('find', help="Busca no índice")
+    find.add_argument('--date', default=None, help="Data ou prefixo (ex.: 2026-10)")
+    find.add_argument('--tipo', default=None, help="RURAL, URBANO ou LINEAR")
+    find.add_argument('--enterprise', default=None, help="ID do empreendimento")
+    find.add_argument('--property', default=None, help="ID do imóvel")
+    show = sub.add_parser('show', help="Mostra/extrai o JSON de uma execução")
+    show.add_argument('run_id')
+    show.add_argument('output', nargs='?', default=None)
+    sub.add_parser('stats', help="Resumo dos segmentos e do índice")
+    prune = sub.add_parser('prune', help="Remove segmentos antigos")
+    prune.add_argument('--max-age-days', type=float, default=None)
+    args = parser.parse_args(argv)
+    
+    if args.command == 'find':
+        total = 0
+        for entry in run_archive.find(date=args.date, tipo=args.tipo,
+                                      enterprise_id=args.enterprise, property_id=args.property):
+            total += 1
+            print(f"{entry['run_id']}  {entry['ts']}  {entry.get('tipo') or '-':<7} "
+                  f"imóvel={entry.get('property_id')} empreendimento={entry.get('enterprise_id')}  "
+                  f"{entry['segment']}")
+        print(f"\n{total} execução(ões)")
+        return 0
+    
+    if args.command == 'show':
+        record = run_archive.get(args.run_id)
+        if record is None:
+            print(f"❌ {args.run_id} não está no índice")
+            return 1
+        if args.output:
+            size = json_serializer.write(record['data'], args.output, pretty=True)
+            print(f"✅ {args.output} ({size / 1024:.2f} KB)")
+        else:
+            print(json_serializer.dumps(record, pretty=True).decode('utf-8'))
+        return 0
+    
+    if args.command == 'prune':
+        print(json.dumps(run_archive.prune(args.max_age_days), indent=2))
+        return 0
+    
+    tipos: Dict[str, int] = {}
+    raw = 0
+    for entry in run_archive.entries():
+        tipos[entry.get('tipo') or '-'] = tipos.get(entry.get('tipo') or '-', 0) + 1
+        raw += entry.get('bytes', 0)
+    segments = run_archive.segments()
+    stored = sum(p.stat().st_size for p in segments)
+    print(json.dumps({
+        'runs': sum(tipos.values()),
+        'by_tipo': tipos,
+        'segments': len(segments),
+        'mb_stored': round(stored / 1024 / 1024, 2),
+        'mb_raw': round(raw / 1024 / 1024, 2),
+        'compression': run_archive.compression
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
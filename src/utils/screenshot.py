@@ -7,10 +7,12 @@ Funções auxiliares para captura e gerenciamento de screenshots.
 
 import time
 from pathlib import Path
+from typing import Tuple
 from selenium import webdriver
 from datetime import datetime
 
-from ..config.settings import SCREENSHOTS_DIR
+from ..config.settings import settings, SCREENSHOTS_DIR
+from .screenshot_pipeline import screenshot_pipeline
 
 
 class ScreenshotHelper:
@@ -21,19 +23,24 @@ class ScreenshotHelper:
         driver: webdriver.Chrome,
         name: str = None,
         prefix: str = "screenshot",
-        directory: Path = None
+        directory: Path = None,
+        clip: Tuple[float, float, float, float] = None
     ) -> str:
         """
         Captura screenshot da tela atual.
         
+        A gravação é feita em segundo plano pelo ``screenshot_pipeline``
+        (SCREENSHOT_ASYNC); o arquivo existe após ``screenshot_pipeline.flush()``.
+        
         Args:
             driver: Instância do WebDriver
             name: Nome específico do arquivo
             prefix: Prefixo do nome do arquivo
             directory: Diretório de destino
+            clip: Recorte (x, y, largura, altura) em pixels CSS
             
         Returns:
-            str: Caminho do arquivo salvo
+            str: Caminho do arquivo (vazio se o quadro foi descartado)
         """
         if directory is None:
             directory = SCREENSHOTS_DIR
@@ -48,16 +55,13 @@ class ScreenshotHelper:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{prefix}_{timestamp}"
         
-        # Garantir extensão .png
-        if not filename.endswith('.png'):
-            filename = f"{filename}.png"
-        
+        # Extensão definida pelo formato (SCREENSHOT_FORMAT)
         filepath = directory / filename
+        if filepath.suffix.lower() in ('.png', '.jpg', '.jpeg', '.webp'):
+            filepath = filepath.with_suffix('')
         
-        # Capturar screenshot
-        driver.save_screenshot(str(filepath))
-        
-        return str(filepath)
+        # Capturar screenshot (codificação e gravação em segundo plano)
+        return screenshot_pipeline.capture(driver, filepath, clip=clip) or ""
     
     @staticmethod
     def capture_on_error(
@@ -97,6 +101,10 @@ class ScreenshotHelper:
         """
         Captura screenshot de uma etapa do teste.
         
+        Com SCREENSHOT_DEDUP, o quadro vai para o store por conteúdo
+        (``reports/screenshots/store``): duplicatas e quadros quase iguais
+        ao anterior não geram arquivo novo.
+        
         Args:
             driver: Instância do WebDriver
             test_name: Nome do teste
@@ -104,10 +112,15 @@ class ScreenshotHelper:
             step_name: Nome da etapa
             
         Returns:
-            str: Caminho do arquivo salvo
+            str: Caminho do arquivo salvo, ou ``teste/etapa`` no índice do store
         """
-        name = f"{test_name}_step{step_number:02d}"
+        step = f"step{step_number:02d}"
         if step_name:
-            name = f"{name}_{step_name}"
+            step = f"{step}_{step_name}"
+        
+        if settings.SCREENSHOT_DEDUP:
+            path = SCREENSHOTS_DIR / f"{test_name}_{step}"
+            stored = screenshot_pipeline.capture(driver, path, store_key=(test_name, step))
+            return f"{test_name}/{step}" if stored else ""
         
-        return ScreenshotHelper.capture(driver, name=name, prefix="step")
+        return ScreenshotHelper.capture(driver, name=f"{test_name}_{step}", prefix="step")
@@ -0,0 +1,263 @@
+"""
+Pipeline Assíncrono de Screenshots
+===================================
+
+O teste só espera o Chrome gerar a imagem (``Page.captureScreenshot``
+via CDP, em PNG, JPEG ou WebP, com qualidade e recorte opcionais); a
+decodificação do base64, a redução opcional com Pillow e a gravação em
+disco ficam com uma fila limitada atendida por threads em segundo plano.
+
+Com ``store_key`` (teste, etapa), o quadro vai para o ``screenshot_store``
+(deduplicação por conteúdo) em vez de um arquivo próprio.
+
+Quando a fila está cheia por mais de SCREENSHOT_QUEUE_TIMEOUT segundos o
+quadro é descartado (e contado) em vez de travar o teste. ``flush`` espera
+a fila esvaziar e ``report`` lista os quadros perdidos.
+"""
+
+import atexit
+import base64
+import io
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional (só para reduzir)
+    Image = None
+
+from ..config.settings import settings
+from .screenshot_store import screenshot_store
+
+
+class ScreenshotPipeline:
+    """Captura síncrona mínima e codificação/gravação em threads de fundo."""
+    
+    # Formato -> extensão do arquivo
+    EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+    
+    # Formato -> nome no Pillow
+    PIL_FORMATS = {'png': 'PNG', 'jpeg': 'JPEG', 'webp': 'WEBP'}
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._workers: List[threading.Thread] = []
+        self._atexit_registered = False
+        self._warned_no_pillow = False
+        self.reset_stats()
+    
+    def reset_stats(self) -> None:
+        """Zera os contadores do relatório."""
+        self.submitted = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.capture_ms = 0.0
+        self.dropped: List[str] = []
+        self.errors: List[Tuple[str, str]] = []
+    
+    def capture(
+        self,
+        driver,
+        path: Path,
+        fmt: str = None,
+        quality: int = None,
+        clip: Tuple[float, float, float, float] = None,
+        store_key: Tuple[str, str] = None
+    ) -> Optional[str]:
+        """
+        Captura a tela e agenda a gravação.
+        
+        Args:
+            driver: Instância do WebDriver
+            path: Arquivo de destino (a extensão é ajustada ao formato)
+            fmt: png, jpeg ou webp (padrão: SCREENSHOT_FORMAT)
+            quality: Qualidade 0-100 de JPEG/WebP (padrão: SCREENSHOT_QUALITY)
+            clip: Recorte (x, y, largura, altura) em pixels CSS
+            store_key: (teste, etapa) para gravar no ``screenshot_store``
+        
+        Returns:
+            str: Caminho que será gravado, ou None se o quadro foi descartado
+        """
+        fmt = (fmt or settings.SCREENSHOT_FORMAT).lower()
+        if fmt not in self.EXTENSIONS:
+            raise ValueError(f"Formato de screenshot desconhecido: {fmt} (use {tuple(self.EXTENSIONS)})")
+        
+        start = time.perf_counter()
+        data, fmt = self._grab(driver, fmt, quality, clip)
+        path = Path(path).with_suffix(self.EXTENSIONS[fmt])
+        
+        with self._lock:
+            self.submitted += 1
+            self.capture_ms += (time.perf_counter() - start) * 1000
+        
+        if not settings.SCREENSHOT_ASYNC:
+            self._process(path, data, fmt, store_key)
+            return str(path)
+        
+        try:
+            self._ensure_workers().put((path, data, fmt, store_key), timeout=settings.SCREENSHOT_QUEUE_TIMEOUT)
+        except queue.Full:
+            with self._lock:
+                self.dropped.append(path.name)
+            return None
+        return str(path)
+    
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Aguarda a gravação dos quadros pendentes.
+        
+        Args:
+            timeout: Limite em segundos (padrão: SCREENSHOT_FLUSH_TIMEOUT)
+        
+        Returns:
+            bool: True se a fila esvaziou dentro do prazo
+        """
+        if self._queue is None:
+            return True
+        
+        timeout = settings.SCREENSHOT_FLUSH_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Números da execução.
+        
+        Returns:
+            dict: submitted, written, pending, dropped, errors, bytes_written
+                  e capture_ms_avg (tempo que o teste esperou por quadro)
+        """
+        with self._lock:
+            pending = self._queue.unfinished_tasks if self._queue is not None else 0
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'pending': pending,
+                'dropped': len(self.dropped),
+                'errors': len(self.errors),
+                'bytes_written': self.bytes_written,
+                'capture_ms_avg': round(self.capture_ms / self.submitted, 1) if self.submitted else 0.0
+            }
+    
+    def report(self) -> None:
+        """Esvazia a fila, imprime o resumo e os quadros perdidos e zera os contadores."""
+        flushed = self.flush()
+        stats = self.summary()
+        if not stats['submitted']:
+            return
+        
+        print(f"\n📸 Screenshots: {stats['written']} gravado(s) de {stats['submitted']} "
+              f"({stats['bytes_written'] / 1024:.0f} KB), captura média {stats['capture_ms_avg']:g} ms")
+        if not flushed:
+            print(f"   ⚠️ {stats['pending']} ainda na fila após {settings.SCREENSHOT_FLUSH_TIMEOUT:g}s")
+        if self.dropped:
+            print(f"   ⚠️ {len(self.dropped)} descartado(s) com a fila cheia: {', '.join(self.dropped[:10])}"
+                  + (" ..." if len(self.dropped) > 10 else ""))
+        for name, error in self.errors[:10]:
+            print(f"   ❌ {name}: {error}")
+        screenshot_store.report()
+        
+        self.reset_stats()
+    
+    def _grab(self, driver, fmt: str, quality: Optional[int], clip) -> Tuple[str, str]:
+        """Base64 da tela via CDP; sem CDP, cai no PNG do WebDriver."""
+        params: Dict[str, Any] = {'format': fmt}
+        if fmt != 'png':
+            params['quality'] = settings.SCREENSHOT_QUALITY if quality is None else quality
+        if clip:
+            x, y, width, height = clip
+            params['clip'] = {'x': x, 'y': y, 'width': width, 'height': height, 'scale': 1}
+        
+        try:
+            return driver.execute_cdp_cmd("Page.captureScreenshot", params)['data'], fmt
+        except Exception:
+            return driver.get_screenshot_as_base64(), 'png'
+    
+    def _ensure_workers(self) -> queue.Queue:
+        """Cria a fila e as threads na primeira captura."""
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=max(1, settings.SCREENSHOT_QUEUE_SIZE))
+            
+            self._workers = [t for t in self._workers if t.is_alive()]
+            for index in range(len(self._workers), max(1, settings.SCREENSHOT_WORKERS)):
+                worker = threading.Thread(target=self._work, name=f"screenshot-{index}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+            
+            return self._queue
+    
+    def _work(self) -> None:
+        """Laço das threads de gravação."""
+        while True:
+            path, data, fmt, store_key = self._queue.get()
+            try:
+                self._process(path, data, fmt, store_key)
+            finally:
+                self._queue.task_done()
+    
+    def _process(self, path: Path, data: str, fmt: str, store_key: Tuple[str, str] = None) -> None:
+        """Decodifica, reduz (se configurado) e grava de forma atômica (ou no store)."""
+        try:
+            content = self._downscale(base64.b64decode(data), fmt)
+            if store_key:
+                size = screenshot_store.put(*store_key, content, ext=path.suffix)['bytes']
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(content)
+                os.replace(tmp, path)
+                size = len(content)
+        except Exception as e:
+            with self._lock:
+                self.errors.append((path.name, str(e)))
+            return
+        
+        with self._lock:
+            self.written += 1
+            self.bytes_written += size
+    
+    def _downscale(self, content: bytes, fmt: str) -> bytes:
+        """Reduz para SCREENSHOT_MAX_WIDTH mantendo a proporção (requer Pillow)."""
+        max_width = settings.SCREENSHOT_MAX_WIDTH
+        if max_width <= 0:
+            return content
+        
+        if Image is None:
+            if not self._warned_no_pillow:
+                self._warned_no_pillow = True
+                print("⚠️ SCREENSHOT_MAX_WIDTH requer Pillow; gravando no tamanho original")
+            return content
+        
+        with Image.open(io.BytesIO(content)) as image:
+            if image.width <= max_width:
+                return content
+            height = max(1, round(image.height * max_width / image.width))
+            resized = image.resize((max_width, height), Image.LANCZOS)
+        
+        if fmt == 'jpeg' and resized.mode not in ('RGB', 'L'):
+            resized = resized.convert('RGB')
+        
+        output = io.BytesIO()
+        options = {'optimize': True} if fmt == 'png' else {'quality': settings.SCREENSHOT_QUALITY}
+        resized.save(output, format=self.PIL_FORMATS[fmt], **options)
+        return output.getvalue()
+
+
+# Instância global do pipeline
+screenshot_pipeline = ScreenshotPipeline()
@@ -0,0 +1,453 @@
+"""
+Armazenamento de Screenshots por Conteúdo
+==========================================
+
+Os screenshots das etapas ficam em ``reports/screenshots/store`` endereçados
+pelo SHA-256 do conteúdo:
+
+- **duplicata exata**: o conteúdo já existe, só o índice ganha uma linha;
+- **quase igual** (opcional, SCREENSHOT_SIMILAR_DISTANCE >= 0): dHash a até
+  essa distância do quadro anterior do mesmo teste **e** no máximo
+  SCREENSHOT_SIMILAR_MAX_PIXELS pixels diferentes; vira referência ao quadro
+  anterior, sem gravar nada. O dHash sozinho (9x8) não enxerga uma mensagem
+  de erro nova ou a troca da cor de fundo, por isso a confirmação pixel a pixel;
+- **parecido** (até SCREENSHOT_DIFF_DISTANCE bits, PNG do mesmo tamanho):
+  diferença módulo 256 em relação ao quadro anterior, gravada em PNG (quase
+  tudo zero, comprime muito) e reconstruída sem perdas em ``restore``;
+- **diferente**: arquivo completo.
+
+O índice (``index.jsonl``) liga teste/etapa ao conteúdo e recebe uma linha
+por quadro (append, seguro entre workers do xdist). ``evict`` remove as
+entradas antigas ou além do limite de tamanho e os arquivos que ficaram
+sem referência. Sem Pillow, só as duplicatas exatas são evitadas.
+
+Uso:
+    python -m src.utils.screenshot_store stats
+    python -m src.utils.screenshot_store restore <teste> <etapa> saida.png
+    python -m src.utils.screenshot_store evict
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:  # Pillow é opcional (só para quase-duplicatas e diferenças)
+    Image = ImageChops = None
+
+from ..config.settings import settings
+
+
+class ScreenshotStore:
+    """Deduplica screenshots e guarda quadros parecidos como diferença."""
+    
+    # Tipos de entrada no índice
+    KINDS = ('blob', 'duplicate', 'similar', 'diff')
+    
+    # Quadros anteriores mantidos em memória (um por teste)
+    MAX_PREVIOUS = 8
+    
+    def __init__(self, directory: Path = None):
+        """
+        Inicializa o armazenamento.
+        
+        Args:
+            directory: Diretório do store (padrão: SCREENSHOT_STORE_DIR)
+        """
+        self._directory = Path(directory) if directory else None
+        self._lock = threading.Lock()
+        self._previous: 'OrderedDict[str, Tuple[str, int, Any]]' = OrderedDict()
+        self.stats = {kind: 0 for kind in self.KINDS}
+        self.bytes_saved = 0
+    
+    @property
+    def directory(self) -> Path:
+        """Diretório do store."""
+        return self._directory or settings.SCREENSHOT_STORE_DIR
+    
+    @property
+    def index_file(self) -> Path:
+        """Índice teste/etapa -> conteúdo (JSONL)."""
+        return self.directory / "index.jsonl"
+    
+    def put(self, test: str, step: str, content: bytes, ext: str = '.png') -> Dict[str, Any]:
+        """
+        Guarda um quadro.
+        
+        Args:
+            test: Nome do teste
+            step: Nome da etapa (ex.: ``step03_imovel``)
+            content: Imagem codificada
+            ext: Extensão do formato (.png, .jpg, .webp)
+        
+        Returns:
+            dict: Entrada gravada no índice (kind, sha, ref/base, phash, bytes)
+        """
+        sha = hashlib.sha256(content).hexdigest()
+        entry = {
+            'ts': round(time.time(), 3),
+            'test': test,
+            'step': step,
+            'sha': sha,
+            'ext': ext,
+            'size': len(content)
+        }
+        
+        image = self._open(content)
+        phash = self.dhash(image) if image is not None else None
+        if phash is not None:
+            entry['phash'] = f"{phash:016x}"
+        
+        with self._lock:
+            previous = self._previous.get(test)
+            distance = self._distance(previous[1], phash) if previous and phash is not None else None
+            
+            if self._find(sha, ext):
+                entry.update(kind='duplicate', bytes=0)
+            elif (distance is not None and distance <= settings.SCREENSHOT_SIMILAR_DISTANCE
+                    and self._changed_pixels(previous[2], image) <= settings.SCREENSHOT_SIMILAR_MAX_PIXELS):
+                entry.update(kind='similar', ref=previous[0], bytes=0)
+            else:
+                diff = None
+                if distance is not None and distance <= settings.SCREENSHOT_DIFF_DISTANCE and ext == '.png':
+                    diff = self._diff(previous[2], image)
+                
+                if diff is not None and len(diff) < len(content):
+                    self._write(self._diff_path(sha, previous[0]), diff)
+                    entry.update(kind='diff', base=previous[0], bytes=len(diff))
+                else:
+                    self._write(self._blob_path(sha, ext), content)
+                    entry.update(kind='blob', bytes=len(content))
+            
+            # "similar" não vira referência: a cadeia aponta sempre para um quadro gravado
+            if entry['kind'] != 'similar' and image is not None:
+                self._previous[test] = (sha, phash, image)
+                self._previous.move_to_end(test)
+                while len(self._previous) > self.MAX_PREVIOUS:
+                    self._previous.popitem(last=False)
+            
+            self.stats[entry['kind']] += 1
+            self.bytes_saved += len(content) - entry['bytes']
+            self._append(entry)
+        
+        return entry
+    
+    def forget(self, test: str) -> None:
+        """Descarta o quadro anterior do teste (o próximo não será comparado)."""
+        with self._lock:
+            self._previous.pop(test, None)
+    
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lê o índice em streaming.
+        
+        Yields:
+            dict: Entradas na ordem de gravação (linhas corrompidas são ignoradas)
+        """
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+    
+    def restore(self, sha: str, ext: str = '.png') -> bytes:
+        """
+        Reconstrói o conteúdo de um quadro.
+        
+        Args:
+            sha: SHA-256 do quadro
+            ext: Extensão do formato
+        
+        Returns:
+            bytes: Imagem (diferenças voltam como PNG, sem perdas)
+        
+        Raises:
+            FileNotFoundError: Se o quadro (ou a base de uma diferença) foi removido
+        """
+        blob = self._blob_path(sha, ext)
+        if blob.exists():
+            return blob.read_bytes()
+        
+        diff = self._find_diff(sha)
+        if diff is None or Image is None:
+            raise FileNotFoundError(f"Screenshot {sha[:12]} não está no store")
+        
+        base_sha = diff.stem.split('_', 1)[1]
+        with Image.open(io.BytesIO(self.restore(base_sha))) as base, Image.open(diff) as delta:
+            image = ImageChops.add_modulo(base.convert(delta.mode), delta)
+        
+        output = io.BytesIO()
+        image.save(output, format='PNG')
+        return output.getvalue()
+    
+    def lookup(self, test: str, step: str) -> Optional[Dict[str, Any]]:
+        """
+        Última entrada de um teste/etapa, com referências resolvidas.
+        
+        Args:
+            test: Nome do teste
+            step: Nome da etapa
+        
+        Returns:
+            dict: Entrada do índice (``sha`` aponta para o conteúdo gravado), ou None
+        """
+        found = None
+        for entry in self.entries():
+            if entry.get('test') == test and entry.get('step') == step:
+                found = entry
+        if found and found.get('kind') == 'similar':
+            found = dict(found, sha=found['ref'])
+        return found
+    
+    def evict(self, max_age_days: float = None, max_mb: float = None) -> Dict[str, int]:
+        """
+        Remove entradas antigas ou além do limite e os arquivos sem referência.
+        
+        Primeiro saem as entradas com mais de ``max_age_days``; depois, as
+        mais antigas, até os arquivos caberem em ``max_mb``. Uma base usada
+        por uma diferença que ficou só é removida junto com ela.
+        
+        Args:
+            max_age_days: Idade máxima (padrão: SCREENSHOT_STORE_MAX_AGE_DAYS, 0 = sem limite)
+            max_mb: Tamanho máximo (padrão: SCREENSHOT_STORE_MAX_MB, 0 = sem limite)
+        
+        Returns:
+            dict: entries_removed, files_removed, bytes_freed, bytes_kept
+        """
+        max_age_days = settings.SCREENSHOT_STORE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        max_mb = settings.SCREENSHOT_STORE_MAX_MB if max_mb is None else max_mb
+        
+        with self._lock:
+            entries = list(self.entries())
+            total = len(entries)
+            if max_age_days > 0:
+                cutoff = time.time() - max_age_days * 86400
+                entries = [e for e in entries if e.get('ts', 0) >= cutoff]
+            
+            files = {p.name: p for p in self._files()}
+            sizes = {name: p.stat().st_size for name, p in files.items()}
+            
+            keep = self._referenced(entries, files)
+            if max_mb > 0:
+                limit = max_mb * 1024 * 1024
+                while entries and sum(sizes[n] for n in keep) > limit:
+                    entries.pop(0)
+                    keep = self._referenced(entries, files)
+            
+            freed = 0
+            removed = 0
+            for name, path in files.items():
+                if name not in keep:
+                    freed += sizes[name]
+                    removed += 1
+                    path.unlink(missing_ok=True)
+            
+            if self.index_file.exists():
+                self._rewrite(entries)
+            self._previous.clear()
+        
+        result = {
+            'entries_removed': total - len(entries),
+            'files_removed': removed,
+            'bytes_freed': freed,
+            'bytes_kept': sum(sizes[n] for n in keep)
+        }
+        if removed or result['entries_removed']:
+            print(f"🧹 Screenshots: {result['entries_removed']} entrada(s) e {removed} arquivo(s) "
+                  f"removidos ({freed / 1024 / 1024:.1f} MB liberados)")
+        return result
+    
+    def report(self) -> None:
+        """Imprime quantos quadros foram deduplicados nesta execução e zera os contadores."""
+        total = sum(self.stats.values())
+        if not total:
+            return
+        
+        print(f"🗂️ Store de screenshots: {total} quadro(s) | {self.stats['blob']} completos, "
+              f"{self.stats['diff']} diferenças, {self.stats['similar']} quase iguais, "
+              f"{self.stats['duplicate']} duplicatas ({self.bytes_saved / 1024:.0f} KB economizados)")
+        self.stats = {kind: 0 for kind in self.KINDS}
+        self.bytes_saved = 0
+    
+    @staticmethod
+    def dhash(image) -> int:
+        """
+        Hash perceptual (dHash 64 bits): gradiente horizontal da imagem em 9x8 tons de cinza.
+        
+        Args:
+            image: Imagem do Pillow
+        
+        Returns:
+            int: Hash de 64 bits
+        """
+        small = image.convert('L').resize((9, 8), Image.BILINEAR)
+        pixels = small.tobytes()
+        value = 0
+        for row in range(8):
+            for col in range(8):
+                value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+        return value
+    
+    @staticmethod
+    def _distance(a: int, b: int) -> int:
+        """Distância de Hamming entre dois hashes."""
+        return bin(a ^ b).count('1')
+    
+    @staticmethod
+    def _open(content: bytes):
+        """Decodifica a imagem (None sem Pillow ou se o conteúdo for inválido)."""
+        if Image is None:
+            return None
+        try:
+            image = Image.open(io.BytesIO(content))
+            image.load()
+            return image
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _changed_pixels(previous, image) -> float:
+        """Quantos pixels diferem entre os quadros (infinito se os tamanhos diferirem)."""
+        if previous is None or previous.size != image.size:
+            return float('inf')
+        mode = 'RGBA' if 'A' in image.mode else 'RGB'
+        delta = ImageChops.difference(image.convert(mode), previous.convert(mode))
+        # Um pixel mudou se qualquer canal mudou: o máximo dos canais é > 0
+        changed = delta.getchannel(0)
+        for band in range(1, len(delta.getbands())):
+            changed = ImageChops.lighter(changed, delta.getchannel(band))
+        return image.size[0] * image.size[1] - changed.histogram()[0]
+    
+    @staticmethod
+    def _diff(previous, image) -> Optional[bytes]:
+        """PNG de (atual - anterior) módulo 256; None se os tamanhos diferirem."""
+        if previous is None or previous.size != image.size:
+            return None
+        mode = 'RGBA' if 'A' in image.mode else 'RGB'
+        delta = ImageChops.subtract_modulo(image.convert(mode), previous.convert(mode))
+        output = io.BytesIO()
+        delta.save(output, format='PNG', optimize=True)
+        return output.getvalue()
+    
+    def _blob_path(self, sha: str, ext: str) -> Path:
+        return self.directory / "blobs" / sha[:2] / f"{sha}{ext}"
+    
+    def _diff_path(self, sha: str, base: str) -> Path:
+        return self.directory / "diffs" / sha[:2] / f"{sha}_{base}.png"
+    
+    def _find_diff(self, sha: str) -> Optional[Path]:
+        folder = self.directory / "diffs" / sha[:2]
+        return next(folder.glob(f"{sha}_*.png"), None) if folder.exists() else None
+    
+    def _find(self, sha: str, ext: str) -> bool:
+        """O conteúdo já está gravado (completo ou como diferença)?"""
+        return self._blob_path(sha, ext).exists() or self._find_diff(sha) is not None
+    
+    def _files(self) -> List[Path]:
+        return [
+            p for folder in ("blobs", "diffs") if (self.directory / folder).exists()
+            for p in (self.directory / folder).rglob("*") if p.is_file()
+        ]
+    
+    @staticmethod
+    def _referenced(entries: List[Dict[str, Any]], files: Dict[str, Path]) -> Set[str]:
+        """Arquivos usados pelas entradas, incluindo as bases das diferenças."""
+        by_sha: Dict[str, List[str]] = {}
+        for name in files:
+            by_sha.setdefault(name.split('.', 1)[0].split('_', 1)[0], []).append(name)
+        
+        pending = [e.get('ref') or e.get('sha') for e in entries]
+        keep: Set[str] = set()
+        seen: Set[str] = set()
+        while pending:
+            sha = pending.pop()
+            if not sha or sha in seen:
+                continue
+            seen.add(sha)
+            for name in by_sha.get(sha, ()):
+                keep.add(name)
+                if '_' in name:
+                    pending.append(name.split('.', 1)[0].split('_', 1)[1])
+        return keep
+    
+    @staticmethod
+    def _write(path: Path, content: bytes) -> None:
+        """Gravação atômica (outro worker pode gravar o mesmo conteúdo)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Uma linha no índice (append é atômico para linhas curtas)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    
+    def _rewrite(self, entries: List[Dict[str, Any]]) -> None:
+        """Regrava o índice com as entradas mantidas."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.index_file)
+
+
+# Instância global do store
+screenshot_store = ScreenshotStore()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(description="Store de screenshots deduplicados")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="Resumo do índice")
+    restore = sub.add_parser('restore', help="Reconstrói o quadro de um teste/etapa")
+    restore.add_argument('test')
+    restore.add_argument('step')
+    restore.add_argument('output')
+    evict = sub.add_parser('evict', help="Remove entradas antigas/excedentes")
+    evict.add_argument('--max-age-days', type=float, default=None)
+    evict.add_argument('--max-mb', type=float, default=None)
+    args = parser.parse_args(argv)
+    
+    if args.command == 'restore':
+        entry = screenshot_store.lookup(args.test, args.step)
+        if not entry:
+            print(f"❌ {args.test}/{args.step} não está no índice")
+            return 1
+        Path(args.output).write_bytes(screenshot_store.restore(entry['sha'], entry.get('ext', '.png')))
+        print(f"✅ {args.output} ({entry['kind']}, {datetime.fromtimestamp(entry['ts']):%Y-%m-%d %H:%M:%S})")
+        return 0
+    
+    if args.command == 'evict':
+        print(json.dumps(screenshot_store.evict(args.max_age_days, args.max_mb), indent=2))
+        return 0
+    
+    kinds = {kind: 0 for kind in ScreenshotStore.KINDS}
+    tests = set()
+    for entry in screenshot_store.entries():
+        kinds[entry.get('kind', 'blob')] += 1
+        tests.add(entry.get('test'))
+    size = sum(p.stat().st_size for p in screenshot_store._files())
+    print(json.dumps({'tests': len(tests), 'entries': kinds, 'mb': round(size / 1024 / 1024, 2)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+Instrumentação de Tempo por Etapa
+==================================
+
+Mede com relógio monotônico cada ação dos Page Objects (clique, espera,
+preenchimento, validação), cada espera do WaitHelper e cada comando do
+WebDriver, e separa o tempo em:
+
+- **espera pela aplicação**: dentro das esperas (inclusive os comandos
+  de polling feitos por elas);
+- **overhead do WebDriver**: comandos fora das esperas (find, click,
+  execute_script...);
+- **pausa fixa**: ``time.sleep`` sem condição (WAIT_STRATEGY=fixed,
+  ``fixed_delay``, ``wait_seconds``);
+- **outros**: Python dos testes/Page Objects.
+
+Ao fim de cada execução grava um arquivo no formato Chrome Trace Event
+(``reports/traces/*.json``), que pode ser aberto no ``chrome://tracing``
+ou no Perfetto para encontrar as etapas lentas.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..config.settings import settings, REPORTS_DIR
+from .json_serializer import json_serializer
+
+
+class StepTimer:
+    """Acumula spans aninhados por thread e exporta o trace da execução."""
+    
+    # Rótulos das parcelas no relatório
+    BUCKETS = {
+        'wait': 'Espera pela aplicação',
+        'webdriver': 'Overhead do WebDriver',
+        'sleep': 'Pausa fixa',
+        'other': 'Outros (Python)'
+    }
+    
+    # Prefixo do método -> tipo de ação do Page Object
+    ACTION_KINDS = (
+        ('click', 'click'),
+        ('wait', 'wait'),
+        ('is_', 'wait'),
+        ('wizard_is', 'wait'),
+        ('fill', 'fill'),
+        ('select', 'fill'),
+        ('validar', 'validate'),
+        ('validate', 'validate'),
+        ('snapshot', 'validate'),
+    )
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._origin = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.commands = 0
+        self.totals = {bucket: 0.0 for bucket in self.BUCKETS}
+        self.actions: Dict[str, List[float]] = {}
+        self.threads: Dict[int, str] = {}
+    
+    @staticmethod
+    def enabled() -> bool:
+        """Indica se a instrumentação está ativa (TIMING_ENABLED)."""
+        return settings.TIMING_ENABLED
+    
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[None]:
+        """
+        Mede um trecho de código.
+        
+        Args:
+            name: Nome exibido no trace (ex.: "ImovelStep.click_salvar")
+            category: action, wait, webdriver, sleep ou test
+            **args: Dados extras gravados no evento
+        """
+        if not settings.TIMING_ENABLED:
+            yield
+            return
+        
+        stack = self._stack()
+        in_wait = bool(stack) and stack[-1]['in_wait']
+        frame = {
+            'in_wait': in_wait or category == 'wait',
+            'children': 0.0,
+            'start': time.perf_counter()
+        }
+        stack.append(frame)
+        
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            duration = end - frame['start']
+            if stack:
+                stack[-1]['children'] += duration
+            self._record(name, category, frame['start'], duration,
+                         duration - frame['children'], in_wait, args)
+    
+    def timed(self, category: str, name: str = None) -> Callable:
+        """
+        Decorator que mede cada chamada da função.
+        
+        Args:
+            category: Categoria do span
+            name: Nome do span (padrão: nome qualificado da função)
+        """
+        def decorator(func: Callable) -> Callable:
+            label = name or func.__qualname__
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not settings.TIMING_ENABLED:
+                    return func(*args, **kwargs)
+                with self.span(label, category, **self._action_args(category, func.__name__)):
+                    return func(*args, **kwargs)
+            
+            return wrapper
+        
+        return decorator
+    
+    def sleep(self, seconds: float) -> None:
+        """
+        ``time.sleep`` contabilizado como pausa fixa.
+        
+        Args:
+            seconds: Segundos de pausa
+        """
+        with self.span(f"sleep({seconds:g}s)", 'sleep'):
+            time.sleep(seconds)
+    
+    def record_transition(self, ms: float) -> None:
+        """
+        Guarda a duração da última transição de etapa da thread atual.
+        
+        Independe de TIMING_ENABLED: é lida pelo gerador de carga com
+        ``pop_transition``.
+        
+        Args:
+            ms: Milissegundos do clique até a nova etapa visível e estável
+        """
+        self._local.transition_ms = ms
+    
+    def pop_transition(self) -> Optional[float]:
+        """
+        Retorna e descarta a duração da última transição da thread atual.
+        
+        Returns:
+            float: Milissegundos, ou None se não houve transição desde a última leitura
+        """
+        ms = getattr(self._local, 'transition_ms', None)
+        self._local.transition_ms = None
+        return ms
+    
+    def instrument_driver(self, driver) -> None:
+        """
+        Mede todos os comandos enviados ao WebDriver (inclusive os de WebElement).
+        
+        O total de comandos do navegador fica em ``driver._e2e_commands``
+        (contado mesmo com TIMING_ENABLED=false).
+        
+        Args:
+            driver: Instância do WebDriver
+        """
+        if getattr(driver, '_e2e_timed', False):
+            return
+        
+        execute = driver.execute
+        driver._e2e_commands = 0
+        
+        def timed_execute(driver_command, params=None):
+            driver._e2e_commands += 1
+            if not settings.TIMING_ENABLED:
+                return execute(driver_command, params)
+            with self.span(driver_command, 'webdriver'):
+                return execute(driver_command, params)
+        
+        driver.execute = timed_execute
+        driver._e2e_timed = True
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resumo da execução.
+        
+        Returns:
+            dict: total_s, parcelas (segundos por parcela), commands,
+                  events, dropped e slowest (ações mais lentas)
+        """
+        with self._lock:
+            totals = dict(self.totals)
+            actions = {name: list(times) for name, times in self.actions.items()}
+            commands, events, dropped = self.commands, len(self.events), self.dropped
+        
+        slowest = sorted(
+            ({'name': name, 'count': len(times), 'total_s': round(sum(times), 3),
+              'max_s': round(max(times), 3)} for name, times in actions.items()),
+            key=lambda a: a['total_s'], reverse=True
+        )[:10]
+        
+        return {
+            'total_s': round(sum(totals.values()), 3),
+            'parcelas': {bucket: round(value, 3) for bucket, value in totals.items()},
+            'commands': commands,
+            'events': events,
+            'dropped': dropped,
+            'slowest': slowest
+        }
+    
+    def write_trace(self, name: str = "run", output_dir: Path = None) -> Optional[Path]:
+        """
+        Grava os eventos no formato Chrome Trace Event.
+        
+        Args:
+            name: Nome da execução (entra no nome do arquivo)
+            output_dir: Diretório de saída (padrão: reports/traces)
+        
+        Returns:
+            Path: Arquivo gravado, ou None se não houver eventos
+        """
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        
+        if not events:
+            return None
+        
+        pid = os.getpid()
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread}}
+            for tid, thread in threads.items()
+        ]
+        metadata.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': name}})
+        
+        output_dir = Path(output_dir) if output_dir else REPORTS_DIR / "traces"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in name).strip('_') or "run"
+        worker = os.environ.get('PYTEST_XDIST_WORKER', str(pid))
+        filepath = output_dir / f"trace_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{worker}.json"
+        
+        json_serializer.write({
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': self.summary()
+        }, filepath, pretty=False)
+        
+        return filepath
+    
+    def report(self, name: str = "run") -> Dict[str, Any]:
+        """
+        Imprime a divisão do tempo, grava o trace e zera os dados.
+        
+        Args:
+            name: Nome da execução
+        
+        Returns:
+            dict: Resumo (ver ``summary``) com ``trace`` (caminho ou None)
+        """
+        summary = self.summary()
+        summary['trace'] = self.write_trace(name)
+        
+        if summary['total_s'] > 0:
+            print(f"\n⏱️  Tempo instrumentado: {summary['total_s']:.2f}s "
+                  f"({summary['commands']} comandos WebDriver)")
+            for bucket, label in self.BUCKETS.items():
+                value = summary['parcelas'][bucket]
+                print(f"   - {label}: {value:.2f}s ({value / summary['total_s'] * 100:.0f}%)")
+            
+            if summary['slowest']:
+                print("   🐢 Ações mais lentas:")
+                for action in summary['slowest'][:5]:
+                    print(f"      {action['name']}: {action['total_s']:.2f}s "
+                          f"em {action['count']}x (máx {action['max_s']:.2f}s)")
+            
+            if summary['dropped']:
+                print(f"   ⚠️ {summary['dropped']} evento(s) fora do trace (TIMING_MAX_EVENTS)")
+            if summary['trace']:
+                print(f"   💾 Trace: {summary['trace']}")
+        
+        self.clear()
+        return summary
+    
+    def clear(self) -> None:
+        """Descarta os eventos e totais acumulados."""
+        with self._lock:
+            self._reset()
+    
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _record(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration: float,
+        self_time: float,
+        in_wait: bool,
+        args: Dict[str, Any]
+    ) -> None:
+        """Acumula o tempo próprio do span na parcela certa e guarda o evento."""
+        if category == 'sleep':
+            bucket = 'sleep'
+        elif category == 'wait' or in_wait:
+            bucket = 'wait'
+        elif category == 'webdriver':
+            bucket = 'webdriver'
+        else:
+            bucket = 'other'
+        
+        thread = threading.current_thread()
+        
+        with self._lock:
+            self.totals[bucket] += self_time
+            if category == 'webdriver':
+                self.commands += 1
+            elif category == 'action':
+                self.actions.setdefault(name, []).append(duration)
+            
+            if len(self.events) >= settings.TIMING_MAX_EVENTS:
+                self.dropped += 1
+                return
+            
+            self.threads.setdefault(thread.ident, thread.name)
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round(duration * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': thread.ident
+            }
+            if args:
+                event['args'] = args
+            self.events.append(event)
+    
+    def _action_args(self, category: str, method: str) -> Dict[str, str]:
+        """Tipo da ação (click, wait, fill, validate) a partir do nome do método."""
+        if category != 'action':
+            return {}
+        for prefix, kind in self.ACTION_KINDS:
+            if method.startswith(prefix):
+                return {'kind': kind}
+        return {'kind': 'other'}
+
+
+# Instância global (uma por processo / worker xdist)
+step_timer = StepTimer()
+
+
+def timed_class(category: str = 'action', prefix: str = '') -> Callable:
+    """
+    Decorator de classe que mede os métodos públicos (inclusive staticmethods).
+    
+    Args:
+        category: Categoria dos spans
+        prefix: Só instrumenta métodos cujo nome começa com este prefixo
+    
+    Returns:
+        Callable: Decorator que devolve a própria classe
+    """
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or not attr.startswith(prefix):
+                continue
+            
+            name = f"{cls.__name__}.{attr}"
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(step_timer.timed(category, name)(value.__func__)))
+            elif callable(value) and not isinstance(value, (type, classmethod)):
+                setattr(cls, attr, step_timer.timed(category, name)(value))
+        
+        return cls
+    
+    return decorator
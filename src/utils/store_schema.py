@@ -0,0 +1,510 @@
+"""
+Schemas do Store por Tipo de Imóvel
+====================================
+
+Descreve de forma declarativa o ``empreendimento-storage`` esperado ao fim
+do wizard para cada tipo de imóvel (RURAL, URBANO, LINEAR): um schema base
+comum e, por tipo, o que muda nos dados do imóvel. As palavras-chave são um
+subconjunto do JSON Schema (type, enum, required, recommended, properties,
+additionalProperties, items, minItems, minLength, pattern, minimum, maximum,
+allOf e anyOf); ``required`` e ``recommended`` exigem o campo presente e não
+vazio (ERRO e AVISO, como no ``DataValidator``).
+
+O imóvel, os dados gerais e as atividades aparecem com nomes diferentes
+conforme a versão do frontend (``property``/``selectedProperty``,
+``dados_gerais``/``enterprise``, ``activities``/``selectedActivities``):
+basta uma das alternativas de cada grupo (``anyOf``). O tipo e os dados do
+formulário do imóvel (``tipoImovel``, ``dados_imovel``) são só recomendados.
+
+Cada schema é compilado uma única vez em funções aninhadas (sem interpretar
+o dicionário a cada store), o que permite validar em lote milhares de stores
+do arquivo de execuções em poucos segundos. Toda violação sai com o caminho
+(JSON Pointer, ex.: ``/state/dados_imovel/car``).
+
+Uso:
+    python -m src.utils.store_schema                      # todo o arquivo de execuções
+    python -m src.utils.store_schema --tipo RURAL --date 2026-10
+    python -m src.utils.store_schema --file output/empreendimento.json
+    python -m src.utils.store_schema --schema URBANO      # mostra o schema
+"""
+
+import argparse
+import copy
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .json_serializer import json_serializer
+from .run_archive import RunArchive, run_archive
+
+# Valor, caminho, lista de violações
+Validator = Callable[[Any, str, List[Dict[str, Any]]], None]
+
+
+class StoreValidator:
+    """Valida stores contra schemas declarativos compilados por tipo de imóvel."""
+    
+    TIPOS = ('RURAL', 'URBANO', 'LINEAR')
+    
+    KEYWORDS = {
+        'type', 'enum', 'required', 'recommended', 'properties', 'additionalProperties',
+        'items', 'minItems', 'minLength', 'pattern', 'minimum', 'maximum', 'description',
+        'allOf', 'anyOf'
+    }
+    
+    # "numeric" aceita números e strings numéricas (campos de formulário)
+    TYPES = {
+        'object': lambda v: isinstance(v, dict),
+        'array': lambda v: isinstance(v, list),
+        'string': lambda v: isinstance(v, str),
+        'boolean': lambda v: isinstance(v, bool),
+        'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+        'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+        'numeric': lambda v: StoreValidator._number(v) is not None,
+        'null': lambda v: v is None,
+    }
+    
+    # Partes do store reaproveitadas pelas alternativas de nome
+    _PROPERTY = {
+        'type': 'object',
+        'recommended': ['id'],
+        'properties': {'id': {'type': ['integer', 'string']}},
+    }
+    _DADOS_GERAIS = {
+        'type': 'object',
+        'recommended': ['nome', 'situacao', 'empregados', 'descricao'],
+        'properties': {
+            'nome': {'type': 'string', 'minLength': 3},
+            'situacao': {'enum': ['PLANEJAMENTO', 'INSTALACAO', 'OPERACAO']},
+            'empregados': {'type': 'numeric', 'minimum': 0},
+        },
+    }
+    _ACTIVITIES = {
+        'type': 'array',
+        'minItems': 1,
+        'items': {
+            'type': 'object',
+            'required': ['code'],
+            'recommended': ['name', 'quantity', 'unit'],
+            'properties': {'quantity': {'type': 'numeric', 'minimum': 0}},
+        },
+    }
+    _PONTO = {
+        'type': 'object',
+        'required': ['municipio', 'uf'],
+        'properties': {
+            'municipio': {'type': 'string', 'minLength': 2},
+            'uf': {'type': 'string', 'pattern': r'^[A-Z]{2}$'},
+        },
+    }
+    
+    # Store completo (Zustand persist) comum a todos os tipos
+    BASE_SCHEMA = {
+        'type': 'object',
+        'required': ['state'],
+        'properties': {
+            'state': {
+                'type': 'object',
+                'allOf': [
+                    {'anyOf': [{'required': ['property']}, {'required': ['selectedProperty']},
+                               {'required': ['propertyId']}]},
+                    {'anyOf': [{'required': ['dados_gerais']}, {'required': ['enterprise']}]},
+                    {'anyOf': [{'required': ['activities']}, {'required': ['selectedActivities']}]},
+                ],
+                'recommended': ['tipoImovel', 'dados_imovel', 'participes', 'characterization', 'enterpriseId'],
+                'properties': {
+                    'tipoImovel': {'enum': list(TIPOS)},
+                    'dados_imovel': {
+                        'type': 'object',
+                        'required': ['nome'],
+                        'recommended': ['lat', 'long'],
+                        'properties': {
+                            'nome': {'type': 'string', 'minLength': 3},
+                            'municipio': {'type': 'string', 'minLength': 2},
+                            'uf': {'type': 'string', 'pattern': r'^[A-Z]{2}$'},
+                            'lat': {'type': 'numeric', 'minimum': -90, 'maximum': 90},
+                            'long': {'type': 'numeric', 'minimum': -180, 'maximum': 180},
+                        },
+                    },
+                    'property': _PROPERTY,
+                    'selectedProperty': _PROPERTY,
+                    'propertyId': {'type': ['integer', 'string']},
+                    'dados_gerais': _DADOS_GERAIS,
+                    'enterprise': _DADOS_GERAIS,
+                    'participes': {
+                        'type': 'array',
+                        'items': {'type': 'object', 'required': ['nome', 'papel']},
+                    },
+                    'activities': _ACTIVITIES,
+                    'selectedActivities': _ACTIVITIES,
+                    'characterization': {
+                        'type': 'object',
+                        'recommended': ['answers'],
+                        'properties': {
+                            'answers': {'type': 'object', 'additionalProperties': {'enum': ['SIM', 'NAO']}},
+                        },
+                    },
+                    'enterpriseId': {'type': ['integer', 'string']},
+                },
+            },
+        },
+    }
+    
+    # Tipo -> acréscimos ao schema de state.dados_imovel
+    TIPO_SCHEMAS = {
+        'RURAL': {
+            'required': ['municipio', 'uf', 'car'],
+            'properties': {'car': {'type': 'string', 'pattern': r'^[A-Z]{2}-\d{7}-'}},
+        },
+        'URBANO': {
+            'required': ['municipio', 'uf', 'cep'],
+            'properties': {'cep': {'type': 'string', 'pattern': r'^\d{5}-?\d{3}$'}},
+        },
+        # Linear: pontos de início e fim, em campos soltos ou agrupados
+        'LINEAR': {
+            'recommended': ['extensao'],
+            'allOf': [
+                {'anyOf': [
+                    {'required': ['municipio_inicio', 'uf_inicio', 'municipio_final', 'uf_final']},
+                    {'required': ['pontoInicio', 'pontoFinal']},
+                ]},
+            ],
+            'properties': {
+                'municipio_inicio': {'type': 'string', 'minLength': 2},
+                'uf_inicio': {'type': 'string', 'pattern': r'^[A-Z]{2}$'},
+                'municipio_final': {'type': 'string', 'minLength': 2},
+                'uf_final': {'type': 'string', 'pattern': r'^[A-Z]{2}$'},
+                'pontoInicio': _PONTO,
+                'pontoFinal': _PONTO,
+                'extensao': {'type': 'numeric', 'minimum': 0},
+            },
+        },
+    }
+    
+    def __init__(self):
+        self._compiled: Dict[Optional[str], Validator] = {}
+    
+    @classmethod
+    def schema_for(cls, tipo: Optional[str]) -> Dict[str, Any]:
+        """
+        Schema completo de um tipo de imóvel.
+        
+        Args:
+            tipo: RURAL, URBANO ou LINEAR (None: só a parte comum)
+        
+        Returns:
+            dict: Schema (cópia, pode ser alterada)
+        """
+        schema = copy.deepcopy(cls.BASE_SCHEMA)
+        if tipo is None:
+            return schema
+        
+        state = schema['properties']['state']['properties']
+        state['tipoImovel'] = {'enum': [tipo]}
+        imovel = state['dados_imovel']
+        extra = cls.TIPO_SCHEMAS[tipo]
+        for key in ('required', 'recommended', 'allOf'):
+            imovel[key] = imovel.get(key, []) + copy.deepcopy(extra.get(key, []))
+        imovel['properties'].update(copy.deepcopy(extra.get('properties', {})))
+        return schema
+    
+    def validator(self, tipo: Optional[str]) -> Validator:
+        """Validador compilado do tipo (compilado na primeira chamada)."""
+        tipo = tipo if tipo in self.TIPOS else None
+        compiled = self._compiled.get(tipo)
+        if compiled is None:
+            compiled = self._compiled[tipo] = self.compile(self.schema_for(tipo))
+        return compiled
+    
+    def validate(self, data: Any, tipo: str = None) -> List[Dict[str, Any]]:
+        """
+        Valida um store.
+        
+        Args:
+            data: Store (como sai do ``JSONCollector`` ou do arquivo de execuções)
+            tipo: Tipo de imóvel (padrão: ``state.tipoImovel`` do próprio store)
+        
+        Returns:
+            list: Violações (caminho, status ERRO/AVISO, mensagem, obtido); vazia se válido
+        """
+        tipo = str(tipo or RunArchive.metadata(data)['tipo'] or '').upper() or None
+        violacoes: List[Dict[str, Any]] = []
+        self.validator(tipo)(data, '', violacoes)
+        return violacoes
+    
+    def validate_many(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Valida vários stores em sequência, com resumo.
+        
+        Args:
+            records: Registros com ``data`` (store), ``run_id`` e ``tipo``
+                     opcionais, como os de ``run_archive.records()``
+        
+        Returns:
+            dict: total, validos, invalidos, avisos, duracao_s, por_segundo,
+                  por_caminho (violações por caminho, sem índices de lista)
+                  e relatorios (só os stores com violações)
+        """
+        start = time.perf_counter()
+        total = validos = 0
+        avisos = 0
+        por_caminho: Counter = Counter()
+        relatorios = []
+        
+        for record in records:
+            total += 1
+            violacoes = self.validate(record.get('data'), record.get('tipo'))
+            erros = sum(1 for v in violacoes if v['status'] == 'ERRO')
+            if not erros:
+                validos += 1
+            avisos += len(violacoes) - erros
+            if violacoes:
+                for v in violacoes:
+                    por_caminho[re.sub(r'/\d+(?=/|$)', '/*', v['caminho'])] += 1
+                relatorios.append({
+                    'run_id': record.get('run_id'),
+                    'tipo': record.get('tipo'),
+                    'valido': not erros,
+                    'violacoes': violacoes
+                })
+        
+        duracao = time.perf_counter() - start
+        resumo = {
+            'total': total,
+            'validos': validos,
+            'invalidos': total - validos,
+            'avisos': avisos,
+            'duracao_s': round(duracao, 3),
+            'por_segundo': round(total / duracao, 1) if duracao else 0.0,
+            'por_caminho': dict(por_caminho.most_common()),
+            'relatorios': relatorios,
+        }
+        
+        print(f"📋 Validação de schema: {total} store(s) em {resumo['duracao_s']}s "
+              f"({resumo['por_segundo']}/s) - ✓ {validos} ✗ {resumo['invalidos']}, {avisos} aviso(s)")
+        return resumo
+    
+    def validate_archive(self, **filters) -> Dict[str, Any]:
+        """
+        Valida os stores do arquivo de execuções (em streaming).
+        
+        Args:
+            **filters: Filtros de ``run_archive.find`` (date, tipo, enterprise_id, ...)
+        
+        Returns:
+            dict: Resumo no formato de ``validate_many``
+        """
+        return self.validate_many(run_archive.records(**filters))
+    
+    def compile(self, schema: Dict[str, Any]) -> Validator:
+        """
+        Compila um schema em uma função ``(valor, caminho, violacoes)``.
+        
+        Args:
+            schema: Schema declarativo
+        
+        Returns:
+            Validator: Função que acrescenta as violações encontradas à lista
+        
+        Raises:
+            ValueError: Palavra-chave ou tipo desconhecido no schema
+        """
+        unknown = set(schema) - self.KEYWORDS
+        if unknown:
+            raise ValueError(f"Palavra-chave de schema desconhecida: {', '.join(sorted(unknown))}")
+        
+        type_check = None
+        if 'type' in schema:
+            names = [schema['type']] if isinstance(schema['type'], str) else list(schema['type'])
+            missing = [n for n in names if n not in self.TYPES]
+            if missing:
+                raise ValueError(f"Tipo de schema desconhecido: {', '.join(missing)}")
+            preds = [self.TYPES[n] for n in names]
+            type_check = preds[0] if len(preds) == 1 else (lambda v: any(p(v) for p in preds))
+            type_message = f"Tipo esperado: {' ou '.join(names)}"
+        
+        checks: List[Validator] = []
+        entry = self._entry
+        
+        if 'enum' in schema:
+            allowed = list(schema['enum'])
+            enum_message = f"Valor fora de {allowed}"
+            
+            def check_enum(value, path, out):
+                if value not in allowed:
+                    out.append(entry(path, 'ERRO', enum_message, value))
+            checks.append(check_enum)
+        
+        if 'minLength' in schema or 'pattern' in schema:
+            min_length = schema.get('minLength', 0)
+            regex = re.compile(schema['pattern']) if 'pattern' in schema else None
+            
+            def check_string(value, path, out):
+                if not isinstance(value, str):
+                    return
+                if len(value.strip()) < min_length:
+                    out.append(entry(path, 'ERRO', f"Mínimo de {min_length} caractere(s)", value))
+                elif regex is not None and not regex.search(value):
+                    out.append(entry(path, 'ERRO', f"Formato inválido ({regex.pattern})", value))
+            checks.append(check_string)
+        
+        if 'minimum' in schema or 'maximum' in schema:
+            minimum = schema.get('minimum', float('-inf'))
+            maximum = schema.get('maximum', float('inf'))
+            number = self._number
+            
+            def check_range(value, path, out):
+                n = number(value)
+                if n is not None and not minimum <= n <= maximum:
+                    out.append(entry(path, 'ERRO', f"Fora do intervalo [{minimum:g}, {maximum:g}]", value))
+            checks.append(check_range)
+        
+        if any(k in schema for k in ('required', 'recommended', 'properties', 'additionalProperties')):
+            is_empty = self._is_empty
+            fields = [(k, '/' + self._escape(k), 'ERRO', "Campo obrigatório vazio ou ausente")
+                      for k in schema.get('required', [])]
+            fields += [(k, '/' + self._escape(k), 'AVISO', "Campo recomendado não preenchido")
+                       for k in schema.get('recommended', [])]
+            properties = [(k, '/' + self._escape(k), self.compile(sub))
+                          for k, sub in schema.get('properties', {}).items()]
+            known = set(schema.get('properties', {}))
+            extra = self.compile(schema['additionalProperties']) if schema.get('additionalProperties') else None
+            escape = self._escape
+            
+            def check_object(value, path, out):
+                if not isinstance(value, dict):
+                    return
+                for key, suffix, status, message in fields:
+                    if is_empty(value.get(key)):
+                        out.append(entry(path + suffix, status, message, value.get(key)))
+                for key, suffix, validate in properties:
+                    if not is_empty(value.get(key)):
+                        validate(value[key], path + suffix, out)
+                if extra is not None:
+                    for key, item in value.items():
+                        if key not in known:
+                            extra(item, f"{path}/{escape(key)}", out)
+            checks.append(check_object)
+        
+        if 'allOf' in schema:
+            checks.extend(self.compile(sub) for sub in schema['allOf'])
+        
+        if 'anyOf' in schema:
+            alternatives = [self.compile(sub) for sub in schema['anyOf']]
+            labels = [sub.get('description') or ' + '.join(sub.get('required', [])) or 'schema'
+                      for sub in schema['anyOf']]
+            any_message = f"Nenhuma alternativa atendida ({' | '.join(labels)})"
+            
+            def check_any(value, path, out):
+                for alternative in alternatives:
+                    found: List[Dict[str, Any]] = []
+                    alternative(value, path, found)
+                    if not any(v['status'] == 'ERRO' for v in found):
+                        out.extend(found)
+                        return
+                out.append(entry(path, 'ERRO', any_message, value))
+            checks.append(check_any)
+        
+        if 'items' in schema or 'minItems' in schema:
+            min_items = schema.get('minItems', 0)
+            items = self.compile(schema['items']) if 'items' in schema else None
+            
+            def check_array(value, path, out):
+                if not isinstance(value, list):
+                    return
+                if len(value) < min_items:
+                    out.append(entry(path, 'ERRO', f"Mínimo de {min_items} item(ns)", len(value)))
+                if items is not None:
+                    for index, item in enumerate(value):
+                        items(item, f"{path}/{index}", out)
+            checks.append(check_array)
+        
+        def validate(value, path, out):
+            if type_check is not None and not type_check(value):
+                out.append(entry(path, 'ERRO', type_message, value))
+                return
+            for check in checks:
+                check(value, path, out)
+        
+        return validate
+    
+    @staticmethod
+    def _entry(path: str, status: str, mensagem: str, obtido: Any) -> Dict[str, Any]:
+        """Monta uma violação (listas/objetos aparecem só pelo tipo)."""
+        if isinstance(obtido, (dict, list)):
+            obtido = f"<{type(obtido).__name__} com {len(obtido)} item(ns)>"
+        return {'caminho': path or '/', 'status': status, 'mensagem': mensagem, 'obtido': obtido}
+    
+    @staticmethod
+    def _number(value: Any) -> Optional[float]:
+        """Número (ou string numérica com vírgula ou ponto); None se não for."""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value.strip().replace(',', '.'))
+            except ValueError:
+                return None
+        return None
+    
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        return value is None or value == '' or value == [] or value == {}
+    
+    @staticmethod
+    def _escape(key: Any) -> str:
+        return str(key).replace('~', '~0').replace('/', '~1')
+
+
+# Instância global do validador (schemas compilados uma vez por processo)
+store_validator = StoreValidator()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Valida o arquivo de execuções (ou um JSON avulso) contra os schemas."""
+    parser = argparse.ArgumentParser(description="Validação de schema dos stores coletados")
+    parser.add_argument('--file', default=None, help="JSON avulso em vez do arquivo de execuções")
+    parser.add_argument('--tipo', default=None, help="RURAL, URBANO ou LINEAR")
+    parser.add_argument('--date', default=None, help="Data ou prefixo (ex.: 2026-10)")
+    parser.add_argument('--enterprise', default=None, help="ID do empreendimento")
+    parser.add_argument('--schema', default=None, metavar='TIPO', help="Só mostra o schema do tipo")
+    parser.add_argument('--output', default=None, help="Grava o resumo completo em JSON")
+    parser.add_argument('--limit', type=int, default=20, help="Stores com violações listados")
+    args = parser.parse_args(argv)
+    
+    if args.schema:
+        print(json_serializer.dumps(StoreValidator.schema_for(args.schema.upper()), pretty=True).decode('utf-8'))
+        return 0
+    
+    if args.file:
+        data = json_serializer.read(args.file)
+        resumo = store_validator.validate_many([{'run_id': Path(args.file).name, 'tipo': args.tipo, 'data': data}])
+    else:
+        resumo = store_validator.validate_archive(date=args.date, tipo=args.tipo, enterprise_id=args.enterprise)
+    
+    if resumo['por_caminho']:
+        print("\n   Violações por caminho:")
+        for caminho, total in list(resumo['por_caminho'].items())[:20]:
+            print(f"      {total:>6}  {caminho}")
+    
+    for relatorio in resumo['relatorios'][:args.limit]:
+        print(f"\n   {'⚠️' if relatorio['valido'] else '❌'} {relatorio['run_id']} ({relatorio['tipo'] or '-'})")
+        for v in relatorio['violacoes']:
+            print(f"      {v['status']:<5} {v['caminho']}: {v['mensagem']} (obtido: {v['obtido']!r})")
+    if len(resumo['relatorios']) > args.limit:
+        print(f"\n   ... +{len(resumo['relatorios']) - args.limit} store(s) com violações")
+    
+    if args.output:
+        json_serializer.write(resumo, args.output)
+        print(f"\n💾 Resumo: {args.output}")
+    print()
+    return 1 if resumo['invalidos'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
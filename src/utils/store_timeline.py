@@ -0,0 +1,286 @@
+"""
+Linha do Tempo do Store
+========================
+
+Depois de cada teste/etapa do orquestrador, lê o ``empreendimento-storage``
+(só as seções que mudaram, via ``JSONCollector.extrair_alteracoes``) e
+guarda a diferença em relação à etapa anterior como operações JSON Patch
+(RFC 6902: add/remove/replace com caminhos JSON Pointer), em vez de cópias
+completas (o store de uma etapa é ``base`` + patches até ela, ver
+``apply``). No fim da execução grava um arquivo compacto por execução em
+``reports/timelines/``, com o dono de cada campo (a última etapa que o
+escreveu).
+
+Uso:
+    python -m src.utils.store_timeline reports/timelines/timeline_x.json
+    python -m src.utils.store_timeline reports/timelines/timeline_x.json --field /state/enterprise
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings, REPORTS_DIR
+from .json_collector import JSONCollector
+from .json_serializer import json_serializer
+
+
+class StoreTimeline:
+    """Diferenças do store por etapa de uma execução."""
+    
+    def __init__(self, name: str, max_ops: int = None):
+        """
+        Inicializa a linha do tempo.
+        
+        Args:
+            name: Nome da execução (vai para o nome do arquivo)
+            max_ops: Limite de operações guardadas (padrão: STORE_TIMELINE_MAX_OPS);
+                     além dele, as etapas registram só a contagem
+        """
+        self.name = name
+        self.max_ops = settings.STORE_TIMELINE_MAX_OPS if max_ops is None else max_ops
+        self.steps: List[Dict[str, Any]] = []
+        self.fields: Dict[str, str] = {}
+        self.total_ops = 0
+        self.base: Any = {}
+        self._collector: Optional[JSONCollector] = None
+        self._start = time.perf_counter()
+    
+    def capture(self, driver, step: str) -> Optional[Dict[str, Any]]:
+        """
+        Registra as alterações do store feitas pela etapa.
+        
+        Args:
+            driver: Instância do WebDriver
+            step: Nome da etapa/teste
+        
+        Returns:
+            dict: Entrada da etapa (step, t_s, ops, bytes), ou None se o store
+                  não foi encontrado
+        """
+        if self._collector is None or self._collector.driver is not driver:
+            previous = self._collector.snapshot if self._collector else None
+            self._collector = JSONCollector(driver)
+            self._collector.snapshot = previous
+        
+        # extrair_alteracoes monta um snapshot novo: o anterior continua intacto
+        anterior = self._collector.snapshot
+        secoes_antes = JSONCollector.secoes(anterior)
+        try:
+            mudancas = self._collector.extrair_alteracoes()
+        except Exception as e:
+            print(f"⚠️ Linha do tempo: store não lido após {step}: {e}")
+            return None
+        
+        if mudancas is None:
+            return None
+        
+        atual = self._collector.snapshot
+        prefixo = '/state' if isinstance(atual, dict) and isinstance(atual.get('state'), dict) else ''
+        
+        if anterior is None:
+            # Documento inicial da linha do tempo (as etapas aplicam os patches sobre ele)
+            anterior = self.base = {'state': {}} if prefixo else {}
+        
+        ops: List[List[Any]] = []
+        if '' in mudancas['alteradas'] or not isinstance(anterior, dict):
+            ops = self.diff(anterior, atual)
+        else:
+            if prefixo:
+                raiz_antes = {k: v for k, v in anterior.items() if k != 'state'}
+                raiz_atual = {k: v for k, v in atual.items() if k != 'state'}
+                ops.extend(self.diff(raiz_antes, raiz_atual))
+            secoes_atuais = JSONCollector.secoes(atual)
+            for secao in secoes_antes:
+                if secao not in secoes_atuais:
+                    ops.append(['remove', f"{prefixo}/{self._escape(secao)}"])
+            for secao, valor in mudancas['alteradas'].items():
+                caminho = f"{prefixo}/{self._escape(secao)}"
+                if secao in secoes_antes:
+                    ops.extend(self.diff(secoes_antes[secao], valor, caminho))
+                else:
+                    ops.append(['add', caminho, valor])
+        
+        for op in ops:
+            self.fields[op[1]] = step
+        
+        entry = {
+            't_s': round(time.perf_counter() - self._start, 3),
+            'step': step,
+            'count': len(ops),
+            'bytes': mudancas['transferido']
+        }
+        if self.total_ops + len(ops) <= self.max_ops:
+            entry['ops'] = ops
+        else:
+            entry['truncated'] = True
+        self.total_ops += len(ops)
+        
+        self.steps.append(entry)
+        return entry
+    
+    def write(self, output_dir: Path = None) -> Optional[Path]:
+        """
+        Grava a linha do tempo (JSON compacto) e libera a memória.
+        
+        Args:
+            output_dir: Diretório (padrão: reports/timelines)
+        
+        Returns:
+            Path: Arquivo gravado, ou None se nenhuma etapa foi registrada
+        """
+        if not self.steps:
+            return None
+        
+        output_dir = Path(output_dir) if output_dir else REPORTS_DIR / "timelines"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.name)[:60]
+        worker = os.environ.get('PYTEST_XDIST_WORKER', str(os.getpid()))
+        filepath = output_dir / f"timeline_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{worker}.json"
+        
+        data = {
+            'name': self.name,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'storage_key': JSONCollector.STORAGE_KEY,
+            'total_ops': self.total_ops,
+            'base': self.base,
+            'steps': self.steps,
+            'fields': self.fields
+        }
+        json_serializer.write(data, filepath, pretty=False)
+        
+        print(f"🕒 Linha do tempo do store: {filepath} ({len(self.steps)} etapa(s), {self.total_ops} alteração(ões))")
+        
+        self.steps, self.fields, self._collector = [], {}, None
+        return filepath
+    
+    @staticmethod
+    def diff(antes: Any, depois: Any, caminho: str = '') -> List[List[Any]]:
+        """
+        Operações JSON Patch que transformam ``antes`` em ``depois``.
+        
+        Args:
+            antes: Valor anterior
+            depois: Valor novo
+            caminho: JSON Pointer do valor
+        
+        Returns:
+            list: Operações ``[op, path]`` ou ``[op, path, value]``
+        """
+        if isinstance(antes, dict) and isinstance(depois, dict):
+            ops = []
+            for key in antes:
+                if key not in depois:
+                    ops.append(['remove', f"{caminho}/{StoreTimeline._escape(key)}"])
+            for key, value in depois.items():
+                sub = f"{caminho}/{StoreTimeline._escape(key)}"
+                if key not in antes:
+                    ops.append(['add', sub, value])
+                else:
+                    ops.extend(StoreTimeline.diff(antes[key], value, sub))
+            return ops
+        
+        if isinstance(antes, list) and isinstance(depois, list):
+            ops = []
+            comum = min(len(antes), len(depois))
+            for i in range(comum):
+                ops.extend(StoreTimeline.diff(antes[i], depois[i], f"{caminho}/{i}"))
+            for i in range(len(antes) - 1, comum - 1, -1):
+                ops.append(['remove', f"{caminho}/{i}"])
+            for i in range(comum, len(depois)):
+                ops.append(['add', f"{caminho}/{i}", depois[i]])
+            return ops
+        
+        if antes == depois and type(antes) is type(depois):
+            return []
+        return [['replace', caminho, depois]]
+    
+    @staticmethod
+    def apply(documento: Any, ops: List[List[Any]]) -> Any:
+        """
+        Aplica operações geradas por ``diff`` (para reconstruir o store de uma etapa).
+        
+        Args:
+            documento: Valor inicial (não é alterado)
+            ops: Operações ``[op, path(, value)]``
+        
+        Returns:
+            Any: Novo valor
+        """
+        documento = copy.deepcopy(documento)
+        for op in ops:
+            partes = [StoreTimeline._unescape(p) for p in op[1].split('/')[1:]]
+            if not partes:
+                documento = copy.deepcopy(op[2]) if op[0] != 'remove' else None
+                continue
+            
+            alvo = documento
+            for parte in partes[:-1]:
+                alvo = alvo[int(parte)] if isinstance(alvo, list) else alvo[parte]
+            
+            chave = partes[-1]
+            if isinstance(alvo, list):
+                index = len(alvo) if chave == '-' else int(chave)
+                if op[0] == 'remove':
+                    alvo.pop(index)
+                elif op[0] == 'add':
+                    alvo.insert(index, copy.deepcopy(op[2]))
+                else:
+                    alvo[index] = copy.deepcopy(op[2])
+            elif op[0] == 'remove':
+                alvo.pop(chave, None)
+            else:
+                alvo[chave] = copy.deepcopy(op[2])
+        return documento
+    
+    @staticmethod
+    def _escape(key: Any) -> str:
+        return str(key).replace('~', '~0').replace('/', '~1')
+    
+    @staticmethod
+    def _unescape(part: str) -> str:
+        return part.replace('~1', '/').replace('~0', '~')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Mostra quais campos cada etapa escreveu."""
+    parser = argparse.ArgumentParser(description="Linha do tempo do store por etapa")
+    parser.add_argument('file', help="Arquivo em reports/timelines")
+    parser.add_argument('--field', default=None, help="Prefixo de caminho (ex.: /state/enterprise)")
+    args = parser.parse_args(argv)
+    
+    with open(args.file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    print(f"\n🕒 {data['name']} ({data['created_at']}) - {data['total_ops']} alteração(ões)")
+    for entry in data['steps']:
+        ops = [op for op in entry.get('ops', []) if not args.field or op[1].startswith(args.field)]
+        if args.field and not ops:
+            continue
+        print(f"\n   {entry['t_s']:>8.1f}s  {entry['step']}  ({entry['count']} op, {entry['bytes']:,} bytes lidos)")
+        if entry.get('truncated'):
+            print("      (operações omitidas: STORE_TIMELINE_MAX_OPS atingido)")
+        for op in ops[:50]:
+            valor = f" = {json.dumps(op[2], ensure_ascii=False)[:80]}" if len(op) > 2 else ""
+            print(f"      {op[0]:<8}{op[1]}{valor}")
+        if len(ops) > 50:
+            print(f"      ... +{len(ops) - 50}")
+    
+    if args.field:
+        donos = {path: step for path, step in data['fields'].items() if path.startswith(args.field)}
+        print("\n   Última etapa que escreveu cada campo:")
+        for path, step in sorted(donos.items()):
+            print(f"      {path}: {step}")
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
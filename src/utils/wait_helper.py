@@ -3,18 +3,27 @@ Helper para esperas (waits)
 ============================
 
 Funções auxiliares para esperar elementos e condições.
+
+Além das esperas por elemento/URL, oferece esperas de "conclusão" usadas
+pelos Page Objects após cliques (auto-fill concluído, transição de etapa,
+rede ociosa, DOM estável). Com WAIT_STRATEGY=fixed, essas esperas voltam
+a ser as pausas fixas (time.sleep) originais.
 """
 
-from typing import Tuple
+import time
+from typing import Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from .locator_registry import locator_registry
+from .step_timer import step_timer, timed_class
 from ..config.settings import settings
 
 
+@timed_class('wait', prefix='wait_for')
 class WaitHelper:
     """Helper para esperas no Selenium."""
     
@@ -33,10 +42,10 @@ class WaitHelper:
             locator: Tupla (By, valor) do localizador
             timeout: Tempo máximo de espera
             condition: Tipo de condição (presence, visible, clickable)
-            
+        
         Returns:
             WebElement: Elemento encontrado
-            
+        
         Raises:
             TimeoutException: Se elemento não for encontrado
         """
@@ -45,6 +54,9 @@ class WaitHelper:
         
         wait = WebDriverWait(driver, timeout)
         
+        if settings.LOCATOR_REGISTRY_ENABLED:
+            return wait.until(lambda d: locator_registry.locate(d, locator, condition))
+        
         conditions = {
             'presence': EC.presence_of_element_located,
             'visible': EC.visibility_of_element_located,
@@ -68,7 +80,7 @@ class WaitHelper:
             driver: Instância do WebDriver
             text: Texto a procurar
             timeout: Tempo máximo de espera
-            
+        
         Returns:
             WebElement: Elemento com o texto
         """
@@ -88,7 +100,7 @@ class WaitHelper:
             driver: Instância do WebDriver
             url_part: Parte da URL a procurar
             timeout: Tempo máximo de espera
-            
+        
         Returns:
             bool: True se URL contém a parte
         """
@@ -116,7 +128,7 @@ class WaitHelper:
             driver: Instância do WebDriver
             url_part: Parte da URL a evitar
             timeout: Tempo máximo de espera
-            
+        
         Returns:
             bool: True se URL não contém a parte
         """
@@ -144,7 +156,7 @@ class WaitHelper:
             driver: Instância do WebDriver
             locator: Tupla (By, valor) do localizador
             timeout: Tempo máximo de espera
-            
+        
         Returns:
             bool: True se elemento desapareceu
         """
@@ -158,3 +170,493 @@ class WaitHelper:
             return True
         except TimeoutException:
             return False
+    
+    
+    # ------------------------------------------------------------------
+    # Esperas de conclusão (substituem time.sleep nos Page Objects)
+    # ------------------------------------------------------------------
+    
+    # Assinatura do DOM: nº de elementos, tamanho do HTML e dos valores dos campos
+    _DOM_SIGNATURE_SCRIPT = """
+    var b = document.body;
+    if (!b) return null;
+    var v = 0, f = b.querySelectorAll('input, select, textarea');
+    for (var i = 0; i < f.length; i++) { v += (f[i].value || '').length; }
+    return [b.getElementsByTagName('*').length, b.innerHTML.length, v].join(':');
+    """
+    
+    # Assinatura de rede: estado do documento e nº de recursos concluídos
+    _NETWORK_SIGNATURE_SCRIPT = """
+    var n = (window.performance && performance.getEntriesByType)
+        ? performance.getEntriesByType('resource').length : 0;
+    return document.readyState + ':' + n;
+    """
+    
+    # Rastreador injetado na página: MutationObserver + contador de fetch/XHR
+    # pendentes. Idempotente (só instala uma vez por documento).
+    _ACTIVITY_TRACKER_SCRIPT = """
+    (function() {
+        if (window.__e2eActivity) return;
+        var t = window.__e2eActivity = {
+            pending: 0, lastMutation: Date.now(), lastNetwork: Date.now()
+        };
+        function start() { t.pending++; t.lastNetwork = Date.now(); }
+        function end() { t.pending = Math.max(0, t.pending - 1); t.lastNetwork = Date.now(); }
+        
+        if (window.fetch) {
+            var origFetch = window.fetch;
+            window.fetch = function() {
+                start();
+                return origFetch.apply(this, arguments).then(
+                    function(r) { end(); return r; },
+                    function(e) { end(); throw e; }
+                );
+            };
+        }
+        
+        var origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function() {
+            start();
+            this.addEventListener('loadend', end, { once: true });
+            return origSend.apply(this, arguments);
+        };
+        
+        function observe() {
+            new MutationObserver(function() { t.lastMutation = Date.now(); })
+                .observe(document.documentElement, {
+                    childList: true, subtree: true, attributes: true, characterData: true
+                });
+        }
+        if (document.documentElement) observe();
+        else document.addEventListener('DOMContentLoaded', observe);
+        document.addEventListener('input', function() { t.lastMutation = Date.now(); }, true);
+        document.addEventListener('change', function() { t.lastMutation = Date.now(); }, true);
+    })();
+    """
+    
+    # Bloqueia (uma única chamada) até DOM e rede ficarem quietos por quietMs
+    _PAGE_QUIET_ASYNC_SCRIPT = _ACTIVITY_TRACKER_SCRIPT + """
+    var quietMs = arguments[0], timeoutMs = arguments[1];
+    var done = arguments[arguments.length - 1];
+    var t = window.__e2eActivity, begin = Date.now();
+    (function check() {
+        var now = Date.now();
+        if (document.readyState === 'complete' && t.pending === 0 &&
+                now - t.lastMutation >= quietMs && now - t.lastNetwork >= quietMs) {
+            return done(true);
+        }
+        if (now - begin >= timeoutMs) return done(false);
+        setTimeout(check, Math.min(50, quietMs));
+    })();
+    """
+    
+    @staticmethod
+    def install_activity_tracker(driver: webdriver.Chrome) -> bool:
+        """
+        Injeta o rastreador de atividade (MutationObserver + fetch/XHR).
+        
+        Registra o script via CDP para todo novo documento (capturando as
+        requisições do carregamento) e o instala no documento atual.
+        
+        Args:
+            driver: Instância do WebDriver
+        
+        Returns:
+            bool: True se o rastreador foi instalado
+        """
+        if not getattr(driver, '_e2e_activity_tracker', False):
+            try:
+                driver.execute_cdp_cmd(
+                    "Page.addScriptToEvaluateOnNewDocument",
+                    {"source": WaitHelper._ACTIVITY_TRACKER_SCRIPT}
+                )
+                driver._e2e_activity_tracker = True
+            except Exception:
+                pass
+        
+        try:
+            driver.execute_script(WaitHelper._ACTIVITY_TRACKER_SCRIPT)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def wait_for_page_quiet(
+        driver: webdriver.Chrome,
+        quiet_ms: int = None,
+        timeout: int = None
+    ) -> Optional[bool]:
+        """
+        Aguarda DOM sem mutações e rede sem requisições pendentes.
+        
+        Diferente do polling do WebDriverWait, a espera acontece dentro da
+        página em uma única chamada ``execute_async_script``.
+        
+        Args:
+            driver: Instância do WebDriver
+            quiet_ms: Janela sem mutações/requisições (ms)
+            timeout: Tempo máximo de espera
+        
+        Returns:
+            bool: True se estabilizou, False no timeout,
+                  None se o script assíncrono não pôde ser executado
+        """
+        if quiet_ms is None:
+            quiet_ms = max(settings.DOM_QUIET_MS, settings.NETWORK_IDLE_MS)
+        if timeout is None:
+            timeout = settings.TEST_TIMEOUT
+        
+        WaitHelper.install_activity_tracker(driver)
+        
+        try:
+            previous = driver.timeouts.script
+        except Exception:
+            previous = None
+        
+        try:
+            driver.set_script_timeout(timeout + 5)
+            return bool(driver.execute_async_script(
+                WaitHelper._PAGE_QUIET_ASYNC_SCRIPT, quiet_ms, int(timeout * 1000)
+            ))
+        except Exception:
+            return None
+        finally:
+            # Não deixar o timeout de script da sessão alterado para os outros comandos
+            if previous is not None:
+                try:
+                    driver.set_script_timeout(previous)
+                except Exception:
+                    pass
+    
+    @staticmethod
+    def is_fixed_mode() -> bool:
+        """
+        Indica se as esperas estão no modo de pausas fixas (fallback).
+        
+        Returns:
+            bool: True se WAIT_STRATEGY=fixed
+        """
+        return settings.WAIT_STRATEGY == "fixed"
+    
+    @staticmethod
+    def fixed_delay(seconds: float) -> None:
+        """
+        Pausa fixa aplicada apenas no modo WAIT_STRATEGY=fixed.
+        
+        Usada onde a pausa antiga não esperava por nenhuma condição
+        (ex.: após scroll), mantendo o comportamento original como opção.
+        
+        Args:
+            seconds: Segundos de pausa no modo fixo
+        """
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(seconds)
+    
+    @staticmethod
+    def dom_signature(driver: webdriver.Chrome) -> Optional[str]:
+        """
+        Retorna uma assinatura barata do estado atual do DOM.
+        
+        Args:
+            driver: Instância do WebDriver
+        
+        Returns:
+            str: Assinatura (muda quando o DOM ou valores de campos mudam)
+        """
+        try:
+            return driver.execute_script(WaitHelper._DOM_SIGNATURE_SCRIPT)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _wait_until_stable(
+        driver: webdriver.Chrome,
+        scripts: Tuple[str, ...],
+        quiet_ms: int,
+        timeout: float,
+        changed_from: Optional[str] = None,
+        change_timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Aguarda as assinaturas ficarem inalteradas por ``quiet_ms``.
+        
+        Args:
+            driver: Instância do WebDriver
+            scripts: Scripts que geram as assinaturas monitoradas
+            quiet_ms: Janela sem mudanças (ms)
+            timeout: Tempo máximo de espera (s)
+            changed_from: Se informado, a primeira assinatura precisa
+                          ser diferente deste valor antes de contar a janela
+            change_timeout: Tempo máximo (s) para essa primeira mudança
+        
+        Returns:
+            bool: True se estabilizou dentro do timeout
+        """
+        script = "return [" + ", ".join(
+            f"(function() {{ {body} }})()" for body in scripts
+        ) + "].join('|');"
+        
+        deadline = time.monotonic() + timeout
+        change_deadline = time.monotonic() + min(timeout, change_timeout or timeout)
+        quiet = quiet_ms / 1000
+        last = None
+        last_change = time.monotonic()
+        changed = changed_from is None
+        
+        while time.monotonic() < deadline:
+            try:
+                current = driver.execute_script(script)
+            except Exception:
+                current = None
+            
+            now = time.monotonic()
+            
+            if not changed:
+                if current is not None and current.split('|')[0] != changed_from:
+                    changed = True
+                    last, last_change = current, now
+                elif now >= change_deadline:
+                    return False
+            elif current != last:
+                last, last_change = current, now
+            elif current is not None and now - last_change >= quiet:
+                return True
+            
+            time.sleep(settings.WAIT_POLL_INTERVAL)
+        
+        return False
+    
+    @staticmethod
+    def wait_for_dom_quiet(
+        driver: webdriver.Chrome,
+        quiet_ms: int = None,
+        timeout: int = None,
+        fallback: float = 1.0
+    ) -> bool:
+        """
+        Aguarda o DOM ficar sem mudanças por ``quiet_ms``.
+        
+        Args:
+            driver: Instância do WebDriver
+            quiet_ms: Janela sem mudanças (ms)
+            timeout: Tempo máximo de espera
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+        
+        Returns:
+            bool: True se o DOM estabilizou
+        """
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(fallback)
+            return True
+        
+        return WaitHelper._wait_until_stable(
+            driver,
+            (WaitHelper._DOM_SIGNATURE_SCRIPT,),
+            quiet_ms if quiet_ms is not None else settings.DOM_QUIET_MS,
+            timeout if timeout is not None else settings.TEST_TIMEOUT
+        )
+    
+    @staticmethod
+    def wait_for_network_idle(
+        driver: webdriver.Chrome,
+        idle_ms: int = None,
+        timeout: int = None,
+        fallback: float = 1.0
+    ) -> bool:
+        """
+        Aguarda o documento carregado e nenhuma nova requisição por ``idle_ms``.
+        
+        Args:
+            driver: Instância do WebDriver
+            idle_ms: Janela sem novas requisições (ms)
+            timeout: Tempo máximo de espera
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+        
+        Returns:
+            bool: True se a rede ficou ociosa
+        """
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(fallback)
+            return True
+        
+        return WaitHelper._wait_until_stable(
+            driver,
+            (WaitHelper._NETWORK_SIGNATURE_SCRIPT,),
+            idle_ms if idle_ms is not None else settings.NETWORK_IDLE_MS,
+            timeout if timeout is not None else settings.TEST_TIMEOUT
+        )
+    
+    @staticmethod
+    def wait_for_settled(
+        driver: webdriver.Chrome,
+        timeout: int = None,
+        fallback: float = 1.0
+    ) -> bool:
+        """
+        Aguarda DOM estável e rede ociosa ao mesmo tempo.
+        
+        Args:
+            driver: Instância do WebDriver
+            timeout: Tempo máximo de espera
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+        
+        Returns:
+            bool: True se a página estabilizou
+        """
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(fallback)
+            return True
+        
+        if timeout is None:
+            timeout = settings.TEST_TIMEOUT
+        
+        # Preferir o detector dentro da página (uma única chamada)
+        quiet = WaitHelper.wait_for_page_quiet(driver, timeout=timeout)
+        if quiet is not None:
+            return quiet
+        
+        return WaitHelper._wait_until_stable(
+            driver,
+            (WaitHelper._DOM_SIGNATURE_SCRIPT, WaitHelper._NETWORK_SIGNATURE_SCRIPT),
+            max(settings.DOM_QUIET_MS, settings.NETWORK_IDLE_MS),
+            timeout
+        )
+    
+    @staticmethod
+    def wait_for_autofill(
+        driver: webdriver.Chrome,
+        field_locator: Tuple[By, str] = None,
+        timeout: int = None,
+        fallback: float = 2.0
+    ) -> bool:
+        """
+        Aguarda o auto-fill ("Preencher Dados") terminar.
+        
+        Se ``field_locator`` for informado, espera o campo ter valor;
+        depois espera DOM (incluindo valores dos campos) e rede estáveis.
+        
+        Args:
+            driver: Instância do WebDriver
+            field_locator: Campo que deve ser preenchido pelo auto-fill
+            timeout: Tempo máximo de espera
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+        
+        Returns:
+            bool: True se o auto-fill terminou
+        """
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(fallback)
+            return True
+        
+        if timeout is None:
+            timeout = settings.TEST_TIMEOUT
+        
+        if field_locator is not None:
+            try:
+                WebDriverWait(driver, timeout, settings.WAIT_POLL_INTERVAL).until(
+                    lambda d: d.find_element(*field_locator).get_attribute('value')
+                )
+            except TimeoutException:
+                return False
+        
+        return WaitHelper.wait_for_settled(driver, timeout)
+    
+    @staticmethod
+    def wait_for_step_transition(
+        driver: webdriver.Chrome,
+        before: Optional[str] = None,
+        next_locator: Tuple[By, str] = None,
+        timeout: int = None,
+        fallback: float = 2.0,
+        transition_timeout: float = None,
+        clicked_at: Optional[float] = None
+    ) -> bool:
+        """
+        Aguarda a transição de etapa/modal após um clique.
+        
+        Espera ``next_locator`` ficar visível ou, sem ele, o DOM mudar em
+        relação à assinatura ``before`` (obtida com ``dom_signature`` antes
+        do clique). Em seguida aguarda a página estabilizar.
+        
+        Se nada mudar em ``transition_timeout`` (ex.: erro de validação que
+        não altera a tela), desiste logo em vez de esperar o ``timeout`` todo.
+        
+        Concluída a transição, o tempo desde ``clicked_at`` até a nova etapa
+        visível e estável é registrado com ``step_timer.record_transition``.
+        
+        Args:
+            driver: Instância do WebDriver
+            before: Assinatura do DOM antes do clique
+            next_locator: Elemento que indica a nova etapa
+            timeout: Tempo máximo de espera (incluindo a estabilização)
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+            transition_timeout: Prazo para a mudança começar (padrão: STEP_TRANSITION_TIMEOUT)
+            clicked_at: ``time.perf_counter()`` do clique (padrão: início da espera)
+        
+        Returns:
+            bool: True se a transição foi concluída
+        """
+        if clicked_at is None:
+            clicked_at = time.perf_counter()
+        
+        if WaitHelper.is_fixed_mode():
+            step_timer.sleep(fallback)
+            done = True
+        else:
+            if timeout is None:
+                timeout = settings.TEST_TIMEOUT
+            if transition_timeout is None:
+                transition_timeout = settings.STEP_TRANSITION_TIMEOUT
+            
+            if next_locator is not None:
+                try:
+                    WebDriverWait(driver, min(timeout, transition_timeout), settings.WAIT_POLL_INTERVAL).until(
+                        EC.visibility_of_element_located(next_locator)
+                    )
+                except TimeoutException:
+                    return False
+                done = WaitHelper.wait_for_settled(driver, timeout)
+            else:
+                done = WaitHelper._wait_until_stable(
+                    driver,
+                    (WaitHelper._DOM_SIGNATURE_SCRIPT, WaitHelper._NETWORK_SIGNATURE_SCRIPT),
+                    max(settings.DOM_QUIET_MS, settings.NETWORK_IDLE_MS),
+                    timeout,
+                    changed_from=before,
+                    change_timeout=transition_timeout
+                )
+        
+        if done:
+            step_timer.record_transition((time.perf_counter() - clicked_at) * 1000)
+        return done
+    
+    @staticmethod
+    def click_and_expect_transition(
+        driver: webdriver.Chrome,
+        element,
+        fallback: float = 2.0,
+        next_locator: Tuple[By, str] = None
+    ) -> bool:
+        """
+        Clica no elemento e aguarda a tela mudar (``wait_for_step_transition``).
+        
+        Args:
+            driver: Instância do WebDriver
+            element: WebElement do botão (avançar, voltar, cancelar...)
+            fallback: Pausa usada no modo WAIT_STRATEGY=fixed
+            next_locator: Elemento que indica a nova etapa
+        
+        Returns:
+            bool: False se a tela não mudou após o clique (ex.: erro de validação)
+        """
+        before = WaitHelper.dom_signature(driver)
+        clicked_at = time.perf_counter()
+        element.click()
+        
+        if not WaitHelper.wait_for_step_transition(
+            driver, before=before, next_locator=next_locator,
+            fallback=fallback, clicked_at=clicked_at
+        ):
+            print("⚠️ A tela não mudou após o clique (erro de validação?)")
+            return False
+        return True
@@ -17,6 +17,8 @@ Testes Disponíveis:
 03 - Dados Gerais: Preenche dados do empreendimento
 04 - Atividades: Seleciona atividades e preenche quantidades
 05 - Caracterização: Preenche caracterização completa
+06 - Coletar JSON: Extrai o store do empreendimento
+07 - Validação via API: Confere os dados gravados nas APIs do backend
 
 Autor: GitHub Copilot
 Data: 2025-11-22
@@ -42,7 +44,7 @@ import test_novo_empreendimento_03_dados_gerais as teste03
 import test_novo_empreendimento_04_atividades as teste04
 import test_novo_empreendimento_05_caracterizacao as teste05
 import test_novo_empreendimento_06_coletar_json as teste06
-# import test_novo_empreendimento_06_validacao_dados as teste_validacao  # Desativado - será refatorado para usar APIs
+import test_novo_empreendimento_06_validacao_dados as teste_validacao
 
 
 class OrquestradorNovoEmpreendimento:
@@ -240,35 +242,16 @@ def main():
         ativo=True
     )
     
+    orquestrador.adicionar_teste(
+        nome="07 - Validação de Dados via API",
+        funcao=teste_validacao.executar_teste_validacao,
+        ativo=True
+    )
+    
     # Executar todos os testes
     try:
         orquestrador.executar_todos()
         
-        # ===================================================================
-        # VALIDAÇÃO DE DADOS NO BANCO - COMENTADO
-        # ===================================================================
-        # TODO: Refatorar para usar API ao invés de acessar Supabase diretamente
-        # A validação será reimplementada quando as APIs estiverem prontas
-        # 
-        # Próximos passos:
-        # 1. Backend criar APIs de validação (GET /enterprises/{id}/complete)
-        # 2. Refatorar test_06 para usar chamadas HTTP às APIs
-        # 3. Reativar validação aqui
-        # ===================================================================
-        
-        print("\n" + "=" * 100)
-        print(" " * 20 + "⚠️  VALIDAÇÃO DE DADOS NO BANCO TEMPORARIAMENTE DESATIVADA")
-        print("=" * 100)
-        print("\n📝 Motivo: Aguardando APIs de validação do backend")
-        print("📋 Status dos testes executados: COMPLETO")
-        print("✅ Todos os fluxos funcionais foram testados com sucesso!\n")
-        print("🔄 A validação será reativada quando as seguintes APIs estiverem prontas:")
-        print("   - GET /api/v1/properties/{id}")
-        print("   - GET /api/v1/enterprises/{id}")
-        print("   - GET /api/v1/enterprises/{id}/activities")
-        print("   - GET /api/v1/enterprises/{id}/characterization")
-        print("\n" + "=" * 100 + "\n")
-    
     except KeyboardInterrupt:
         print("\n\n⚠️  Execução interrompida pelo usuário (Ctrl+C)")
     finally:
@@ -19,14 +19,25 @@ Data: 2025-11-26
 Branch: feature/working-branch
 """
 
+import sys
 import time
 import json
 from datetime import datetime
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Raiz do projeto no path (execução direta a partir de tests/analisar)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.utils.store_schema import store_validator
+
+
+# Campo que identifica o tipo de imóvel nos dados do teste 02
+TIPO_POR_CAMPO = (('car', 'RURAL'), ('cep', 'URBANO'), ('municipio_inicio', 'LINEAR'))
+
 
 def executar_teste_coletar_json(driver_existente=None, contexto_anterior=None):
     """
@@ -117,60 +128,11 @@ def executar_teste_coletar_json(driver_existente=None, contexto_anterior=None):
                 'etapa_05_caracterizacao': {}
             }
             
-            # Extrair dados do imóvel
+            # Extrair dados do imóvel (mesmos campos do store; o schema do tipo valida)
             if 'dados_imovel' in contexto_anterior:
                 dados_imovel = contexto_anterior['dados_imovel']
-                
-                # Estruturar JSON conforme tipo de imóvel
-                if 'car' in dados_imovel:  # RURAL
-                    empreendimento_completo['etapa_02_imovel'] = {
-                        'tipoImovel': 'RURAL',
-                        'nomeImovel': dados_imovel.get('nome', ''),
-                        'codigoCar': dados_imovel.get('car', ''),
-                        'situacaoCar': 'ATIVO',  # Valor padrão do botão "Preencher Dados"
-                        'areaTotalHa': float(dados_imovel.get('area', 0)),
-                        'municipio': dados_imovel.get('municipio', ''),
-                        'uf': dados_imovel.get('uf', ''),
-                        'sistemaReferencia': 'SIRGAS 2000',  # Valor padrão do botão "Preencher Dados"
-                        'coordenadas': {
-                            'latitude': float(dados_imovel.get('lat', 0)),
-                            'longitude': float(dados_imovel.get('long', 0))
-                        }
-                    }
-                elif 'cep' in dados_imovel:  # URBANO
-                    empreendimento_completo['etapa_02_imovel'] = {
-                        'tipoImovel': 'URBANO',
-                        'nomeImovel': dados_imovel.get('nome', ''),
-                        'cep': dados_imovel.get('cep', ''),
-                        'matricula': dados_imovel.get('matricula', ''),
-                        'logradouro': dados_imovel.get('logradouro', ''),
-                        'numero': dados_imovel.get('numero', ''),
-                        'bairro': dados_imovel.get('bairro', ''),
-                        'complemento': dados_imovel.get('complemento', ''),
-                        'municipio': dados_imovel.get('municipio', ''),
-                        'uf': dados_imovel.get('uf', ''),
-                        'areaTotalM2': float(dados_imovel.get('area', 0)),
-                        'sistemaReferencia': 'SIRGAS 2000',
-                        'coordenadas': {
-                            'latitude': float(dados_imovel.get('lat', 0)),
-                            'longitude': float(dados_imovel.get('long', 0))
-                        }
-                    }
-                elif 'municipio_inicio' in dados_imovel:  # LINEAR
-                    empreendimento_completo['etapa_02_imovel'] = {
-                        'tipoImovel': 'LINEAR',
-                        'nomeEmpreendimento': dados_imovel.get('nome', ''),
-                        'pontoInicio': {
-                            'municipio': dados_imovel.get('municipio_inicio', ''),
-                            'uf': dados_imovel.get('uf_inicio', '')
-                        },
-                        'pontoFinal': {
-                            'municipio': dados_imovel.get('municipio_final', ''),
-                            'uf': dados_imovel.get('uf_final', '')
-                        },
-                        'extensaoKm': float(dados_imovel.get('extensao', 0)),
-                        'sistemaReferencia': 'SIRGAS 2000'
-                    }
+                tipo = next((t for campo, t in TIPO_POR_CAMPO if campo in dados_imovel), None)
+                empreendimento_completo['etapa_02_imovel'] = dict(dados_imovel, tipoImovel=tipo)
             
             # Extrair dados gerais
             empreendimento_completo['etapa_03_dados_gerais'] = {
@@ -268,6 +230,24 @@ def executar_teste_coletar_json(driver_existente=None, contexto_anterior=None):
             store_data = empreendimento_completo
             contexto['store_json'] = store_data
         
+        # Validar contra o schema do tipo de imóvel
+        if 'state' in store_data:
+            violacoes = store_validator.validate(store_data)
+        else:
+            # Montado a partir do contexto: só o imóvel tem o formato do store
+            imovel = store_data.get('etapa_02_imovel') or {}
+            violacoes = [
+                v for v in store_validator.validate({'state': {'dados_imovel': imovel}}, imovel.get('tipoImovel'))
+                if v['caminho'].startswith('/state/dados_imovel')
+            ]
+        
+        erros = sum(1 for v in violacoes if v['status'] == 'ERRO')
+        print(f"✓ Schema: {erros} erro(s), {len(violacoes) - erros} aviso(s)")
+        for violacao in violacoes:
+            icone = "❌" if violacao['status'] == 'ERRO' else "⚠️"
+            print(f"  {icone} {violacao['caminho']}: {violacao['mensagem']}")
+        contexto['store_violacoes'] = violacoes
+        
         # =================================================================
         # ETAPA 2: FORMATAR E EXIBIR JSON
         # =================================================================
@@ -334,7 +314,7 @@ def executar_teste_coletar_json(driver_existente=None, contexto_anterior=None):
         
         contexto['status'] = 'sucesso'
         return contexto
-        
+    
     except Exception as e:
         print("\n" + "=" * 80)
         print("❌ ERRO NO TESTE 06")
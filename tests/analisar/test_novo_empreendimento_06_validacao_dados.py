@@ -1,67 +1,42 @@
 """
 =======================================================================
-TESTE 06 - VALIDAÇÃO DE DADOS NO BANCO (NOVO EMPREENDIMENTO)
+TESTE 06 - VALIDAÇÃO DE DADOS VIA API (NOVO EMPREENDIMENTO)
 =======================================================================
 
-⚠️  ATENÇÃO: ESTE TESTE ESTÁ TEMPORARIAMENTE DESATIVADO
-============================================================
+Valida os dados gravados pelo wizard consultando as APIs do backend
+(Frontend -> API -> Backend -> Supabase), sem acesso direto ao banco.
 
-Motivo: O teste atual acessa o Supabase diretamente, mas a arquitetura
-        foi definida para usar APENAS APIs (sem acesso direto ao banco).
-
-Status: AGUARDANDO REFATORAÇÃO
-------------------------------
-
-Este teste será completamente refatorado para:
-1. Usar chamadas HTTP às APIs do backend ao invés de acessar Supabase
-2. Validar dados através dos endpoints de consulta
-3. Seguir o padrão de arquitetura: Frontend -> API -> Backend -> Supabase
-
-APIs necessárias para reativar este teste:
--------------------------------------------
+APIs utilizadas (buscadas em paralelo pelo DataValidator):
+-----------------------------------------------------------
 - GET /api/v1/properties/{property_id}
 - GET /api/v1/enterprises/{enterprise_id}
 - GET /api/v1/enterprises/{enterprise_id}/activities
 - GET /api/v1/enterprises/{enterprise_id}/characterization
-- GET /api/v1/enterprises/{enterprise_id}/complete (opcional - retorna tudo)
 
-Após backend implementar essas APIs:
--------------------------------------
-1. Substituir imports do Supabase por biblioteca HTTP (requests)
-2. Trocar supabase.table().select() por http.get('/api/...')
-3. Reativar o teste no orchestrator_novo_empreendimento.py
+Validações:
+-----------
+1. Imóvel (test_02) -> properties
+2. Dados Gerais (test_03) -> enterprises
+3. Atividades (test_04) -> enterprise activities
+4. Caracterização (test_05) -> enterprise characterization
 
-Validações originais (serão mantidas):
----------------------------------------
-1. Imóvel (test_02) -> Tabela: properties
-2. Dados Gerais (test_03) -> Tabela: enterprises
-3. Atividades (test_04) -> Tabela: enterprise_activities
-4. Caracterização (test_05) -> Tabelas: enterprise_characterization, etc.
+Os IDs são lidos do contexto (``property_id``/``enterprise_id``) ou do
+``store_json`` coletado no teste 06 - Coletar JSON.
 
 Autor: Sistema de Testes Automatizados
 Data: 23/11/2025
-Última Atualização: 24/11/2025 - Desativado para refatoração
+Última Atualização: Validação via APIs (DataValidator)
 """
 
-import os
 import sys
-import time
 from datetime import datetime
-from dotenv import load_dotenv
-from supabase import create_client, Client
-
-# Carregar variáveis de ambiente
-load_dotenv()
+from pathlib import Path
 
-# ===================================================================
-# CONFIGURAÇÃO
-# ===================================================================
+# Raiz do projeto no path (execução direta a partir de tests/analisar)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-SUPABASE_URL = os.getenv('SUPABASE_URL', '')
-SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
-
-# Cliente Supabase (será inicializado na função)
-supabase: Client = None
+from src.config.settings import settings
+from src.core.data_validator import DataValidator
 
 
 # ===================================================================
@@ -90,391 +65,74 @@ def log_validacao(campo: str, status: str, detalhes: str = ""):
     print(msg)
 
 
-def contar_registros(tabela: str, filtros: dict = None) -> int:
-    """Conta registros em uma tabela com filtros opcionais"""
-    try:
-        query = supabase.table(tabela).select('id', count='exact')
-        
-        if filtros:
-            for campo, valor in filtros.items():
-                query = query.eq(campo, valor)
-        
-        response = query.execute()
-        return response.count if hasattr(response, 'count') else len(response.data)
-    except Exception as e:
-        print(f"⚠️ Erro ao contar registros em {tabela}: {e}")
-        return -1
-
-
-def buscar_registro(tabela: str, filtros: dict, campos: str = '*'):
-    """Busca um registro específico"""
-    try:
-        query = supabase.table(tabela).select(campos)
-        
-        for campo, valor in filtros.items():
-            query = query.eq(campo, valor)
-        
-        response = query.limit(1).execute()
-        return response.data[0] if response.data else None
-    except Exception as e:
-        print(f"⚠️ Erro ao buscar registro em {tabela}: {e}")
-        return None
-
-
-def buscar_ultimo_registro(tabela: str, campo_ordem: str = 'created_at'):
-    """Busca o último registro inserido em uma tabela"""
-    try:
-        response = supabase.table(tabela).select('*').order(campo_ordem, desc=True).limit(1).execute()
-        return response.data[0] if response.data else None
-    except Exception as e:
-        print(f"⚠️ Erro ao buscar último registro em {tabela}: {e}")
-        return None
-
-
-# ===================================================================
-# VALIDAÇÕES POR ABA
-# ===================================================================
-
-def validar_aba_imovel(contexto: dict) -> dict:
-    """
-    Valida se os dados da aba Imóvel foram salvos.
-    Tabela: properties
-    """
-    log_aba("ABA 1: IMÓVEL", "🏠")
-    
-    resultado = {
-        'aba': 'Imóvel',
-        'tabela': 'properties',
-        'validacoes': [],
-        'sucesso': True
-    }
-    
-    # Buscar último imóvel cadastrado
-    imovel = buscar_ultimo_registro('properties')
-    
-    if not imovel:
-        log_validacao("Registro", "ERRO", "Nenhum imóvel encontrado no banco")
-        resultado['sucesso'] = False
-        resultado['validacoes'].append({
-            'campo': 'Registro',
-            'status': 'ERRO',
-            'mensagem': 'Nenhum imóvel encontrado'
-        })
-        return resultado
-    
-    # Armazenar ID do imóvel no contexto
-    contexto['property_id'] = imovel['id']
-    
-    # Validar campos obrigatórios
-    campos_obrigatorios = {
-        'name': 'Nome do Imóvel',
-        'property_type_id': 'Tipo de Imóvel',
-        'state': 'Estado',
-        'city': 'Município'
-    }
-    
-    for campo, nome in campos_obrigatorios.items():
-        valor = imovel.get(campo)
-        if valor:
-            log_validacao(nome, "OK", f"Valor: {valor}")
-            resultado['validacoes'].append({
-                'campo': nome,
-                'status': 'OK',
-                'valor': valor
-            })
-        else:
-            log_validacao(nome, "ERRO", "Campo vazio")
-            resultado['sucesso'] = False
-            resultado['validacoes'].append({
-                'campo': nome,
-                'status': 'ERRO',
-                'mensagem': 'Campo vazio'
-            })
-    
-    # Validar coordenadas geográficas
-    if imovel.get('latitude') and imovel.get('longitude'):
-        log_validacao("Coordenadas", "OK", f"{imovel['latitude']}, {imovel['longitude']}")
-        resultado['validacoes'].append({
-            'campo': 'Coordenadas',
-            'status': 'OK',
-            'valor': f"{imovel['latitude']}, {imovel['longitude']}"
-        })
-    else:
-        log_validacao("Coordenadas", "AVISO", "Coordenadas não preenchidas")
-        resultado['validacoes'].append({
-            'campo': 'Coordenadas',
-            'status': 'AVISO',
-            'mensagem': 'Não preenchidas'
-        })
-    
-    return resultado
-
-
-def validar_aba_dados_gerais(contexto: dict) -> dict:
-    """
-    Valida se os dados da aba Dados Gerais foram salvos.
-    Tabela: enterprises
-    """
-    log_aba("ABA 2: DADOS GERAIS", "🏢")
-    
-    resultado = {
-        'aba': 'Dados Gerais',
-        'tabela': 'enterprises',
-        'validacoes': [],
-        'sucesso': True
-    }
-    
-    property_id = contexto.get('property_id')
-    if not property_id:
-        log_validacao("Contexto", "ERRO", "ID do imóvel não encontrado no contexto")
-        resultado['sucesso'] = False
-        return resultado
-    
-    # Buscar empreendimento relacionado ao imóvel
-    empreendimento = buscar_registro('enterprises', {'property_id': property_id})
-    
-    if not empreendimento:
-        log_validacao("Registro", "ERRO", "Nenhum empreendimento encontrado para este imóvel")
-        resultado['sucesso'] = False
-        resultado['validacoes'].append({
-            'campo': 'Registro',
-            'status': 'ERRO',
-            'mensagem': 'Empreendimento não encontrado'
-        })
-        return resultado
-    
-    # Armazenar ID do empreendimento
-    contexto['enterprise_id'] = empreendimento['id']
-    
-    # Validar campos obrigatórios
-    campos_obrigatorios = {
-        'name': 'Nome do Empreendimento',
-        'cnpj': 'CNPJ',
-        'responsible_name': 'Nome do Responsável',
-        'responsible_cpf': 'CPF do Responsável'
-    }
-    
-    for campo, nome in campos_obrigatorios.items():
-        valor = empreendimento.get(campo)
-        if valor:
-            log_validacao(nome, "OK", f"Valor: {valor}")
-            resultado['validacoes'].append({
-                'campo': nome,
-                'status': 'OK',
-                'valor': valor
-            })
-        else:
-            log_validacao(nome, "ERRO", "Campo vazio")
-            resultado['sucesso'] = False
-            resultado['validacoes'].append({
-                'campo': nome,
-                'status': 'ERRO',
-                'mensagem': 'Campo vazio'
-            })
-    
-    return resultado
-
-
-def validar_aba_atividades(contexto: dict) -> dict:
-    """
-    Valida se as atividades foram salvas.
-    Tabela: enterprise_activities
-    """
-    log_aba("ABA 3: ATIVIDADES", "⚡")
-    
-    resultado = {
-        'aba': 'Atividades',
-        'tabela': 'enterprise_activities',
-        'validacoes': [],
-        'sucesso': True
-    }
-    
-    enterprise_id = contexto.get('enterprise_id')
-    if not enterprise_id:
-        log_validacao("Contexto", "ERRO", "ID do empreendimento não encontrado")
-        resultado['sucesso'] = False
-        return resultado
-    
-    # Contar atividades vinculadas ao empreendimento
-    total_atividades = contar_registros('enterprise_activities', {'enterprise_id': enterprise_id})
-    
-    if total_atividades > 0:
-        log_validacao("Total de Atividades", "OK", f"{total_atividades} atividade(s)")
-        resultado['validacoes'].append({
-            'campo': 'Total de Atividades',
-            'status': 'OK',
-            'valor': total_atividades
-        })
-        
-        # Buscar detalhes das atividades
-        try:
-            response = supabase.table('enterprise_activities')\
-                .select('*, activities(name)')\
-                .eq('enterprise_id', enterprise_id)\
-                .execute()
-            
-            for idx, atividade in enumerate(response.data, 1):
-                activity_name = atividade.get('activities', {}).get('name', 'Sem nome')
-                log_validacao(f"Atividade {idx}", "OK", activity_name)
-                resultado['validacoes'].append({
-                    'campo': f'Atividade {idx}',
-                    'status': 'OK',
-                    'valor': activity_name
-                })
-                
-                # Validar dados quantitativos
-                if atividade.get('quantity'):
-                    log_validacao(f"  └─ Quantidade", "OK", f"{atividade['quantity']} {atividade.get('unit', '')}")
-                else:
-                    log_validacao(f"  └─ Quantidade", "AVISO", "Não preenchida")
-        
-        except Exception as e:
-            log_validacao("Detalhes", "ERRO", str(e))
-    else:
-        log_validacao("Total de Atividades", "ERRO", "Nenhuma atividade encontrada")
-        resultado['sucesso'] = False
-        resultado['validacoes'].append({
-            'campo': 'Total de Atividades',
-            'status': 'ERRO',
-            'mensagem': 'Nenhuma atividade encontrada'
-        })
-    
-    return resultado
-
-
-def validar_aba_caracterizacao(contexto: dict) -> dict:
-    """
-    Valida se os dados de caracterização foram salvos.
-    Tabelas: enterprise_characterization, enterprise_energy_resources, etc.
-    """
-    log_aba("ABA 4: CARACTERIZAÇÃO", "🌿")
-    
-    resultado = {
-        'aba': 'Caracterização',
-        'tabelas': ['enterprise_characterization', 'enterprise_energy_resources'],
-        'validacoes': [],
-        'sucesso': True
-    }
-    
-    enterprise_id = contexto.get('enterprise_id')
-    if not enterprise_id:
-        log_validacao("Contexto", "ERRO", "ID do empreendimento não encontrado")
-        resultado['sucesso'] = False
-        return resultado
-    
-    # Validar tabela principal de caracterização
-    caracterizacao = buscar_registro('enterprise_characterization', {'enterprise_id': enterprise_id})
-    
-    if caracterizacao:
-        log_validacao("Caracterização Ambiental", "OK", "Registro encontrado")
-        resultado['validacoes'].append({
-            'campo': 'Caracterização Ambiental',
-            'status': 'OK',
-            'mensagem': 'Registro encontrado'
-        })
-        
-        # Validar campos específicos
-        campos = {
-            'water_origin': 'Origem da Água',
-            'water_consumption_human': 'Consumo Humano',
-            'effluent_destination': 'Destino de Efluentes'
-        }
-        
-        for campo, nome in campos.items():
-            valor = caracterizacao.get(campo)
-            if valor:
-                log_validacao(f"  └─ {nome}", "OK", str(valor))
-            else:
-                log_validacao(f"  └─ {nome}", "AVISO", "Não preenchido")
-    else:
-        log_validacao("Caracterização Ambiental", "ERRO", "Registro não encontrado")
-        resultado['sucesso'] = False
-        resultado['validacoes'].append({
-            'campo': 'Caracterização Ambiental',
-            'status': 'ERRO',
-            'mensagem': 'Registro não encontrado'
-        })
-    
-    # Validar recursos energéticos
-    total_recursos = contar_registros('enterprise_energy_resources', {'enterprise_id': enterprise_id})
-    log_validacao("Recursos Energéticos", "OK" if total_recursos >= 0 else "ERRO", 
-                  f"{total_recursos} registro(s)" if total_recursos >= 0 else "Erro ao consultar")
-    
-    return resultado
+# Recurso da API -> (nome da aba, emoji)
+ABAS = {
+    'property': ("ABA 1: IMÓVEL", "🏠"),
+    'enterprise': ("ABA 2: DADOS GERAIS", "🏢"),
+    'activities': ("ABA 3: ATIVIDADES", "⚡"),
+    'characterization': ("ABA 4: CARACTERIZAÇÃO", "🌿"),
+}
 
 
 # ===================================================================
 # FUNÇÃO PRINCIPAL
 # ===================================================================
 
-def executar_validacao_completa(contexto: dict = None):
+def executar_validacao_completa(contexto: dict = None, base_url: str = None):
     """
-    Executa validação completa de todas as abas.
+    Executa validação completa de todas as abas via API.
     
     Args:
-        contexto: Dicionário com IDs de registros (opcional)
+        contexto: Dicionário com IDs de registros / store_json
+        base_url: Backend alternativo (ex.: stub local)
     
     Returns:
         dict: Relatório completo da validação
     """
-    global supabase
+    if contexto is None:
+        contexto = {}
     
-    # Validar credenciais
-    if not SUPABASE_URL or not SUPABASE_KEY or SUPABASE_URL == 'your_supabase_url_here':
-        print("\n❌ ERRO: Credenciais do Supabase não configuradas")
-        print("Configure SUPABASE_URL e SUPABASE_KEY no arquivo tests/.env")
-        return {
-            'sucesso_geral': False,
-            'erro': 'Credenciais do Supabase não configuradas',
-            'resultados': []
-        }
+    log_secao("VALIDAÇÃO DE DADOS VIA API - NOVO EMPREENDIMENTO")
+    
+    print(f"\n🕐 Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🔗 Backend: {base_url or settings.BACKEND_URL}")
     
-    # Inicializar cliente Supabase
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        relatorio = DataValidator(base_url=base_url).run(contexto)
     except Exception as e:
-        print(f"\n❌ ERRO ao conectar com Supabase: {e}")
+        print(f"\n❌ ERRO FATAL: {e}")
         return {
             'sucesso_geral': False,
-            'erro': f'Erro ao conectar com Supabase: {e}',
+            'erro': str(e),
             'resultados': []
         }
     
-    log_secao("VALIDAÇÃO DE DADOS NO BANCO - NOVO EMPREENDIMENTO")
-    
-    print(f"\n🕐 Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"🔗 Supabase URL: {SUPABASE_URL}")
-    
-    if contexto is None:
-        contexto = {}
-    
-    # Executar validações
+    # Agrupar diferenças por aba
     resultados = []
-    
-    try:
-        # 1. Validar Imóvel
-        resultado_imovel = validar_aba_imovel(contexto)
-        resultados.append(resultado_imovel)
-        
-        # 2. Validar Dados Gerais
-        resultado_dados = validar_aba_dados_gerais(contexto)
-        resultados.append(resultado_dados)
+    for recurso, (aba, emoji) in ABAS.items():
+        log_aba(aba, emoji)
         
-        # 3. Validar Atividades
-        resultado_atividades = validar_aba_atividades(contexto)
-        resultados.append(resultado_atividades)
+        requisicao = relatorio['requisicoes'].get(recurso)
+        if requisicao:
+            log_validacao("Requisição", "OK" if not requisicao['error'] else "ERRO",
+                          f"HTTP {requisicao['status']} em {requisicao['elapsed_ms']:.0f}ms")
         
-        # 4. Validar Caracterização
-        resultado_caracterizacao = validar_aba_caracterizacao(contexto)
-        resultados.append(resultado_caracterizacao)
+        validacoes = [d for d in relatorio['diferencas'] if d['recurso'] == recurso]
+        for d in validacoes:
+            detalhes = d['mensagem']
+            if d['esperado'] is not None:
+                detalhes += f" - esperado: {d['esperado']}, obtido: {d['obtido']}"
+            log_validacao(d['campo'], d['status'], detalhes)
         
-    except Exception as e:
-        print(f"\n❌ ERRO FATAL: {e}")
-        return {
-            'sucesso_geral': False,
-            'erro': str(e),
-            'resultados': resultados
-        }
+        resultados.append({
+            'aba': aba.split(': ', 1)[1].title(),
+            'recurso': recurso,
+            'validacoes': validacoes,
+            'sucesso': not any(d['status'] == 'ERRO' for d in validacoes)
+        })
+    
+    contexto['property_id'] = relatorio['property_id']
+    contexto['enterprise_id'] = relatorio['enterprise_id']
     
     # Gerar relatório final
     log_secao("RESUMO DA VALIDAÇÃO")
@@ -488,22 +146,14 @@ def executar_validacao_completa(contexto: dict = None):
     print(f"   • Abas validadas com sucesso: {abas_ok} ✓")
     print(f"   • Abas com erro: {abas_erro} ✗")
     print(f"   • Taxa de sucesso: {(abas_ok/total_abas*100):.1f}%")
+    print(f"   • Tempo das consultas: {relatorio['duracao_ms']:.0f}ms")
     
-    print(f"\n📋 DETALHAMENTO POR ABA:")
-    for resultado in resultados:
-        status_icon = "✓" if resultado['sucesso'] else "✗"
-        status_text = "OK" if resultado['sucesso'] else "ERRO"
-        aba_nome = resultado.get('aba', 'Desconhecida')
-        total_validacoes = len(resultado.get('validacoes', []))
-        
-        print(f"   {status_icon} {aba_nome}: {status_text} ({total_validacoes} validações)")
-    
-    sucesso_geral = abas_ok == total_abas
+    sucesso_geral = relatorio['sucesso']
     
     print(f"\n{'='* 71}")
     if sucesso_geral:
         print("✓ VALIDAÇÃO CONCLUÍDA COM SUCESSO!")
-        print("  Todos os dados foram salvos corretamente nas tabelas.")
+        print("  Todos os dados foram salvos corretamente.")
     else:
         print("⚠️ VALIDAÇÃO CONCLUÍDA COM PROBLEMAS")
         print(f"  {abas_erro} aba(s) apresentaram erros na gravação.")
@@ -517,17 +167,39 @@ def executar_validacao_completa(contexto: dict = None):
         'abas_ok': abas_ok,
         'abas_erro': abas_erro,
         'resultados': resultados,
+        'diferencas': relatorio['diferencas'],
         'contexto': contexto
     }
 
 
+def executar_teste_validacao(driver_existente=None, contexto_anterior=None):
+    """
+    Ponto de entrada no formato do orquestrador (driver + contexto).
+    
+    Args:
+        driver_existente: Instância do WebDriver (não utilizada; mantida no contexto)
+        contexto_anterior: Contexto do teste anterior
+    
+    Returns:
+        dict: Contexto atualizado com status e relatório da validação
+    """
+    contexto = contexto_anterior or {}
+    relatorio = executar_validacao_completa(contexto)
+    
+    contexto['validacao_api'] = {k: v for k, v in relatorio.items() if k != 'contexto'}
+    contexto['status'] = 'sucesso' if relatorio['sucesso_geral'] else 'erro'
+    if not relatorio['sucesso_geral']:
+        contexto['erro'] = relatorio.get('erro') or f"{relatorio.get('abas_erro', 0)} aba(s) com erro na validação via API"
+    return contexto
+
+
 # ===================================================================
 # PONTO DE ENTRADA
 # ===================================================================
 
 if __name__ == "__main__":
     print("=" * 71)
-    print(" TESTE 06 - VALIDAÇÃO DE DADOS NO BANCO")
+    print(" TESTE 06 - VALIDAÇÃO DE DADOS VIA API")
     print("=" * 71)
     
     # Executar validação
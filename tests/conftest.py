@@ -5,6 +5,7 @@ Configuração de Fixtures Pytest
 Define fixtures compartilhadas para todos os testes.
 """
 
+import os
 import pytest
 from pathlib import Path
 import sys
@@ -13,21 +14,108 @@ import sys
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from src.core.driver_manager import DriverManager
+from src.core.driver_manager import DriverManager, DriverPool
+from src.core.driver_resolver import driver_resolver
+from src.core.resource_blocker import resource_blocker
+from src.utils.screenshot_pipeline import screenshot_pipeline
+from src.utils.screenshot_store import screenshot_store
+from src.utils.run_archive import run_archive
+from src.utils.step_timer import step_timer
 from src.config.settings import settings
+from src.stub import StubServer
+
+
+def _driver_profile(request) -> str:
+    """Perfil do navegador do teste: marker ``driver_profile`` ou DRIVER_PROFILE."""
+    marker = request.node.get_closest_marker("driver_profile")
+    if marker and marker.args:
+        return marker.args[0]
+    return settings.DRIVER_PROFILE
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_server():
+    """
+    Stub local do frontend/backend (só com USE_STUB_SERVER=true).
+    
+    Cada worker do pytest-xdist sobe o seu em uma porta efêmera e aponta
+    FRONTEND_URL/BACKEND_URL/AUTO_LOGIN_URL para ele durante a sessão.
+    
+    Yields:
+        StubServer: Servidor em execução, ou None se desativado
+    """
+    if not settings.USE_STUB_SERVER:
+        yield None
+        return
+    
+    stub = StubServer().start()
+    stub.activate()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """
+    Fixture que fornece o pool de navegadores da sessão (ou do worker xdist).
+    
+    Só é criado quando USE_DRIVER_POOL=true.
+    
+    Yields:
+        DriverPool: Pool de navegadores pré-abertos
+    """
+    pool = DriverPool()
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture(scope="session")
+def driver_pools():
+    """
+    Pools por perfil de navegador, criados sob demanda.
+    
+    Testes com ``@pytest.mark.driver_profile("fast")`` usam um pool próprio
+    quando o perfil difere do DRIVER_PROFILE da sessão.
+    
+    Yields:
+        dict: Perfil -> DriverPool
+    """
+    pools = {}
+    yield pools
+    for pool in pools.values():
+        pool.shutdown()
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(request):
     """
     Fixture que fornece um driver do Chrome para cada teste.
     
+    Com USE_DRIVER_POOL=true, o navegador vem do pool e é apenas limpo
+    ao final do teste; caso contrário, é aberto e fechado a cada teste.
+    O perfil pode ser escolhido por teste com ``@pytest.mark.driver_profile("fast")``.
+    
     Yields:
         webdriver.Chrome: Instância do Chrome WebDriver
     """
-    driver = DriverManager.create_driver()
-    yield driver
-    DriverManager.quit_driver(driver)
+    profile = _driver_profile(request)
+    
+    if settings.USE_DRIVER_POOL:
+        if profile == settings.DRIVER_PROFILE:
+            pool = request.getfixturevalue("driver_pool")
+        else:
+            pools = request.getfixturevalue("driver_pools")
+            if profile not in pools:
+                pools[profile] = DriverPool(profile=profile)
+            pool = pools[profile]
+        driver = pool.acquire()
+        yield driver
+        pool.release(driver)
+    else:
+        driver = DriverManager.create_driver(profile=profile)
+        yield driver
+        DriverManager.quit_driver(driver)
 
 
 @pytest.fixture(scope="function")
@@ -93,3 +181,29 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, f"rep_{rep.when}", rep)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmarks só rodam quando pedidos explicitamente (``-m benchmark``)."""
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    
+    skip = pytest.mark.skip(reason="benchmark: execute com -m benchmark")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Relatórios de cold start, tempo por etapa, perfil fast e screenshots (esvazia a fila) e limpezas."""
+    driver_resolver.report()
+    step_timer.report("pytest")
+    resource_blocker.report()
+    screenshot_pipeline.report()
+    
+    # Limpezas só no processo principal (depois de todos os workers)
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        if settings.SCREENSHOT_DEDUP:
+            screenshot_store.evict()
+        if settings.ARCHIVE_ENABLED:
+            run_archive.prune()
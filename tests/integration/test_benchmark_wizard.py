@@ -0,0 +1,37 @@
+"""
+Benchmark - Fluxo Completo do Wizard
+=====================================
+
+Executa o fluxo completo BENCH_RUNS vezes e falha se alguma etapa
+regredir em relação à baseline em reports/json.
+
+Executar com: pytest -m benchmark -s
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.core.benchmark import WizardBenchmark
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+def test_benchmark_fluxo_completo():
+    """Mede o wizard e compara cada etapa com a baseline."""
+    benchmark = WizardBenchmark()
+    results = benchmark.run()
+    regressions = benchmark.check(results)
+    
+    assert results['failed'] == 0, f"{results['failed']} execução(ões) do fluxo falharam"
+    assert not regressions, "Regressões de desempenho: " + "; ".join(
+        f"{r['step']} [{r['metric']}] {r['baseline']:g} → {r['current']:g}" for r in regressions
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-m", "benchmark"])
@@ -0,0 +1,43 @@
+"""
+Testes Unitários - DriverResolver
+==================================
+
+Garante que a sessão no ChromeDriver compartilhado é de fato usada
+(sem abrir navegador).
+"""
+
+import pytest
+from types import SimpleNamespace
+
+pytest.importorskip("selenium")
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from src.core.driver_resolver import DriverResolver
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_sessao_usa_chromedriver_compartilhado(tmp_path, monkeypatch):
+    """O caminho compartilhado não pode cair no fallback por ImportError."""
+    resolver = DriverResolver(cache_file=tmp_path / "driver_cache.json")
+    service = SimpleNamespace(service_url="http://127.0.0.1:9515")
+    monkeypatch.setattr(resolver, "_shared_service", lambda: service)
+    
+    executors = []
+    
+    def fake_init(self, command_executor=None, options=None):
+        executors.append(command_executor)
+    
+    monkeypatch.setattr(RemoteWebDriver, "__init__", fake_init)
+    
+    driver = resolver._create_on_shared_service(Options())
+    
+    assert driver is not None
+    assert resolver._service_failed is False
+    assert driver.service is service
+    assert isinstance(executors[0], ChromiumRemoteConnection)
+    assert executors[0]._url == service.service_url
@@ -0,0 +1,113 @@
+"""
+Testes Unitários - LatencyHistogram
+====================================
+
+Percentis com erro relativo limitado, soma de histogramas e serialização.
+"""
+
+import math
+import random
+import threading
+
+import pytest
+
+from src.utils.latency_histogram import LatencyHistogram
+
+
+pytestmark = pytest.mark.unit
+
+
+def _exato(amostras, pct):
+    ordenadas = sorted(amostras)
+    return ordenadas[max(1, math.ceil(pct / 100 * len(ordenadas))) - 1]
+
+
+def _histograma(amostras):
+    histogram = LatencyHistogram()
+    for ms in amostras:
+        histogram.record(ms)
+    return histogram
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_percentis_com_erro_relativo_limitado(seed):
+    rng = random.Random(seed)
+    amostras = [rng.lognormvariate(5, 1.2) for _ in range(5000)]
+    histogram = _histograma(amostras)
+    
+    for pct in (1, 50, 90, 95, 99, 99.9, 100):
+        exato = _exato(amostras, pct)
+        obtido = histogram.percentile(pct)
+        tolerancia = exato / LatencyHistogram.SUB_BUCKETS + LatencyHistogram.RESOLUTION_MS
+        assert exato - 0.05 <= obtido <= exato + tolerancia, pct
+
+
+def test_percentil_nunca_passa_do_maximo():
+    histogram = _histograma([1000.0])
+    assert histogram.percentile(50) == histogram.percentile(100) == 1000.0
+
+
+def test_vazio():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(95) == 0.0
+    assert histogram.summary() == {
+        'count': 0, 'min_ms': 0.0, 'mean_ms': 0.0, 'max_ms': 0.0,
+        'p50_ms': 0.0, 'p90_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0
+    }
+
+
+def test_valores_pequenos_e_negativos():
+    histogram = _histograma([-5, 0, 0.05, 0.25])
+    assert histogram.min_ms == 0.0
+    assert histogram.percentile(100) == 0.2
+    assert histogram.count == 4
+
+
+def test_memoria_nao_cresce_com_as_amostras():
+    histogram = _histograma(random.Random(0).uniform(10, 20) for _ in range(50_000))
+    assert histogram.count == 50_000
+    assert len(histogram._counts) <= 2 * LatencyHistogram.SUB_BUCKETS
+
+
+def test_merge_equivale_a_gravar_tudo_junto():
+    rng = random.Random(7)
+    a = [rng.expovariate(1 / 300) for _ in range(1000)]
+    b = [rng.expovariate(1 / 3000) for _ in range(1000)]
+    
+    merged = _histograma(a).merge(_histograma(b))
+    together = _histograma(a + b)
+    
+    assert merged.to_dict() == together.to_dict()
+    assert merged.summary() == together.summary()
+
+
+def test_merge_de_histograma_vazio():
+    histogram = _histograma([10, 20])
+    histogram.merge(LatencyHistogram())
+    assert (histogram.count, histogram.min_ms, histogram.max_ms) == (2, 10.0, 20.0)
+
+
+def test_to_dict_from_dict():
+    histogram = _histograma(random.Random(3).uniform(1, 5000) for _ in range(500))
+    restored = LatencyHistogram.from_dict(histogram.to_dict())
+    
+    assert restored.summary() == histogram.summary()
+    assert restored.to_dict() == histogram.to_dict()
+
+
+def test_record_entre_threads():
+    histogram = LatencyHistogram()
+    
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            histogram.record(rng.uniform(1, 100))
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert histogram.count == 16_000
+    assert sum(histogram._counts.values()) == 16_000
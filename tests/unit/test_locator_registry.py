@@ -0,0 +1,118 @@
+"""
+Testes Unitários - LocatorRegistry
+===================================
+
+Divisão de XPaths com união, ranking das alternativas e persistência das
+estatísticas (sem navegador).
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.webdriver.common.by import By
+
+from src.config.settings import settings
+from src.utils.locator_registry import LocatorRegistry
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("xpath, esperado", [
+    ("//a", ["//a"]),
+    ("//a | //b|//c", ["//a", "//b", "//c"]),
+    ("//button[contains(., 'Próximo') or @id='next'] | //a[@rel='next']",
+     ["//button[contains(., 'Próximo') or @id='next']", "//a[@rel='next']"]),
+    ("//input[@placeholder='a | b'] | //textarea", ["//input[@placeholder='a | b']", "//textarea"]),
+    ('//span[text()="x|y"]', ['//span[text()="x|y"]']),
+    ("(//a | //b)[1] | //c", ["(//a | //b)[1]", "//c"]),
+    ("//div[.//a | .//b]", ["//div[.//a | .//b]"]),
+    ("//a | | //b |", ["//a", "//b"]),
+    ("", []),
+])
+def test_split_union(xpath, esperado):
+    assert LocatorRegistry.split_union(xpath) == esperado
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = LocatorRegistry(tmp_path / "locators.json")
+    registry._atexit_registered = True  # sem save no fim do processo de testes
+    return registry
+
+
+def test_alternatives_so_divide_xpath(registry):
+    assert registry.alternatives((By.XPATH, "//a | //b")) == [(By.XPATH, "//a"), (By.XPATH, "//b")]
+    assert registry.alternatives((By.CSS_SELECTOR, "a, b")) == [(By.CSS_SELECTOR, "a, b")]
+
+
+def test_rank_prefere_acertos_e_penaliza_falhas(registry):
+    alts = [(By.XPATH, "//a"), (By.XPATH, "//b"), (By.XPATH, "//c")]
+    stats = {
+        registry._key(alts[0]): {'hits': 1, 'misses': 3},
+        registry._key(alts[2]): {'hits': 4, 'misses': 0},
+    }
+    assert registry._rank(alts, stats) == [2, 1, 0]
+    assert registry._rank(alts, {}) == [0, 1, 2]
+
+
+def test_save_mescla_com_o_arquivo(registry, tmp_path):
+    key, hit, miss = "xpath=//a | //b", (By.XPATH, "//b"), (By.XPATH, "//a")
+    registry._record(key, "/wizard", [miss], hit)
+    registry.save()
+    
+    other = LocatorRegistry(tmp_path / "locators.json")
+    other._atexit_registered = True
+    other._record(key, "/wizard", [], hit)
+    other.save()
+    
+    data = json.loads((tmp_path / "locators.json").read_text(encoding='utf-8'))
+    assert data[key]["/wizard"] == {
+        registry._key(hit): {'hits': 2, 'misses': 0},
+        registry._key(miss): {'hits': 0, 'misses': 1},
+    }
+
+
+def test_save_sem_alteracoes_nao_grava(registry):
+    registry.save()
+    assert not registry.stats_file.exists()
+
+
+def test_arquivo_resolvido_no_uso(monkeypatch):
+    registry = LocatorRegistry()
+    monkeypatch.setattr(settings, 'LOCATOR_STATS_FILE', "outro_arquivo.json")
+    assert registry.stats_file.name == "outro_arquivo.json"
+
+
+class FakeLocateDriver:
+    """Executa o ``_LOCATE_SCRIPT`` em Python: só ``found`` existe na página."""
+    
+    def __init__(self, found, learned):
+        self.found = found
+        self.learned = learned
+        self.orders = []
+    
+    def execute_script(self, script, alternatives, orders, condition):
+        order = orders.get('/wizard', orders[''])
+        self.orders.append([alternatives[i][1] for i in order])
+        for position, index in enumerate(order):
+            if tuple(alternatives[index]) in self.found:
+                return {'element': object(), 'index': index, 'tried': order[:position],
+                        'route': '/wizard', 'learned': list(self.learned)}
+        return {'element': None, 'route': '/wizard'}
+
+
+def test_seletor_aprendido_passa_a_ser_tentado_primeiro(registry):
+    learned = (By.CSS_SELECTOR, "#x")
+    driver = FakeLocateDriver(found={(By.XPATH, "//b"), learned}, learned=learned)
+    locator = (By.XPATH, "//a | //b")
+    
+    for _ in range(3):
+        assert registry.locate(driver, locator)
+    
+    assert driver.orders[0] == ["//a", "//b"]
+    assert driver.orders[1][0] == "#x"
+    assert driver.orders[2][0] == "#x"
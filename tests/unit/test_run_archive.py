@@ -0,0 +1,168 @@
+"""
+Testes Unitários - RunArchive
+==============================
+
+Gravação, índice, leitura por registro, rotação de segmentos e retenção do
+arquivo de execuções (gzip e, se instalado, zstd).
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.config.settings import settings
+from src.utils import run_archive as run_archive_module
+from src.utils.run_archive import RunArchive
+
+
+pytestmark = pytest.mark.unit
+
+
+def _store(tipo, property_id, enterprise_id):
+    return {'state': {
+        'tipoImovel': tipo,
+        'propertyId': property_id,
+        'enterpriseId': enterprise_id,
+        'dados_imovel': {'nome': f'Imóvel {property_id}'}
+    }}
+
+
+@pytest.fixture(params=['gzip', 'zstd'])
+def archive(request, tmp_path, monkeypatch):
+    if request.param == 'zstd' and run_archive_module.zstandard is None:
+        pytest.skip("zstandard não instalado")
+    monkeypatch.setattr(settings, 'ARCHIVE_COMPRESSION', request.param)
+    monkeypatch.setattr(settings, 'ARCHIVE_SEGMENT_MAX_MB', 64.0)
+    monkeypatch.setattr(settings, 'ARCHIVE_SEGMENT_MAX_AGE_HOURS', 24.0)
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw0')
+    return RunArchive(tmp_path / "archive")
+
+
+def test_append_extrai_metadados_do_store(archive):
+    entry = archive.append(_store('rural', 10, 20), flow='completo')
+    
+    assert (entry['tipo'], entry['property_id'], entry['enterprise_id']) == ('RURAL', 10, 20)
+    assert entry['segment'].endswith(RunArchive.EXTENSIONS[archive.compression])
+    assert entry['segment'].endswith(f"_gw0{RunArchive.EXTENSIONS[archive.compression]}")
+    
+    record = archive.get(entry['run_id'])
+    assert record['data'] == _store('rural', 10, 20)
+    assert record['meta'] == {'flow': 'completo'}
+
+
+def test_metadados_explicitos_prevalecem(archive):
+    entry = archive.append({'qualquer': 1}, tipo='linear', property_id=0, enterprise_id='E-1')
+    assert (entry['tipo'], entry['property_id'], entry['enterprise_id']) == ('LINEAR', 0, 'E-1')
+
+
+def test_find_filtra_pelo_indice(archive):
+    a = archive.append(_store('RURAL', 1, 100))
+    b = archive.append(_store('URBANO', 2, 200))
+    c = archive.append(_store('RURAL', 3, 300))
+    
+    assert [e['run_id'] for e in archive.find(tipo='rural')] == [a['run_id'], c['run_id']]
+    assert [e['run_id'] for e in archive.find(enterprise_id='200')] == [b['run_id']]
+    assert [e['run_id'] for e in archive.find(property_id=3)] == [c['run_id']]
+    assert len(list(archive.find(date=datetime.now().strftime('%Y-%m')))) == 3
+    assert list(archive.find(date='1999')) == []
+
+
+def test_records_le_so_o_quadro_de_cada_registro(archive):
+    stores = [_store('RURAL', i, i * 10) for i in range(5)]
+    for store in stores:
+        archive.append(store)
+    
+    assert [r['data'] for r in archive.records()] == stores
+    assert [r['data'] for r in archive.records(property_id=3)] == [stores[3]]
+    assert archive.get('nao-existe') is None
+
+
+def test_scan_le_o_segmento_sem_indice(archive):
+    stores = [_store('URBANO', i, i) for i in range(3)]
+    for store in stores:
+        archive.append(store)
+    
+    (segment,) = archive.segments()
+    assert [r['data'] for r in archive.scan(segment)] == stores
+
+
+def test_scan_para_no_registro_truncado(archive, capsys):
+    for i in range(3):
+        archive.append(_store('RURAL', i, i))
+    (segment,) = archive.segments()
+    segment.write_bytes(segment.read_bytes()[:-20])
+    
+    assert len(list(archive.scan(segment))) == 2
+    assert "registro incompleto" in capsys.readouterr().out
+
+
+def test_registro_corrompido_nao_interrompe_records(archive, capsys):
+    first = archive.append(_store('RURAL', 1, 1))
+    archive.append(_store('RURAL', 2, 2))
+    
+    segment = archive.directory / first['segment']
+    content = bytearray(segment.read_bytes())
+    content[first['offset']:first['offset'] + first['length']] = b'\0' * first['length']
+    segment.write_bytes(bytes(content))
+    
+    assert [r['property_id'] for r in archive.records()] == [2]
+    assert "ilegível" in capsys.readouterr().out
+
+
+def test_rotacao_por_tamanho_e_idade(archive, monkeypatch):
+    entry = archive.append(_store('RURAL', 1, 1))
+    compression = archive.compression
+    created = datetime.strptime(entry['segment'].split('_', 1)[1][:15], '%Y%m%d_%H%M%S')
+    
+    # Dentro dos limites: continua no mesmo segmento
+    assert archive._segment(compression, created + timedelta(minutes=1)).name == entry['segment']
+    
+    # Passou da idade
+    rotated = archive._segment(compression, created + timedelta(hours=25))
+    assert rotated.name != entry['segment']
+    
+    # Passou do tamanho
+    monkeypatch.setattr(settings, 'ARCHIVE_SEGMENT_MAX_MB', 1 / 1024 / 1024)
+    rotated = archive._segment(compression, created + timedelta(seconds=1))
+    assert rotated.name != entry['segment']
+
+
+def test_segmento_por_worker(archive, monkeypatch):
+    a = archive.append(_store('RURAL', 1, 1))
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+    b = archive.append(_store('RURAL', 2, 2))
+    
+    assert a['segment'] != b['segment']
+    assert len(archive.segments()) == 2
+    assert [r['property_id'] for r in archive.records()] == [1, 2]
+
+
+def test_prune_remove_segmentos_antigos_e_suas_entradas(archive, monkeypatch, capsys):
+    old = archive.append(_store('RURAL', 1, 1))
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+    new = archive.append(_store('RURAL', 2, 2))
+    
+    stale = time.time() - 40 * 86400
+    os.utime(archive.directory / old['segment'], (stale, stale))
+    
+    assert archive.prune(max_age_days=0)['segments_removed'] == 0
+    result = archive.prune(max_age_days=30)
+    assert (result['segments_removed'], result['entries_removed']) == (1, 1)
+    assert result['bytes_freed'] > 0
+    assert [e['run_id'] for e in archive.entries()] == [new['run_id']]
+    assert [s.name for s in archive.segments()] == [new['segment']]
+    assert "Arquivo de execuções" in capsys.readouterr().out
+
+
+def test_compressao_desconhecida(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'ARCHIVE_COMPRESSION', 'lz4')
+    with pytest.raises(ValueError):
+        RunArchive(tmp_path).compression
+
+
+def test_metadata_procura_nas_secoes():
+    data = {'state': {'selectedProperty': {'propertyType': 'URBANO', 'id': 5}, 'enterprise': {'enterprise_id': 9}}}
+    assert RunArchive.metadata(data) == {'tipo': 'URBANO', 'property_id': None, 'enterprise_id': 9}
+    assert RunArchive.metadata([1, 2]) == {'tipo': None, 'property_id': None, 'enterprise_id': None}
@@ -0,0 +1,153 @@
+"""
+Testes Unitários - ScreenshotStore
+===================================
+
+Deduplicação, diferenças sem perdas, restauração e limpeza do store de
+screenshots (sem navegador).
+"""
+
+import io
+import time
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from src.config.settings import settings
+from src.utils.screenshot_store import ScreenshotStore
+
+
+pytestmark = pytest.mark.unit
+
+
+def _png(image) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+def _tela(fundo='white', texto=None, cursor=False):
+    image = Image.new('RGB', (640, 480), fundo)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, 320, 200), fill='navy')
+    if texto:
+        draw.text((360, 300), texto, fill='red')
+    if cursor:
+        draw.line((500, 100, 500, 110), fill='black')
+    return image
+
+
+def _pixels(content: bytes) -> bytes:
+    with Image.open(io.BytesIO(content)) as image:
+        return image.convert('RGB').tobytes()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'SCREENSHOT_SIMILAR_DISTANCE', -1)
+    monkeypatch.setattr(settings, 'SCREENSHOT_SIMILAR_MAX_PIXELS', 64)
+    monkeypatch.setattr(settings, 'SCREENSHOT_DIFF_DISTANCE', 12)
+    return ScreenshotStore(tmp_path / "store")
+
+
+def test_duplicata_exata_nao_regrava(store):
+    content = _png(_tela())
+    first = store.put('t', 'step01', content)
+    second = store.put('t', 'step02', content)
+    
+    assert first['kind'] == 'blob'
+    assert (second['kind'], second['bytes']) == ('duplicate', 0)
+    assert store.restore(second['sha']) == content
+
+
+@pytest.mark.parametrize("nova", [
+    _tela(texto="Campo obrigatorio"),
+    _tela(fundo=(250, 250, 230)),
+])
+def test_quadro_alterado_nunca_e_descartado(store, monkeypatch, nova):
+    """Com o 'similar' ligado, mensagem nova ou fundo trocado continuam gravados."""
+    monkeypatch.setattr(settings, 'SCREENSHOT_SIMILAR_DISTANCE', 2)
+    store.put('t', 'step01', _png(_tela()))
+    entry = store.put('t', 'step02', _png(nova))
+    
+    assert entry['kind'] in ('diff', 'blob')
+    assert entry['bytes'] > 0
+    assert _pixels(store.restore(entry['sha'])) == nova.tobytes()
+
+
+def test_diferenca_restaurada_sem_perdas(store):
+    store.put('t', 'step01', _png(_tela()))
+    nova = _tela(texto="Salvo")
+    entry = store.put('t', 'step02', _png(nova))
+    
+    assert entry['kind'] == 'diff'
+    assert entry['bytes'] < len(_png(nova))
+    assert _pixels(store.restore(entry['sha'])) == nova.tobytes()
+
+
+def test_similar_desligado_por_padrao(store):
+    assert int(type(settings).SCREENSHOT_SIMILAR_DISTANCE.default) < 0
+    store.put('t', 'step01', _png(_tela()))
+    entry = store.put('t', 'step02', _png(_tela(cursor=True)))
+    assert entry['kind'] == 'diff'
+
+
+def test_similar_confirmado_pixel_a_pixel(store, monkeypatch):
+    monkeypatch.setattr(settings, 'SCREENSHOT_SIMILAR_DISTANCE', 2)
+    base = store.put('t', 'step01', _png(_tela()))
+    entry = store.put('t', 'step02', _png(_tela(cursor=True)))
+    
+    assert (entry['kind'], entry['ref'], entry['bytes']) == ('similar', base['sha'], 0)
+    assert store.lookup('t', 'step02')['sha'] == base['sha']
+
+
+def test_lookup_devolve_a_ultima_entrada(store):
+    store.put('t', 'step01', _png(_tela()))
+    last = store.put('t', 'step01', _png(_tela(texto="2")))
+    assert store.lookup('t', 'step01')['sha'] == last['sha']
+    assert store.lookup('t', 'outra') is None
+
+
+def test_restore_inexistente(store):
+    with pytest.raises(FileNotFoundError):
+        store.restore('0' * 64)
+
+
+def test_evict_por_idade_mantem_base_das_diferencas(store):
+    base = store.put('t', 'step01', _png(_tela()))
+    diff = store.put('t', 'step02', _png(_tela(texto="Salvo")))
+    assert diff['kind'] == 'diff'
+    
+    # Só a entrada da base envelhece: o arquivo continua (a diferença depende dele)
+    entries = list(store.entries())
+    entries[0]['ts'] = time.time() - 30 * 86400
+    store._rewrite(entries)
+    
+    result = store.evict(max_age_days=7, max_mb=0)
+    assert (result['entries_removed'], result['files_removed']) == (1, 0)
+    assert store.restore(base['sha'])
+    assert _pixels(store.restore(diff['sha'])) == _tela(texto="Salvo").tobytes()
+
+
+def test_evict_por_tamanho_remove_os_mais_antigos(store):
+    for index in range(3):
+        store.forget('t')
+        store.put('t', f'step{index}', _png(_tela(fundo=(index * 80, 0, 0))))
+    sizes = sorted(p.stat().st_size for p in store._files())
+    
+    result = store.evict(max_age_days=0, max_mb=(sizes[-1] + 1) / 1024 / 1024)
+    assert result['files_removed'] == 2
+    assert [e['step'] for e in store.entries()] == ['step2']
+    assert len(store._files()) == 1
+
+
+def test_evict_remove_arquivos_sem_referencia(store):
+    entry = store.put('t', 'step01', _png(_tela()))
+    orphan = store._blob_path('f' * 64, '.png')
+    store._write(orphan, b'x')
+    
+    result = store.evict(max_age_days=0, max_mb=0)
+    assert result['files_removed'] == 1
+    assert not orphan.exists()
+    assert store.restore(entry['sha'])
@@ -0,0 +1,150 @@
+"""
+Testes Unitários - StoreValidator
+==================================
+
+Schemas compilados do ``empreendimento-storage`` por tipo de imóvel.
+"""
+
+import copy
+
+import pytest
+
+from src.utils.store_schema import StoreValidator
+
+
+pytestmark = pytest.mark.unit
+
+
+STORE = {
+    'state': {
+        'tipoImovel': 'RURAL',
+        'dados_imovel': {
+            'nome': 'Fazenda Teste', 'municipio': 'Cuiabá', 'uf': 'MT',
+            'lat': -15.6, 'long': '-56,09', 'car': 'MT-5103403-ABC', 'cep': ''
+        },
+        'property': {'id': 1},
+        'propertyId': 1,
+        'dados_gerais': {'nome': 'Empreendimento', 'situacao': 'OPERACAO', 'empregados': '12', 'descricao': 'x'},
+        'participes': [{'nome': 'Empresa', 'papel': 'Requerente'}],
+        'activities': [{'code': '1.01', 'name': 'Extração', 'quantity': 120, 'unit': 'm³/mês'}],
+        'characterization': {'answers': {'water': 'SIM'}},
+        'enterpriseId': 7
+    },
+    'version': 0
+}
+
+LINEAR = {
+    'nome': 'Linha de Transmissão', 'lat': -20.1, 'long': -40.3, 'extensao': 42.5,
+    'municipio_inicio': 'Serra', 'uf_inicio': 'ES', 'municipio_final': 'Aracruz', 'uf_final': 'ES'
+}
+
+
+def _store(**state):
+    data = copy.deepcopy(STORE)
+    data['state'].update(state)
+    return data
+
+
+def _erros(violacoes):
+    return [(v['caminho'], v['mensagem']) for v in violacoes if v['status'] == 'ERRO']
+
+
+@pytest.fixture
+def validator():
+    return StoreValidator()
+
+
+def test_store_completo_rural_sem_violacoes(validator):
+    assert validator.validate(STORE) == []
+
+
+def test_tipo_lido_do_store(validator):
+    data = _store(dados_imovel=dict(STORE['state']['dados_imovel'], car=''))
+    assert ('/state/dados_imovel/car', "Campo obrigatório vazio ou ausente") in _erros(validator.validate(data))
+
+
+@pytest.mark.parametrize("dados_imovel", [
+    LINEAR,
+    {k: v for k, v in LINEAR.items() if not k.endswith(('_inicio', '_final'))}
+    | {'pontoInicio': {'municipio': 'Serra', 'uf': 'ES'}, 'pontoFinal': {'municipio': 'Aracruz', 'uf': 'ES'}},
+])
+def test_linear_com_pontos_de_inicio_e_fim(validator, dados_imovel):
+    data = _store(tipoImovel='LINEAR', dados_imovel=dados_imovel)
+    assert _erros(validator.validate(data)) == []
+
+
+def test_linear_sem_pontos_reprova(validator):
+    data = _store(tipoImovel='LINEAR', dados_imovel={'nome': 'Linha', 'municipio': 'Serra', 'uf': 'ES'})
+    erros = _erros(validator.validate(data))
+    assert [caminho for caminho, _ in erros] == ['/state/dados_imovel']
+
+
+def test_municipio_e_uf_so_nos_tipos_com_endereco(validator):
+    sem_endereco = {'nome': 'Imóvel', 'car': 'MT-5103403-ABC', 'cep': '78000-000'}
+    for tipo in ('RURAL', 'URBANO'):
+        caminhos = [c for c, _ in _erros(validator.validate(_store(tipoImovel=tipo, dados_imovel=sem_endereco)))]
+        assert '/state/dados_imovel/municipio' in caminhos
+        assert '/state/dados_imovel/uf' in caminhos
+
+
+def test_nomes_alternativos_das_secoes(validator):
+    data = {'state': {
+        'selectedProperty': {'id': 3},
+        'enterprise': {'nome': 'Empreendimento'},
+        'selectedActivities': [{'code': '2.05'}]
+    }}
+    violacoes = validator.validate(data)
+    assert _erros(violacoes) == []
+    assert {v['status'] for v in violacoes} == {'AVISO'}
+
+
+def test_secao_ausente_lista_as_alternativas(validator):
+    data = copy.deepcopy(STORE)
+    del data['state']['activities']
+    erros = _erros(validator.validate(data))
+    assert len(erros) == 1
+    caminho, mensagem = erros[0]
+    assert caminho == '/state'
+    assert 'activities' in mensagem and 'selectedActivities' in mensagem
+
+
+def test_caminhos_json_pointer_e_valores(validator):
+    data = _store(
+        dados_imovel=dict(STORE['state']['dados_imovel'], uf='mt', lat='100'),
+        activities=[{'code': '1', 'name': 'a', 'quantity': -1, 'unit': 'u'}],
+        characterization={'answers': {'a/b': 'TALVEZ'}}
+    )
+    assert set(_erros(validator.validate(data))) == {
+        ('/state/dados_imovel/uf', "Formato inválido (^[A-Z]{2}$)"),
+        ('/state/dados_imovel/lat', "Fora do intervalo [-90, 90]"),
+        ('/state/activities/0/quantity', "Fora do intervalo [0, inf]"),
+        ('/state/characterization/answers/a~1b', "Valor fora de ['SIM', 'NAO']"),
+    }
+
+
+def test_tipo_errado(validator):
+    erros = _erros(validator.validate(_store(activities={'code': '1'})))
+    assert erros == [('/state/activities', "Tipo esperado: array")]
+
+
+def test_compila_uma_vez_por_tipo(validator):
+    validator.validate(STORE)
+    validator.validate(STORE)
+    assert list(validator._compiled) == ['RURAL']
+
+
+def test_palavra_chave_desconhecida(validator):
+    with pytest.raises(ValueError):
+        validator.compile({'type': 'object', 'oneOf': []})
+    with pytest.raises(ValueError):
+        validator.compile({'type': 'decimal'})
+
+
+def test_validate_many_resume(validator):
+    linear_invalido = _store(tipoImovel='LINEAR', dados_imovel={'nome': 'Linha'})
+    resumo = validator.validate_many([
+        {'run_id': 'a', 'data': STORE},
+        {'run_id': 'b', 'data': linear_invalido},
+    ])
+    assert (resumo['total'], resumo['validos'], resumo['invalidos']) == (2, 1, 1)
+    assert [r['run_id'] for r in resumo['relatorios']] == ['b']
@@ -0,0 +1,143 @@
+"""
+Testes Unitários - StoreTimeline
+=================================
+
+Diferenças JSON Patch entre etapas e reconstrução do store (sem navegador:
+o ``FakeStoreDriver`` responde ao script de extração incremental).
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from src.utils.store_timeline import StoreTimeline
+
+
+pytestmark = pytest.mark.unit
+
+
+class FakeStoreDriver:
+    """Responde como o ``_CHANGES_SCRIPT`` do JSONCollector para ``self.store``."""
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def execute_script(self, script, key, known):
+        raw = json.dumps(self.store)
+        if not isinstance(self.store, dict):
+            return {'source': 'localStorage', 'size': len(raw), 'raw': raw}
+        
+        has_state = isinstance(self.store.get('state'), dict)
+        sections = self.store['state'] if has_state else self.store
+        hashes, changed = {}, {}
+        for name, value in sections.items():
+            text = json.dumps(value)
+            hashes[name] = hashlib.sha1(text.encode()).hexdigest()
+            if (known or {}).get(name) != hashes[name]:
+                changed[name] = text
+        root = {k: v for k, v in self.store.items() if k != 'state'} if has_state else {}
+        return {'source': 'localStorage', 'size': len(raw), 'hasState': has_state,
+                'root': json.dumps(root), 'hashes': hashes, 'changed': changed}
+
+
+@pytest.mark.parametrize("antes, depois", [
+    ({'a': 1, 'b': {'c': [1, 2, 3]}}, {'a': 2, 'b': {'c': [1, 3]}, 'd': None}),
+    ({'lista': [{'x': 1}]}, {'lista': [{'x': 1}, {'x': 2}, {'y': 3}]}),
+    ({'a/b': 1, 'til~': 2}, {'a/b': 3}),
+    ({'n': 1}, {'n': 1.0}),
+    ({'n': True}, {'n': 1}),
+    ([1, 2], {'virou': 'objeto'}),
+    ({}, {}),
+])
+def test_apply_do_diff_reconstroi(antes, depois):
+    ops = StoreTimeline.diff(antes, depois)
+    resultado = StoreTimeline.apply(antes, ops)
+    assert resultado == depois
+    assert [type(v) for v in _folhas(resultado)] == [type(v) for v in _folhas(depois)]
+
+
+def _folhas(valor):
+    if isinstance(valor, dict):
+        return [f for k in sorted(valor) for f in _folhas(valor[k])]
+    if isinstance(valor, list):
+        return [f for v in valor for f in _folhas(v)]
+    return [valor]
+
+
+def test_diff_sem_mudanca_e_vazio():
+    store = {'state': {'dados_imovel': {'nome': 'X', 'lat': -15.6}}}
+    assert StoreTimeline.diff(store, json.loads(json.dumps(store))) == []
+
+
+def test_diff_caminhos_escapados():
+    ops = StoreTimeline.diff({}, {'a/b': {'c~d': 1}})
+    assert ops == [['add', '/a~1b', {'c~d': 1}]]
+    ops = StoreTimeline.diff({'a/b': {'c~d': 1}}, {'a/b': {'c~d': 2}})
+    assert ops == [['replace', '/a~1b/c~0d', 2]]
+
+
+def test_diff_remove_itens_do_fim_para_o_inicio():
+    ops = StoreTimeline.diff([1, 2, 3, 4], [1])
+    assert ops == [['remove', '/3'], ['remove', '/2'], ['remove', '/1']]
+    assert StoreTimeline.apply([1, 2, 3, 4], ops) == [1]
+
+
+def test_apply_nao_altera_o_documento():
+    documento = {'a': [1]}
+    StoreTimeline.apply(documento, [['add', '/a/1', 2], ['replace', '/b', 3]])
+    assert documento == {'a': [1]}
+
+
+def test_capture_guarda_so_as_mudancas_e_reconstroi(tmp_path):
+    driver = FakeStoreDriver({'state': {'currentStep': 1, 'dados_imovel': {}}, 'version': 0})
+    timeline = StoreTimeline("unit", max_ops=1000)
+    stores = []
+    
+    timeline.capture(driver, "inicio")
+    stores.append(json.loads(json.dumps(driver.store)))
+    
+    driver.store['state'].update(currentStep=2, dados_imovel={'nome': 'Fazenda', 'uf': 'MT'}, propertyId=1)
+    imovel = timeline.capture(driver, "imovel")
+    stores.append(json.loads(json.dumps(driver.store)))
+    
+    driver.store['state']['dados_imovel']['uf'] = 'ES'
+    del driver.store['state']['propertyId']
+    driver.store['version'] = 1
+    ajuste = timeline.capture(driver, "ajuste")
+    stores.append(json.loads(json.dumps(driver.store)))
+    
+    assert {op[1] for op in ajuste['ops']} == {'/version', '/state/propertyId', '/state/dados_imovel/uf'}
+    assert imovel['count'] == len(imovel['ops'])
+    
+    documento = timeline.base
+    for step, esperado in zip(timeline.steps, stores):
+        documento = StoreTimeline.apply(documento, step['ops'])
+        assert documento == esperado
+    
+    assert timeline.fields['/state/dados_imovel/uf'] == "ajuste"
+    assert timeline.fields['/state/currentStep'] == "imovel"
+    
+    path = timeline.write(tmp_path)
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert [s['step'] for s in data['steps']] == ["inicio", "imovel", "ajuste"]
+    assert timeline.steps == []
+
+
+def test_capture_trunca_alem_do_limite():
+    driver = FakeStoreDriver({'state': {'a': 1}})
+    timeline = StoreTimeline("unit", max_ops=1)
+    timeline.capture(driver, "um")
+    driver.store['state'].update(a=2, b=3)
+    entry = timeline.capture(driver, "dois")
+    
+    assert entry['truncated'] is True and 'ops' not in entry
+    assert timeline.total_ops == 3
+
+
+def test_capture_sem_store():
+    class SemStore:
+        def execute_script(self, *args):
+            return None
+    
+    assert StoreTimeline("unit").capture(SemStore(), "etapa") is None